@@ -0,0 +1,143 @@
+from datetime import datetime
+
+from models import Alert
+
+class AlertTracker:
+    """One alert record per machine and issue, opened, updated and auto-resolved
+
+    Rule winners from AlertRuleEngine.evaluate are folded into the open
+    alert for their (machine, rule group) instead of creating new records:
+    re-entering the condition bumps the occurrence count, a different rule
+    in the group changes severity and message in place. An alert resolves
+    once its group has been inactive (past the rule's clear level) for
+    resolve_after seconds, and a condition returning within the rule's
+    cooldown reopens the resolved alert rather than starting a new one.
+
+    While an alert holds unchanged, its last_seen time, message and detail
+    snapshot are refreshed at most every refresh_interval seconds, so its
+    cached serialization survives the ticks in between.
+    """
+
+    def __init__(self, resolve_after, refresh_interval=0):
+        self.resolve_after = resolve_after
+        self.refresh_interval = refresh_interval
+        self._open = {}  # machine_id -> {group: Alert}
+        self._clear_since = {}  # (machine_id, group) -> time the group went inactive
+        self._recent = {}  # (machine_id, group) -> (resolved Alert, resolved at)
+
+    def __len__(self):
+        return sum(len(groups) for groups in self._open.values())
+
+    def restore(self, alerts):
+        """Rebuild the open set from restored live alerts"""
+        self._open.clear()
+        self._clear_since.clear()
+        self._recent.clear()
+        for alert in alerts:
+            group = (alert.details or {}).get('group')
+            if group is not None and not alert.resolved:
+                self._open.setdefault(alert.machine_id, {})[group] = alert
+
+    def forget(self, alert):
+        """Stop tracking an alert that left the live list"""
+        group = (alert.details or {}).get('group')
+        groups = self._open.get(alert.machine_id)
+        if groups is not None and groups.get(group) is alert:
+            del groups[group]
+            self._clear_since.pop((alert.machine_id, group), None)
+        recent = self._recent.get((alert.machine_id, group))
+        if recent is not None and recent[0] is alert:
+            del self._recent[(alert.machine_id, group)]
+
+    def observe(self, machine, rule, entered, analysis, now):
+        """Fold a rule winner into its alert
+
+        Returns (alert, created, changed); changed is True when the alert
+        gained an occurrence, changed severity or was reopened.
+        """
+        machine_id = machine.machine_id
+        key = (machine_id, rule.group)
+        self._clear_since.pop(key, None)
+        groups = self._open.setdefault(machine_id, {})
+        alert = groups.get(rule.group)
+        details = {
+            'health_score': machine.health_score,
+            'failure_probability': machine.failure_probability,
+            'sensor_readings': machine.current_readings,
+            'potential_issues': analysis['potential_issues'],
+            'recommendation': analysis['recommendation'],
+            'rule': rule.name,
+            'group': rule.group
+        }
+
+        if alert is None:
+            recent = self._recent.pop(key, None)
+            if recent is not None and now - recent[1] < rule.cooldown:
+                # Flapping across the resolve point: reopen instead of a new record
+                alert = recent[0]
+                alert.resolved = False
+                alert.occurrences += 1
+                groups[rule.group] = alert
+                self._apply(alert, rule, machine, details, now)
+                return alert, False, True
+
+            alert = Alert(
+                machine_id=machine_id,
+                alert_type=rule.alert_type,
+                severity=rule.severity,
+                message=rule.format_message(machine),
+                details=details
+            )
+            groups[rule.group] = alert
+            return alert, True, False
+
+        changed = entered or alert.severity != rule.severity or alert.details.get('rule') != rule.name
+        if entered:
+            alert.occurrences += 1
+        if alert.severity != rule.severity:
+            # Escalations need a fresh acknowledgement
+            alert.acknowledged = False
+        if changed or now - alert.last_seen.timestamp() >= self.refresh_interval:
+            self._apply(alert, rule, machine, details, now)
+        return alert, False, changed
+
+    @staticmethod
+    def _apply(alert, rule, machine, details, now):
+        # Alert.__setattr__ skips values that compare equal, so only real changes invalidate its cache
+        alert.alert_type = rule.alert_type
+        alert.severity = rule.severity
+        alert.message = rule.format_message(machine)
+        alert.details = details
+        alert.last_seen = datetime.fromtimestamp(now)
+
+    def sweep(self, machine_ids, observed, active_groups, now):
+        """Resolve open alerts whose group stayed inactive for resolve_after
+
+        machine_ids are the machines updated this tick, observed the
+        (machine_id, group) keys that had a winner, active_groups a
+        machine_id -> set-of-groups lookup. Returns the resolved alerts.
+        """
+        resolved = []
+        for machine_id in machine_ids:
+            groups = self._open.get(machine_id)
+            if not groups:
+                continue
+            still_active = None
+            for group in list(groups):
+                key = (machine_id, group)
+                if key in observed:
+                    continue
+                if still_active is None:
+                    still_active = active_groups(machine_id)
+                if group in still_active:
+                    # Inside the hysteresis band or waiting on a duration
+                    self._clear_since.pop(key, None)
+                    continue
+                cleared_at = self._clear_since.setdefault(key, now)
+                if now - cleared_at >= self.resolve_after:
+                    alert = groups.pop(group)
+                    del self._clear_since[key]
+                    alert.resolved = True
+                    self._recent[key] = (alert, now)
+                    resolved.append(alert)
+        return resolved
@@ -0,0 +1,286 @@
+import json
+import os
+import re
+import string
+import threading
+
+import numpy as np
+
+_OPERATORS = {
+    '>': np.greater,
+    '>=': np.greater_equal,
+    '<': np.less,
+    '<=': np.less_equal
+}
+
+class AlertRule:
+    """One threshold rule as declared in the rules file"""
+
+    __slots__ = (
+        'name', 'group', 'field', 'op', 'threshold', 'clear', 'duration', 'cooldown',
+        'severity', 'alert_type', 'message', 'overrides'
+    )
+
+    FIELDS = ('health_score', 'failure_probability', 'temperature', 'vibration', 'rotation_speed', 'load')
+    # Placeholders format_message can fill
+    MESSAGE_FIELDS = FIELDS + ('name', 'machine_id', 'threshold', 'clear', 'timestamp')
+
+    def __init__(self, spec, default_cooldown):
+        self.name = spec['name']
+        self.group = spec.get('group', self.name)
+        self.field = spec['field']
+        self.op = spec['op']
+        self.threshold = float(spec['threshold'])
+        self.clear = float(spec.get('clear', self.threshold))
+        self.duration = float(spec.get('for', 0))
+        self.cooldown = float(spec.get('cooldown', default_cooldown))
+        self.severity = spec['severity']
+        self.alert_type = spec.get('alert_type', 'health_degradation')
+        self.message = spec['message']
+        self.overrides = {}  # machine type -> {'threshold': ..., 'clear': ...}, set by the engine
+
+        if self.field not in self.FIELDS:
+            raise ValueError(f"Rule {self.name}: unknown field {self.field}")
+        if self.op not in _OPERATORS:
+            raise ValueError(f"Rule {self.name}: unknown operator {self.op}")
+        self._check_message()
+
+    def _check_message(self):
+        """Reject templates format_message could not fill, so a typo fails the load, not a tick"""
+        try:
+            fields = [field for _, field, _, _ in string.Formatter().parse(self.message) if field is not None]
+        except ValueError as e:
+            raise ValueError(f"Rule {self.name}: invalid message template ({e})")
+        for field in fields:
+            root = re.split(r'[.\[]', field, maxsplit=1)[0]
+            if root not in self.MESSAGE_FIELDS:
+                raise ValueError(f"Rule {self.name}: unknown message placeholder {{{field}}}")
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__ if name != 'overrides'}
+
+    def limits(self, machine_type):
+        """(threshold, clear) for a machine type, after its overrides"""
+        override = self.overrides.get(machine_type, {})
+        # An overridden threshold without its own clear level has no hysteresis band
+        return (float(override.get('threshold', self.threshold)),
+                float(override.get('clear', override.get('threshold', self.clear))))
+
+    def format_message(self, machine):
+        values = dict(machine.current_readings)
+        threshold, clear = self.limits(machine.type)
+        values.update(
+            name=machine.name,
+            machine_id=machine.machine_id,
+            health_score=machine.health_score,
+            failure_probability=machine.failure_probability,
+            threshold=f"{threshold:g}",
+            clear=f"{clear:g}"
+        )
+        try:
+            return self.message.format_map(values)
+        except (KeyError, IndexError, AttributeError, TypeError, ValueError):
+            # Templates are checked on load; an alert with the raw text still beats a failed tick
+            return self.message
+
+class AlertRuleEngine:
+    """Declarative alert rules compiled to vectorized NumPy predicates
+
+    Rules come from a JSON file with a shared rule list and per-machine-type
+    overrides. Each tick evaluates every rule over the whole batch of
+    updated machines at once:
+
+      active    -- condition entered, held until the value crosses `clear`
+                   (enter/exit hysteresis)
+      sustained -- active for at least the rule's `for` seconds
+      winner    -- first sustained rule of its group (rules in a group are
+                   ordered most severe first)
+
+    Winners are reported every tick they hold, flagged when they newly
+    entered; AlertTracker turns them into one alert per machine and group.
+
+    The file is re-read when it changes, without restarting the server.
+    Per-machine state survives reloads for rules that keep their name.
+    """
+
+    def __init__(self, path, default_cooldown):
+        self.path = path
+        self.default_cooldown = default_cooldown
+        self.rules = []
+        self.machine_types = {}
+        self.version = 0
+        self._mtime = None
+        self._lock = threading.Lock()
+
+        # Per-machine rows
+        self._rows = {}
+        self._row_types = []
+        self._capacity = 0
+        self._allocate_state(0, 64)
+
+        self.load()
+
+    def _allocate_state(self, rule_count, capacity):
+        self._threshold = np.zeros((capacity, rule_count))
+        self._clear = np.zeros((capacity, rule_count))
+        self._active = np.zeros((capacity, rule_count), dtype=bool)
+        self._since = np.full((capacity, rule_count), np.nan)
+        self._winner = np.zeros((capacity, rule_count), dtype=bool)
+        self._capacity = capacity
+
+    def load(self):
+        """(Re)compile the rules file; raises on invalid definitions"""
+        with open(self.path) as f:
+            mtime = os.fstat(f.fileno()).st_mtime
+            spec = json.load(f)
+
+        rules = [AlertRule(rule_spec, self.default_cooldown) for rule_spec in spec['rules']]
+        names = [rule.name for rule in rules]
+        if len(set(names)) != len(names):
+            raise ValueError("Rule names must be unique")
+        machine_types = spec.get('machine_types', {})
+        for machine_type, overrides in machine_types.items():
+            unknown = set(overrides) - set(names)
+            if unknown:
+                raise ValueError(f"Overrides for {machine_type} name unknown rules: {sorted(unknown)}")
+            for name, override in overrides.items():
+                rules[names.index(name)].overrides[machine_type] = override
+
+        with self._lock:
+            previous = {rule.name: j for j, rule in enumerate(self.rules)}
+            old = (self._active, self._since, self._winner)
+            self.rules = rules
+            self.machine_types = machine_types
+            self._compile()
+
+            self._allocate_state(len(rules), self._capacity)
+            for j, name in enumerate(names):
+                k = previous.get(name)
+                if k is not None:
+                    self._active[:, j] = old[0][:, k]
+                    self._since[:, j] = old[1][:, k]
+                    self._winner[:, j] = old[2][:, k]
+            for row, machine_type in enumerate(self._row_types):
+                self._threshold[row], self._clear[row] = self._type_limits(machine_type)
+
+            self._mtime = mtime
+            self.version += 1
+        print(f"Loaded {len(rules)} alert rules (version {self.version})")
+
+    def reload_if_changed(self):
+        """Reload when the rules file changed; invalid files keep the current rules"""
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return False  # keep the current rules while the file is being replaced
+        if mtime == self._mtime:
+            return False
+        try:
+            self.load()
+            return True
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Error reloading alert rules: {e}")
+            self._mtime = mtime  # don't retry until the file changes again
+            return False
+
+    def _compile(self):
+        """Per-rule arrays and group layout shared by every evaluation"""
+        rules = self.rules
+        self._duration = np.array([rule.duration for rule in rules])
+        self._operators = [_OPERATORS[rule.op] for rule in rules]
+        groups = {}
+        for j, rule in enumerate(rules):
+            groups.setdefault(rule.group, []).append(j)
+        self._groups = [np.array(columns) for columns in groups.values() if len(columns) > 1]
+        self._limits_by_type = {}
+
+    def _type_limits(self, machine_type):
+        limits = self._limits_by_type.get(machine_type)
+        if limits is None:
+            pairs = [rule.limits(machine_type) for rule in self.rules]
+            limits = self._limits_by_type[machine_type] = (
+                np.array([threshold for threshold, _ in pairs], dtype=float),
+                np.array([clear for _, clear in pairs], dtype=float))
+        return limits
+
+    def _row(self, machine_id, machine_type):
+        row = self._rows.get(machine_id)
+        if row is None:
+            row = len(self._row_types)
+            if row >= self._capacity:
+                self._grow(self._capacity * 2)
+            self._rows[machine_id] = row
+            self._row_types.append(machine_type)
+            self._threshold[row], self._clear[row] = self._type_limits(machine_type)
+        return row
+
+    def _grow(self, capacity):
+        arrays = (self._threshold, self._clear, self._active, self._since, self._winner)
+        self._allocate_state(len(self.rules), capacity)
+        for new, old in zip((self._threshold, self._clear, self._active, self._since, self._winner), arrays):
+            new[:len(old)] = old
+
+    def evaluate(self, machine_ids, machine_types, values, now):
+        """Winning rules for a batch of machines
+
+        values maps each rule field to an array aligned with machine_ids.
+        Returns (batch index, AlertRule, newly_entered) triples.
+        """
+        if not machine_ids or not self.rules:
+            return []
+
+        with self._lock:
+            rows = np.fromiter(
+                (self._row(mid, mtype) for mid, mtype in zip(machine_ids, machine_types)),
+                dtype=np.intp, count=len(machine_ids)
+            )
+            threshold = self._threshold[rows]
+            clear = self._clear[rows]
+            was_active = self._active[rows]
+
+            entered = np.empty_like(was_active)
+            held = np.empty_like(was_active)
+            for j, (rule, compare) in enumerate(zip(self.rules, self._operators)):
+                field_values = values[rule.field]
+                entered[:, j] = compare(field_values, threshold[:, j])
+                held[:, j] = compare(field_values, clear[:, j])
+
+            active = entered | (was_active & held)
+            since = np.where(active, np.where(was_active, self._since[rows], now), np.nan)
+            with np.errstate(invalid='ignore'):
+                sustained = active & (now - since >= self._duration)
+
+            # Only the first (most severe) sustained rule of each group wins
+            winner = sustained
+            for columns in self._groups:
+                group = sustained[:, columns]
+                earlier = np.cumsum(group, axis=1) - group > 0
+                winner[:, columns] = group & ~earlier
+            newly_entered = winner & ~self._winner[rows]
+
+            self._active[rows] = active
+            self._since[rows] = since
+            self._winner[rows] = winner
+
+            rules = self.rules
+            return [
+                (int(i), rules[j], bool(newly_entered[i, j]))
+                for i, j in zip(*np.nonzero(winner))
+            ]
+
+    def active_groups(self, machine_id):
+        """Groups with a rule still active for machine_id (inside the hysteresis band)"""
+        with self._lock:
+            row = self._rows.get(machine_id)
+            if row is None:
+                return set()
+            active = self._active[row]
+            return {rule.group for rule, is_active in zip(self.rules, active) if is_active}
+
+    def describe(self):
+        return {
+            'version': self.version,
+            'path': self.path,
+            'rules': [rule.to_dict() for rule in self.rules],
+            'machine_types': self.machine_types
+        }
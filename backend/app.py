@@ -1,4 +1,4 @@
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, g, jsonify, request, send_from_directory, stream_with_context
 from flask_cors import CORS
 import threading
 import time
@@ -6,43 +6,168 @@ import sys
 import os
 from datetime import datetime, timedelta
 import json
+import math
+
+import numpy as np
+
+from config import Config
 
 # Add paths for imports
-sys.path.append('/home/sakshamkapoor/Projects/Aura/data')
-sys.path.append('/home/sakshamkapoor/Projects/Aura/ml_model')
+sys.path.append(os.path.join(Config.BASE_DIR, 'data'))
+sys.path.append(os.path.join(Config.BASE_DIR, 'ml_model'))
 
 from simulate_data import DataSimulator
 from train_model import AuraMachineHealthModel
-from config import Config
-from models import MachineData, Alert, MaintenanceLog
+from models import MachineData, Alert, MaintenanceLog, serialization_cache_counts
+from history_store import AlertHistory, DownsampledReadings, ReadingHistory
+from maintenance_store import MaintenanceLogStore
+from state_store import StateStore, object_state, restore_object
+from metrics import MetricsRegistry
+from scheduler import FixedRateScheduler, MachineCadence
+from fleet_pool import ShardedFleetProcessor
+from alert_rules import AlertRuleEngine
+from alert_lifecycle import AlertTracker
+from fleet_stats import FleetAggregates
+from machine_index import InvalidCursor, MachineIndex
+from model_registry import ModelRegistry, ShadowScorer, UnknownModelVersion
+from model_partitions import PartitionCache
+from retraining import InsufficientTrainingData, RetrainingPipeline
+from retention import RetentionManager, current_rss
+from reading_log import ReadingRecorder
+from encoding import UnsupportedFormat, compress, encode_payload, negotiate_encoding, negotiate_format, should_compress
+
+class ModelLoading(Exception):
+    pass
 
 class AuraAPI:
-    def __init__(self):
+    def __init__(self, storage_dir=None, model=None, simulator=None, background=True, persist_state=None,
+                 record_readings=None):
+        """Every argument defaults to the production setup
+        
+        storage_dir holds the maintenance log, state snapshots and model
+        registry (default Config.STORAGE_DIR). model is a loaded
+        AuraMachineHealthModel served as-is instead of the registry's
+        active version (e.g. AuraMachineHealthModel.fixture()), simulator a
+        DataSimulator (e.g. seeded). With background=False no worker
+        threads start and tick() advances the simulation. persist_state
+        overrides Config.STATE_PERSISTENCE, record_readings
+        Config.READING_LOG_PATH.
+        
+        When serving, the model is loaded on a separate thread after the
+        routes are set up, so the API answers (and /api/health reports
+        'starting') before sklearn is even imported; scoring starts once
+        the model is ready.
+        """
         self.app = Flask(__name__)
         self.app.config.from_object(Config)
         CORS(self.app, origins=Config.CORS_ORIGINS)
         
+        if storage_dir is None:
+            registry_dir, maintenance_db, state_dir = Config.MODEL_REGISTRY_DIR, Config.MAINTENANCE_DB_PATH, Config.STATE_DIR
+        else:
+            registry_dir = os.path.join(storage_dir, 'models')
+            maintenance_db = os.path.join(storage_dir, 'maintenance.db')
+            state_dir = os.path.join(storage_dir, 'state')
+        if persist_state is None:
+            persist_state = Config.STATE_PERSISTENCE
+        if record_readings is None:
+            record_readings = Config.READING_LOG_PATH
+        
         # Initialize components
-        self.data_simulator = DataSimulator()
-        self.ml_model = AuraMachineHealthModel()
+        self.data_simulator = simulator or DataSimulator()
+        self.model_registry = ModelRegistry(registry_dir)
+        self.ml_model = None  # live model, replaced wholesale on promotion
+        self.shadow_scorer = None
+        self._model_lock = threading.Lock()
         
         # Data storage
         self.machines = {}
+        self.machine_tiers = {}  # machine_id -> model tier serving it
         self.alerts = []
-        self.maintenance_logs = []
-        self.historical_data = []
+        self.alert_history = AlertHistory()  # alerts evicted from self.alerts
+        self.maintenance_logs = MaintenanceLogStore(path=maintenance_db)
+        self.historical_data = ReadingHistory(Config.READING_HISTORY_MAX_ROWS)  # scored readings, for retraining
+        self.reading_tiers = [DownsampledReadings(bucket, max_age) for bucket, max_age in Config.READING_TIERS]
+        self.alert_rules = AlertRuleEngine(Config.ALERT_RULES_PATH, Config.ALERT_COOLDOWN)
+        self.alert_tracker = AlertTracker(Config.ALERT_RESOLVE_AFTER, Config.ALERT_REFRESH_INTERVAL)
+        self.fleet_stats = FleetAggregates()
+        self.machine_index = MachineIndex()
+        self.state_store = StateStore(state_dir) if persist_state else None
+        self.reading_recorder = ReadingRecorder(record_readings, Config.READING_LOG_MAX_BYTES) if record_readings else None
+        self.last_tick_stages = {}  # stage -> seconds of the latest tick
+        self.retention = RetentionManager(
+            self.historical_data, self.reading_tiers, self.alert_history, self.maintenance_logs,
+            archive_resolved_alerts=self._archive_resolved_alerts)
         
         # Initialize machines
         self._initialize_machines()
         
-        # Load or train ML model
-        self._initialize_ml_model()
+        # Restore machine/alert state saved before the last shutdown
+        self._restore_state()
+        self.fleet_stats.rebuild(self.machines.values(), self.alerts)
+        for machine in self.machines.values():
+            self.machine_index.update(machine)
+        
+        self.retraining = RetrainingPipeline(
+            self.model_registry, self.historical_data, self.maintenance_logs, on_published=self._publish_retrained)
+        self.fleet_processor = None
+        self.scheduler = None
+        self.retrain_scheduler = None
+        self.model_ready = threading.Event()
+        self.model_error = None
         
-        # Setup routes
+        # Setup instrumentation and routes
+        self._setup_metrics()
         self._setup_routes()
         
-        # Start background tasks
-        self._start_background_tasks()
+        # Load or train the ML model, then start background tasks
+        if model is None and background:
+            threading.Thread(target=self._load_model_in_background, name='aura-model-loader', daemon=True).start()
+        else:
+            self._start_serving(model, background)
+    
+    def _start_serving(self, model, background):
+        if model is not None:
+            self.ml_model = model
+        else:
+            self._initialize_ml_model()
+        self.fleet_processor = self._start_fleet_processor()
+        self.model_ready.set()
+        if background:
+            self._start_background_tasks()
+    
+    def _load_model_in_background(self):
+        try:
+            self._start_serving(None, True)
+        except Exception as e:
+            self.model_error = f"{type(e).__name__}: {e}"
+            print(f"Failed to load the ML model: {self.model_error}")
+    
+    def _live_model(self):
+        """The serving model; raises ModelLoading until it is loaded"""
+        model = self.ml_model
+        if model is None:
+            raise ModelLoading(self.model_error or "The ML model is still loading")
+        return model
+    
+    def tick(self, machine_ids=None):
+        """Advance the simulation and scoring by one update (for background=False)"""
+        self._update_machine_data(machine_ids)
+    
+    def close(self):
+        """Stop worker threads and pools and close the stores"""
+        for scheduler in (self.scheduler, self.retrain_scheduler):
+            if scheduler is not None:
+                scheduler.stop()
+        if self.shadow_scorer is not None:
+            self.shadow_scorer.close()
+        if self.fleet_processor is not None:
+            self.fleet_processor.close()
+        if self.state_store is not None:
+            self.state_store.close()
+        if self.reading_recorder is not None:
+            self.reading_recorder.close()
+        self.maintenance_logs.close()
     
     def _initialize_machines(self):
         """Initialize machine objects"""
@@ -57,48 +182,358 @@ class AuraAPI:
             machine.last_maintenance = datetime.now() - timedelta(days=30)
             machine.next_maintenance = datetime.now() + timedelta(days=60)
             self.machines[machine_id] = machine
+            self.machine_tiers[machine_id] = Config.MODEL_TIER_BY_CRITICALITY[
+                config.get('criticality', Config.DEFAULT_CRITICALITY)]
         
         print(f"Initialized {len(self.machines)} machines")
     
+    def _restore_state(self):
+        """Restore machines, alerts and simulator state from the last snapshot plus WAL"""
+        if self.state_store is None:
+            return
+        
+        snapshot, records = self.state_store.restore()
+        
+        # Only the newest state of each machine matters: walk machine records
+        # newest first and stop decoding once every machine is accounted for
+        machine_states = {}
+        simulator_states = {}
+        for record in reversed(records):
+            if len(machine_states) == len(self.machines):
+                break
+            if record.op == 'tick':
+                payload = record.payload
+                for state in payload['machines']:
+                    machine_states.setdefault(state[0], state)
+                for machine_id, state in payload['simulator_states'].items():
+                    simulator_states.setdefault(machine_id, state)
+            elif record.op == 'machine':
+                state = record.payload
+                machine_states.setdefault(state[0], state)
+        
+        if snapshot:
+            if len(machine_states) < len(self.machines):
+                for state in snapshot['machines']:
+                    machine_states.setdefault(state[0], state)
+                for machine_id, state in snapshot['simulator_states'].items():
+                    simulator_states.setdefault(machine_id, state)
+            self.alerts = [restore_object(Alert, state) for state in snapshot['alerts']]
+            self.alert_history.restore_state(snapshot['alert_history'])
+        
+        # Alert changes are replayed in order
+        for record in records:
+            if record.op == 'alert':
+                self._store_alert(restore_object(Alert, record.payload), persist=False)
+            elif record.op == 'alert_update':
+                updated = restore_object(Alert, record.payload)
+                for index, alert in enumerate(self.alerts):
+                    if alert.alert_id == updated.alert_id:
+                        self.alerts[index] = updated
+                        break
+            elif record.op == 'acknowledge':
+                alert_id = record.payload
+                alert = next((a for a in self.alerts if a.alert_id == alert_id), None)
+                if alert:
+                    alert.acknowledged = True
+        
+        self.alert_tracker.restore(self.alerts)
+        
+        for machine_id, state in machine_states.items():
+            # Machines no longer in the configuration are dropped
+            if machine_id in self.machines:
+                self.machines[machine_id] = restore_object(MachineData, state)
+        for machine_id, state in simulator_states.items():
+            # Resume simulated degradation where it left off
+            if machine_id in self.data_simulator.machine_states:
+                self.data_simulator.machine_states[machine_id] = state
+        
+        if snapshot or records:
+            print(f"Restored state ({len(records)} WAL records) in {self.state_store.restore_seconds:.3f}s")
+    
+    def _persist_tick(self, updated_machines):
+        """Write a tick's machine changes to the WAL and snapshot when due"""
+        if self.state_store is None:
+            return
+        
+        self.state_store.log('tick', {
+            'machines': [object_state(machine) for machine in updated_machines],
+            'simulator_states': dict(self.data_simulator.machine_states)
+        })
+        # One fsync per tick covers the tick record and any alerts it raised
+        self.state_store.sync()
+        
+        if self.state_store.snapshot_due():
+            # Capturing is a cheap shallow copy; pickling and disk I/O happen
+            # on the snapshot thread so the worker is not blocked
+            self.state_store.write_snapshot({
+                'machines': [object_state(machine) for machine in self.machines.values()],
+                'alerts': [object_state(alert) for alert in self.alerts],
+                'alert_history': self.alert_history.export_state(),
+                'simulator_states': dict(self.data_simulator.machine_states)
+            })
+    
     def _initialize_ml_model(self):
-        """Initialize and load ML model"""
-        try:
-            self.ml_model.load_model()
-            print("ML model loaded successfully")
-        except Exception as e:
-            print(f"Error loading ML model: {e}")
-            print("Training new model...")
-            self.ml_model.train_model()
+        """Load the active model version (and shadow candidate) from the registry"""
+        version = self.model_registry.active_version()
+        if version is None:
+            version = self._bootstrap_model_version()
+            self.model_registry.set_active(version)
+        self.ml_model = self._load_model_version(version)
+        print(f"ML model version {version} loaded")
+        
+        shadow = self.model_registry.shadow_version()
+        if shadow is not None and shadow != version:
+            self.shadow_scorer = ShadowScorer(self.model_registry.load(shadow))
+            print(f"Shadow scoring with model version {shadow}")
+    
+    def _load_model_version(self, version):
+        """A registry version with the distilled tiers its machines need attached"""
+        model = self.model_registry.load(version)
+        sample = None
+        for tier in sorted(set(self.machine_tiers.values()) - {'forest'}):
+            distilled = self.model_registry.load_tier(model, tier)
+            if distilled is None:
+                if sample is None:
+                    sample = self._distillation_sample(model)
+                print(f"Distilling model version {version} into the {tier} tier...")
+                distilled = model.distill(
+                    tier, sample,
+                    gbm_trees=Config.DISTILL_GBM_TREES,
+                    gbm_depth=Config.DISTILL_GBM_DEPTH,
+                    lookup_bins=Config.DISTILL_LOOKUP_BINS
+                )
+                self.model_registry.publish_tier(distilled)
+            model.tiers[tier] = distilled
+        
+        if Config.MODEL_PARTITIONS:
+            if not self.model_registry.partitions(version):
+                self._train_partitions(model)
+            model.partitions = PartitionCache(
+                self.model_registry, version, Config.MODEL_PARTITION_MEMORY_BUDGET_MB * 1024 * 1024)
+        return model
+    
+    def _train_partitions(self, model):
+        """Train and publish the per-machine-type models of a version (once per version)"""
+        simulator = DataSimulator()
+        print(f"Training per-type model partitions for version {model.version}...")
+        partitions = model.train_partitions(
+            simulator.generate_historical_data(days=90, samples_per_day=24, output_path=None),
+            {machine_id: info['type'] for machine_id, info in simulator.machines.items()},
+            min_rows=Config.MODEL_PARTITION_MIN_ROWS,
+            n_estimators=Config.MODEL_PARTITION_TREES,
+            max_depth=Config.MODEL_PARTITION_MAX_DEPTH
+        )
+        for partition in partitions.values():
+            self.model_registry.publish_partition(model.version, partition)
+    
+    def _distillation_sample(self, model):
+        """Scaled feature rows to fit students on: captured readings, else simulated history"""
+        if len(self.historical_data) >= Config.DISTILL_MIN_SAMPLES:
+            columns = self.historical_data.export_state()['columns']
+        else:
+            columns = DataSimulator().generate_historical_data(days=30, output_path=None)
+        return model.prepare_columns(columns)
+    
+    def _bootstrap_model_version(self):
+        """First registry version: the ml_model/ artifacts, or a fresh model if allowed"""
+        model = AuraMachineHealthModel()
+        if os.path.exists(model.model_path) and os.path.exists(model.scaler_path):
+            model.load_model()
+            return self.model_registry.publish(model, 'import')
+        if not Config.MODEL_TRAIN_IF_MISSING:
+            raise FileNotFoundError(
+                f"No model in {self.model_registry.root} or {model.model_path} and AURA_TRAIN_IF_MISSING=0")
+        print("No trained model found. Training new model...")
+        model.train_model()
+        return self.model_registry.publish(model, 'train')
+    
+    def promote_model(self, version):
+        """Hot-swap the live model; ticks and requests in flight finish on the model they started with"""
+        model = self._load_model_version(version)  # loaded before the swap, so nothing waits on disk
+        with self._model_lock:
+            self.model_registry.set_active(version)
+            self.ml_model = model
+            if self.fleet_processor is not None:
+                self.fleet_processor.reload(model.model_path, model.scaler_path)
+            if self.shadow_scorer is not None and self.shadow_scorer.version == version:
+                self._swap_shadow(None)
+        print(f"Promoted model version {version}")
+    
+    def shadow_model(self, version):
+        """Score every tick with version alongside the live model (None stops shadowing)"""
+        scorer = ShadowScorer(self.model_registry.load(version)) if version is not None else None
+        with self._model_lock:
+            self._swap_shadow(scorer)
+    
+    def _publish_retrained(self, version):
+        """Hand a retrained version to the serving path per RETRAIN_PUBLISH"""
+        if Config.RETRAIN_PUBLISH == 'promote':
+            self.promote_model(version)
+        elif Config.RETRAIN_PUBLISH == 'shadow':
+            self.shadow_model(version)
+    
+    def _swap_shadow(self, scorer):
+        self.model_registry.set_shadow(scorer.version if scorer is not None else None)
+        old, self.shadow_scorer = self.shadow_scorer, scorer
+        if old is not None:
+            old.close()
+    
+    def _start_fleet_processor(self):
+        """Worker pool for sharded fleet scoring, when configured"""
+        if Config.FLEET_WORKERS <= 1:
+            return None
+        print(f"Starting {Config.FLEET_WORKERS} fleet scoring workers...")
+        return ShardedFleetProcessor(
+            self.ml_model.model_path,
+            self.ml_model.scaler_path,
+            Config.FLEET_WORKERS,
+            min_shard_size=Config.FLEET_MIN_SHARD_SIZE,
+            start_method=Config.FLEET_START_METHOD
+        )
+    
+    def _setup_metrics(self):
+        """Register hot-path instrumentation exposed at /api/metrics"""
+        self.metrics = MetricsRegistry()
+        
+        self.tick_duration = self.metrics.histogram(
+            'aura_tick_duration_seconds', 'Background tick duration')
+        self.tick_stage_duration = self.metrics.histogram(
+            'aura_tick_stage_duration_seconds', 'Background tick duration by stage', ['stage'])
+        self.inference_batch_size = self.metrics.histogram(
+            'aura_inference_batch_size', 'Machines scored per inference call',
+            buckets=(1, 5, 10, 50, 100, 500, 1000, 5000, 10000))
+        self.worker_lag = self.metrics.gauge(
+            'aura_background_worker_lag_seconds', 'Delay of the last tick start behind its scheduled deadline')
+        self.worker_errors = self.metrics.counter(
+            'aura_background_worker_errors_total', 'Exceptions raised in the background worker')
+        self.worker_overruns = self.metrics.counter(
+            'aura_background_worker_overruns_total', 'Ticks that finished past the next deadline')
+        self.worker_skipped_ticks = self.metrics.counter(
+            'aura_background_worker_skipped_ticks_total', 'Deadlines dropped after overruns')
+        self.request_latency = self.metrics.histogram(
+            'aura_http_request_duration_seconds', 'API request latency', ['endpoint', 'method', 'status'])
+        
+        # Values the app already tracks are read at scrape time only
+        self.metrics.counter(
+            'aura_serialization_cache_total', 'Cached JSON fragment lookups', ['model', 'result'],
+            callback=lambda: {
+                (cls.__name__, result): count
+                for cls, counts in list(serialization_cache_counts.items())
+                for result, count in zip(('hit', 'miss'), counts)
+            })
+        self.metrics.gauge(
+            'aura_alert_store_size', 'Records held per alert/log store', ['store'],
+            callback=lambda: {
+                ('live_alerts',): len(self.alerts),
+                ('archived_alerts',): len(self.alert_history),
+                ('maintenance_logs',): len(self.maintenance_logs)
+            })
+        self.metrics.gauge(
+            'aura_alert_archive_bytes', 'Memory held by the columnar alert archive',
+            callback=lambda: self.alert_history.nbytes())
+        self.metrics.gauge(
+            'aura_process_resident_bytes', 'Resident set size of the API process', callback=current_rss)
+        self.metrics.gauge(
+            'aura_reading_history_bytes', 'Memory held by raw and downsampled reading history', ['tier'],
+            callback=lambda: dict(
+                [(('raw',), self.historical_data.nbytes())] +
+                [((f"{tier.bucket_seconds}s",), tier.nbytes()) for tier in self.reading_tiers]))
+        self.metrics.counter(
+            'aura_retention_evicted_total', 'Records dropped or archived by retention', ['store'],
+            callback=lambda: {(store,): count for store, count in self.retention.evicted.items()})
+        self.metrics.gauge(
+            'aura_machines', 'Machines being monitored', callback=lambda: len(self.machines))
+        self.metrics.gauge(
+            'aura_model_version', 'Registry version of the live and shadow models', ['role'],
+            callback=lambda: {
+                ('live',): (self.ml_model.version or 0) if self.ml_model is not None else 0,
+                ('shadow',): self.shadow_scorer.version if self.shadow_scorer is not None else 0
+            })
+        self.metrics.gauge(
+            'aura_model_partition_bytes', 'Artifact bytes of the loaded per-type model partitions',
+            callback=lambda: self._partition_cache().loaded_bytes() if self._partition_cache() is not None else 0)
+        self.metrics.counter(
+            'aura_model_partition_loads_total', 'Per-type model partitions loaded from disk and evicted', ['event'],
+            callback=lambda: {
+                ('load',): self._partition_cache().loads,
+                ('evict',): self._partition_cache().evictions
+            } if self._partition_cache() is not None else {})
+        self.metrics.counter(
+            'aura_shadow_batches_total', 'Tick batches offered to the shadow model', ['result'],
+            callback=lambda: {
+                ('scored',): self.shadow_scorer.batches,
+                ('skipped',): self.shadow_scorer.skipped,
+                ('error',): self.shadow_scorer.errors
+            } if self.shadow_scorer is not None else {})
+        
+        @self.app.before_request
+        def start_request_timer():
+            g.request_start = time.perf_counter()
+        
+        @self.app.after_request
+        def record_request_latency(response):
+            start = g.get('request_start')
+            if start is not None:
+                self.request_latency.observe(
+                    time.perf_counter() - start,
+                    endpoint=request.url_rule.rule if request.url_rule else 'unmatched',
+                    method=request.method,
+                    status=response.status_code
+                )
+            return response
+    
+    def _partition_cache(self):
+        model = self.ml_model
+        return model.partitions if model is not None else None
     
     def _setup_routes(self):
         """Setup API routes"""
         
+        @self.app.after_request
+        def compress_response(response):
+            """gzip/brotli-encode large responses the client accepts"""
+            if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                    or 'Content-Encoding' in response.headers):
+                return response
+            response.vary.add('Accept-Encoding')
+            body = response.get_data()
+            if not should_compress(body, response.mimetype):
+                return response
+            coding = negotiate_encoding(request.headers.get('Accept-Encoding'))
+            if coding is not None:
+                response.set_data(compress(body, coding))
+                response.headers['Content-Encoding'] = coding
+            return response
+        
+        @self.app.errorhandler(UnsupportedFormat)
+        def unsupported_format(e):
+            return jsonify({'error': str(e)}), 406
+        
+        @self.app.errorhandler(ModelLoading)
+        def model_loading(e):
+            return jsonify({'error': str(e)}), 503
+        
         @self.app.route('/')
         def serve_dashboard():
             """Serve the main dashboard"""
-            return send_from_directory('/home/sakshamkapoor/Projects/Aura/frontend', 'index.html')
+            return send_from_directory(Config.FRONTEND_DIR, 'index.html')
         
         @self.app.route('/static/<path:filename>')
         def serve_static(filename):
             """Serve static files"""
-            return send_from_directory('/home/sakshamkapoor/Projects/Aura/frontend', filename)
+            return send_from_directory(Config.FRONTEND_DIR, filename)
         
         @self.app.route('/api/status')
         def get_status():
             """Get current status of all machines"""
             try:
-                # Update all machine data
-                self._update_machine_data()
-                
-                status_data = {
-                    'timestamp': datetime.now().isoformat(),
-                    'machines': {mid: machine.to_dict() for mid, machine in self.machines.items()},
-                    'system_health': self._calculate_system_health(),
-                    'active_alerts': len([a for a in self.alerts if not a.resolved]),
-                    'total_machines': len(self.machines)
-                }
-                
-                return jsonify(status_data)
+                # Machine state is refreshed by the background worker; serve the
+                # latest snapshot assembled from per-machine cached JSON
+                fmt = negotiate_format(request.args.get('format'), request.headers.get('Accept'))
+                body, mimetype = self._build_status_payload(fmt)
+                return Response(body, mimetype=mimetype)
+            except UnsupportedFormat:
+                raise
             except Exception as e:
                 return jsonify({'error': str(e)}), 500
         
@@ -111,31 +546,134 @@ class AuraAPI:
                 
                 machine = self.machines[machine_id]
                 
-                # Get recent alerts for this machine
-                recent_alerts = [
+                # Get recent alerts for this machine (archived first, then live)
+                since = datetime.now() - timedelta(days=7)
+                recent_alerts = self.alert_history.rows(machine_id=machine_id, since=since) + [
                     alert.to_dict() for alert in self.alerts 
                     if alert.machine_id == machine_id and 
-                    alert.timestamp > datetime.now() - timedelta(days=7)
+                    alert.timestamp > since
                 ]
                 
                 # Get maintenance history
-                maintenance_history = [
-                    log.to_dict() for log in self.maintenance_logs 
-                    if log.machine_id == machine_id
-                ]
+                maintenance_history = self.maintenance_logs.rows(machine_id=machine_id)
                 
                 # Get historical sensor data (last 24 hours simulated)
                 historical_readings = self._get_historical_readings(machine_id)
                 
-                return jsonify({
+                payload = {
                     'machine': machine.to_dict(),
                     'recent_alerts': recent_alerts,
                     'maintenance_history': maintenance_history,
                     'historical_readings': historical_readings
-                })
+                }
+                fmt = negotiate_format(request.args.get('format'), request.headers.get('Accept'))
+                if fmt == 'json':
+                    return jsonify(payload)
+                body, mimetype = encode_payload(
+                    payload, fmt, columnar_keys=('recent_alerts', 'maintenance_history', 'historical_readings')
+                )
+                return Response(body, mimetype=mimetype)
+            except UnsupportedFormat:
+                raise
+            except Exception as e:
+                return jsonify({'error': str(e)}), 500
+        
+        @self.app.route('/api/machines')
+        def list_machines():
+            """Cursor-paginated machine listing with filters, sorting and sparse fields"""
+            try:
+                body = self._build_machines_json(
+                    limit=request.args.get('limit', 50, type=int),
+                    cursor=request.args.get('cursor'),
+                    sort=request.args.get('sort', 'machine_id'),
+                    order=request.args.get('order', 'asc'),
+                    filters={
+                        field: request.args.get(field)
+                        for field in self.MACHINE_FILTER_FIELDS
+                        if request.args.get(field)
+                    },
+                    fields=request.args.get('fields')
+                )
+                return Response(body, mimetype='application/json')
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+        
+        @self.app.route('/api/fleet/summary')
+        def get_fleet_summary():
+            """Fleet-wide health and alert rollups"""
+            top = request.args.get('top', 10, type=int)
+            summary = self.fleet_stats.summary(top)
+            summary['timestamp'] = datetime.now().isoformat()
+            return jsonify(summary)
+        
+        @self.app.route('/api/models')
+        def list_models():
+            """Registry versions, the live model and shadow comparison stats"""
+            payload = self.model_registry.describe()
+            model = self._live_model()
+            payload['live'] = model.version
+            payload['live_tiers'] = ['forest'] + sorted(model.tiers)
+            partitions = model.partitions
+            payload['partitions'] = partitions.stats() if partitions is not None else None
+            shadow = self.shadow_scorer
+            payload['shadow_stats'] = shadow.stats() if shadow is not None else None
+            payload['retraining'] = self.retraining.status()
+            return jsonify(payload)
+        
+        @self.app.route('/api/models/retrain', methods=['POST'])
+        def start_retraining():
+            """Retrain from the captured readings and maintenance outcomes in the background"""
+            base_version = self._live_model().version
+            try:
+                self.retraining.start(base_version)
+                return jsonify({'message': 'Retraining started', 'base_version': base_version}), 202
+            except InsufficientTrainingData as e:
+                return jsonify({'error': f"Not enough training data: {e}"}), 400
+            except RuntimeError as e:
+                return jsonify({'error': str(e)}), 409
+        
+        @self.app.route('/api/models/<int:version>/evaluation')
+        def get_model_evaluation(version):
+            """Evaluation report (CV, permutation importance, calibration, latency) of a version"""
+            try:
+                report = self.model_registry.evaluation(version)
+            except UnknownModelVersion:
+                return jsonify({'error': 'Model version not found'}), 404
+            if report is None:
+                return jsonify({'error': 'No evaluation report for this version'}), 404
+            return jsonify(report)
+        
+        @self.app.route('/api/models/<int:version>/promote', methods=['POST'])
+        def promote_model(version):
+            """Hot-swap the live model to a registry version"""
+            self._live_model()
+            try:
+                self.promote_model(version)
+                return jsonify({'message': 'Model promoted', 'live': version})
+            except UnknownModelVersion:
+                return jsonify({'error': 'Model version not found'}), 404
+            except Exception as e:
+                return jsonify({'error': str(e)}), 500
+        
+        @self.app.route('/api/models/<int:version>/shadow', methods=['POST'])
+        def shadow_model(version):
+            """Score every tick with a candidate version next to the live model"""
+            if version == self._live_model().version:
+                return jsonify({'error': 'Version is already live'}), 400
+            try:
+                self.shadow_model(version)
+                return jsonify({'message': 'Shadow scoring started', 'shadow': version})
+            except UnknownModelVersion:
+                return jsonify({'error': 'Model version not found'}), 404
             except Exception as e:
                 return jsonify({'error': str(e)}), 500
         
+        @self.app.route('/api/models/shadow', methods=['DELETE'])
+        def stop_shadow_model():
+            """Stop shadow scoring"""
+            self.shadow_model(None)
+            return jsonify({'message': 'Shadow scoring stopped'})
+        
         @self.app.route('/api/predict', methods=['POST'])
         def predict_failure():
             """Predict failure for given sensor data"""
@@ -145,13 +683,9 @@ class AuraAPI:
                 if not data or 'sensor_data' not in data:
                     return jsonify({'error': 'Invalid request data'}), 400
                 
-                sensor_data = data['sensor_data']
-                analysis = self.ml_model.analyze_machine_health(sensor_data)
-                
-                return jsonify({
-                    'prediction': analysis,
-                    'timestamp': datetime.now().isoformat()
-                })
+                return jsonify(self._build_prediction_payload(data['sensor_data']))
+            except ModelLoading:
+                raise
             except Exception as e:
                 return jsonify({'error': str(e)}), 500
         
@@ -162,20 +696,24 @@ class AuraAPI:
                 limit = request.args.get('limit', 50, type=int)
                 severity = request.args.get('severity', None)
                 
-                filtered_alerts = self.alerts
-                if severity:
-                    filtered_alerts = [a for a in filtered_alerts if a.severity == severity]
-                
-                # Sort by timestamp (newest first) and limit
-                filtered_alerts = sorted(filtered_alerts, key=lambda x: x.timestamp, reverse=True)[:limit]
-                
-                return jsonify({
-                    'alerts': [alert.to_dict() for alert in filtered_alerts],
-                    'total_count': len(filtered_alerts)
-                })
+                return Response(self._build_alerts_json(limit, severity), mimetype='application/json')
             except Exception as e:
                 return jsonify({'error': str(e)}), 500
         
+        @self.app.route('/api/alerts/rules')
+        def get_alert_rules():
+            """Get the compiled alert rules"""
+            return jsonify(self.alert_rules.describe())
+        
+        @self.app.route('/api/alerts/rules/reload', methods=['POST'])
+        def reload_alert_rules():
+            """Re-read the alert rules file without restarting the server"""
+            try:
+                self.alert_rules.load()
+                return jsonify({'message': 'Alert rules reloaded', 'version': self.alert_rules.version})
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                return jsonify({'error': f"Invalid alert rules: {e}"}), 400
+        
         @self.app.route('/api/alerts/<alert_id>/acknowledge', methods=['POST'])
         def acknowledge_alert(alert_id):
             """Acknowledge an alert"""
@@ -185,6 +723,9 @@ class AuraAPI:
                     return jsonify({'error': 'Alert not found'}), 404
                 
                 alert.acknowledged = True
+                if self.state_store is not None:
+                    self.state_store.log('acknowledge', alert_id)
+                    self.state_store.sync()
                 return jsonify({'message': 'Alert acknowledged', 'alert': alert.to_dict()})
             except Exception as e:
                 return jsonify({'error': str(e)}), 500
@@ -196,9 +737,24 @@ class AuraAPI:
                 data = request.get_json()
                 
                 required_fields = ['machine_id', 'activity_type', 'description']
-                if not all(field in data for field in required_fields):
+                if not isinstance(data, dict) or not all(field in data for field in required_fields):
                     return jsonify({'error': 'Missing required fields'}), 400
                 
+                # Numeric fields are checked here so a bad value is a 400, not a failed store write
+                numbers = {}
+                for field in ('duration', 'cost'):
+                    value = data.get(field)
+                    if value is None:
+                        continue
+                    try:
+                        if isinstance(value, bool):
+                            raise ValueError
+                        numbers[field] = float(value)
+                    except (TypeError, ValueError):
+                        return jsonify({'error': f"'{field}' must be a number"}), 400
+                    if not math.isfinite(numbers[field]) or numbers[field] < 0:
+                        return jsonify({'error': f"'{field}' must be a non-negative number"}), 400
+                
                 # Create maintenance log
                 log = MaintenanceLog(
                     machine_id=data['machine_id'],
@@ -207,12 +763,12 @@ class AuraAPI:
                     technician=data.get('technician', 'System')
                 )
                 
-                if 'duration' in data:
-                    log.duration = data['duration']
+                if 'duration' in numbers:
+                    log.duration = numbers['duration']
                 if 'parts_used' in data:
                     log.parts_used = data['parts_used']
-                if 'cost' in data:
-                    log.cost = data['cost']
+                if 'cost' in numbers:
+                    log.cost = numbers['cost']
                 
                 self.maintenance_logs.append(log)
                 
@@ -224,6 +780,12 @@ class AuraAPI:
                     # Reset health score if major maintenance
                     if data['activity_type'] in ['repair', 'replacement']:
                         machine.health_score = min(100, machine.health_score + 20)
+                    self.fleet_stats.update_machine(machine)
+                    self.machine_index.update(machine)
+                    
+                    if self.state_store is not None:
+                        self.state_store.log('machine', object_state(machine))
+                        self.state_store.sync()
                 
                 return jsonify({
                     'message': 'Maintenance logged successfully',
@@ -235,129 +797,344 @@ class AuraAPI:
         @self.app.route('/api/health')
         def health_check():
             """API health check"""
-            return jsonify({
-                'status': 'healthy',
-                'timestamp': datetime.now().isoformat(),
-                'version': '1.0.0',
-                'components': {
-                    'data_simulator': 'running',
-                    'ml_model': 'loaded' if self.ml_model.model is not None else 'not_loaded',
-                    'machines': len(self.machines),
-                    'alerts': len(self.alerts)
-                }
-            })
+            return jsonify(self._build_health_payload())
+        
+        @self.app.route('/api/metrics')
+        def get_metrics():
+            """Instrumentation in Prometheus text format"""
+            return Response(self.metrics.render(), content_type=MetricsRegistry.CONTENT_TYPE)
+        
+        @self.app.route('/api/stream')
+        def stream_status():
+            """Push machine status to the client as server-sent events"""
+            def generate():
+                while True:
+                    yield self._format_stream_event(self._build_status_json())
+                    time.sleep(Config.STREAM_INTERVAL)
+            
+            return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                            headers={'Cache-Control': 'no-cache'})
+    
+    def _build_status_json(self):
+        """Build the /api/status response body from cached per-machine JSON fragments"""
+        machines_json = ','.join(
+            f'{json.dumps(mid)}:{machine.to_json()}' for mid, machine in self.machines.items()
+        )
+        return (
+            f'{{"timestamp":{json.dumps(datetime.now().isoformat())},'
+            f'"machines":{{{machines_json}}},'
+            f'"system_health":{json.dumps(self._calculate_system_health())},'
+            f'"active_alerts":{self.fleet_stats.open_alert_count()},'
+            f'"total_machines":{len(self.machines)}}}'
+        )
+    
+    def _build_status_payload(self, fmt='json'):
+        """(body, mimetype) for /api/status; compact formats send machines as columns"""
+        if fmt == 'json':
+            return self._build_status_json(), 'application/json'
+        payload = {
+            'timestamp': datetime.now().isoformat(),
+            'machines': [machine.to_dict() for machine in self.machines.values()],
+            'system_health': self._calculate_system_health(),
+            'active_alerts': self.fleet_stats.open_alert_count(),
+            'total_machines': len(self.machines)
+        }
+        return encode_payload(payload, fmt, columnar_keys=('machines',))
     
-    def _update_machine_data(self):
-        """Update all machine data with current readings and predictions"""
-        current_readings = self.data_simulator.get_all_current_readings()
+    MACHINE_FILTER_FIELDS = ('alert_level', 'type', 'location')
+    MACHINE_PAGE_MAX = 500
+    
+    def _build_machines_json(self, limit=50, cursor=None, sort='machine_id', order='asc', filters=None, fields=None):
+        """Build one /api/machines page; raises ValueError on bad parameters"""
+        if order not in ('asc', 'desc'):
+            raise ValueError("order must be 'asc' or 'desc'")
+        limit = max(1, min(limit, self.MACHINE_PAGE_MAX))
         
-        for machine_id, reading_data in current_readings.items():
-            if machine_id in self.machines:
-                machine = self.machines[machine_id]
-                
-                # Update sensor readings
-                machine.current_readings = {
-                    'temperature': round(reading_data['temperature'], 1),
-                    'vibration': round(reading_data['vibration'], 2),
-                    'rotation_speed': round(reading_data['rotation_speed'], 0),
-                    'load': round(reading_data['load'], 1),
-                    'timestamp': reading_data['timestamp'].isoformat()
-                }
-                
-                # Get ML prediction
-                analysis = self.ml_model.analyze_machine_health(reading_data)
-                
-                # Update machine health data
-                machine.health_score = analysis['health_score']
-                machine.failure_probability = analysis['failure_probability']
-                machine.alert_level = analysis['alert_level']
-                machine.potential_issues = analysis['potential_issues']
-                machine.recommendation = analysis['recommendation']
-                machine.last_updated = datetime.now()
-                
-                # Generate alerts if needed
-                self._check_and_generate_alerts(machine_id, machine, analysis)
-    
-    def _check_and_generate_alerts(self, machine_id, machine, analysis):
-        """Check if alerts should be generated and create them"""
-        current_time = datetime.now()
-        
-        # Check if we need to generate an alert
-        should_alert = False
-        alert_message = ""
-        alert_severity = "info"
-        
-        if analysis['alert_level'] == 'danger':
-            should_alert = True
-            alert_message = f"CRITICAL: {machine.name} requires immediate attention"
-            alert_severity = "danger"
-        elif analysis['alert_level'] == 'critical':
-            should_alert = True
-            alert_message = f"WARNING: {machine.name} showing signs of deterioration"
-            alert_severity = "critical"
-        elif analysis['alert_level'] == 'warning':
-            # Only alert for warning level if health score dropped significantly
-            if machine.health_score < 70:
-                should_alert = True
-                alert_message = f"NOTICE: {machine.name} health score declining"
-                alert_severity = "warning"
-        
-        # Check for specific sensor alerts
-        readings = machine.current_readings
-        if readings.get('temperature', 0) > 95:
-            should_alert = True
-            alert_message = f"HIGH TEMPERATURE: {machine.name} - {readings['temperature']}°C"
-            alert_severity = "critical"
-        elif readings.get('vibration', 0) > 1.2:
-            should_alert = True
-            alert_message = f"EXCESSIVE VIBRATION: {machine.name} - {readings['vibration']}"
-            alert_severity = "critical"
-        
-        # Create alert if needed and not recently alerted
-        if should_alert:
-            # Check for recent similar alerts (cooldown)
-            recent_alerts = [
-                a for a in self.alerts 
-                if a.machine_id == machine_id and 
-                a.timestamp > current_time - timedelta(seconds=Config.ALERT_COOLDOWN)
-            ]
+        match = None
+        if filters:
+            # Comma-separated values match any of them
+            allowed = [(field, set(value.split(','))) for field, value in filters.items()]
+            machines = self.machines
+            def match(machine_id):
+                machine = machines[machine_id]
+                return all(getattr(machine, field) in values for field, values in allowed)
+        
+        machine_ids, next_cursor = self.machine_index.page(sort, order, limit, cursor, match)
+        machines = [self.machines[mid] for mid in machine_ids]
+        
+        if fields:
+            selected = fields.split(',')
+            unknown = set(selected) - set(MachineData.__slots__)
+            if unknown:
+                raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+            items = [json.dumps({f: m.to_dict()[f] for f in selected}, separators=(',', ':')) for m in machines]
+        else:
+            items = [m.to_json() for m in machines]
+        
+        return (
+            f'{{"machines":[{",".join(items)}],'
+            f'"next_cursor":{json.dumps(next_cursor)},'
+            f'"count":{len(items)},'
+            f'"total_machines":{len(self.machines)}}}'
+        )
+    
+    def _filter_alerts(self, limit=50, severity=None):
+        """Most recent alerts first, optionally filtered by severity"""
+        filtered_alerts = self.alerts
+        if severity:
+            filtered_alerts = [a for a in filtered_alerts if a.severity == severity]
+        
+        # Most recently seen first, so ongoing incidents stay on top
+        return sorted(filtered_alerts, key=lambda x: x.last_seen, reverse=True)[:limit]
+    
+    def _build_alerts_json(self, limit=50, severity=None):
+        """Build the /api/alerts response body from cached per-alert JSON fragments"""
+        filtered_alerts = self._filter_alerts(limit, severity)
+        alerts_json = ','.join(alert.to_json() for alert in filtered_alerts)
+        return f'{{"alerts":[{alerts_json}],"total_count":{len(filtered_alerts)}}}'
+    
+    def _build_prediction_payload(self, sensor_data):
+        """Run a health analysis for ad-hoc sensor data (CPU bound)"""
+        analysis = self._live_model().analyze_machine_health(sensor_data)
+        
+        return {
+            'prediction': analysis,
+            'timestamp': datetime.now().isoformat()
+        }
+    
+    def _build_health_payload(self):
+        """Build the /api/health response body"""
+        memory = self.retention.status()
+        model = self.ml_model
+        if model is None:
+            status = 'failed' if self.model_error else 'starting'
+        else:
+            status = 'degraded' if memory['over_ceiling'] else 'healthy'
+        return {
+            'status': status,
+            'timestamp': datetime.now().isoformat(),
+            'version': '1.0.0',
+            'components': {
+                'data_simulator': 'running',
+                'ml_model': 'loaded' if model is not None else ('failed' if self.model_error else 'loading'),
+                'model_version': model.version if model is not None else None,
+                'shadow_model_version': self.shadow_scorer.version if self.shadow_scorer is not None else None,
+                'machines': len(self.machines),
+                'alerts': len(self.alerts),
+                'archived_alerts': len(self.alert_history),
+                'maintenance_logs': len(self.maintenance_logs),
+                'maintenance_log_recovery_seconds': round(self.maintenance_logs.recovery_seconds, 4),
+                'state_restore_seconds': round(self.state_store.restore_seconds, 4) if self.state_store else None,
+                'last_snapshot_seconds': round(self.state_store.last_snapshot_seconds, 4) if self.state_store else None,
+                'reading_log': self.reading_recorder.status() if self.reading_recorder else None
+            },
+            'memory': memory
+        }
+    
+    @staticmethod
+    def _format_stream_event(payload_json):
+        """Encode a JSON document as a single server-sent event"""
+        return f"data: {payload_json}\n\n"
+    
+    def _update_machine_data(self, machine_ids=None):
+        """Update machine data (all machines, or only machine_ids) with current readings and predictions"""
+        tick_start = time.perf_counter()
+        current_readings = self.data_simulator.get_all_current_readings(machine_ids)
+        machine_ids = [mid for mid in current_readings if mid in self.machines]
+        readings = [current_readings[mid] for mid in machine_ids]
+        now = time.time()
+        if self.reading_recorder is not None:
+            self.reading_recorder.record(machine_ids, readings, now)
+        self.historical_data.append_batch(machine_ids, readings, now)
+        simulated = time.perf_counter()
+        
+        # One model for the whole tick, even if a promotion lands mid-tick
+        model = self.ml_model
+        shadow = self.shadow_scorer
+        shadow_batch = shadow.submit(readings) if shadow is not None and readings else None
+        
+        features_seconds = inference_seconds = analysis_seconds = 0.0
+        analyses = [None] * len(readings)
+        for key, indices in self._scoring_batches(model, machine_ids).items():
+            batch = [readings[i] for i in indices]
+            if key == ('forest', None) and self.fleet_processor is not None and len(batch) >= Config.FLEET_SHARDING_THRESHOLD:
+                # Features, inference and analysis run per shard in the worker pool
+                start = time.perf_counter()
+                batch_analyses = self.fleet_processor.analyze(batch)
+                inference_seconds += time.perf_counter() - start
+            else:
+                # Score each tier's or partition's machines in one batch
+                start = time.perf_counter()
+                batch_model = self._batch_model(model, key)
+                X_scaled = batch_model.prepare_batch(batch)
+                featurized = time.perf_counter()
+                failure_probs = batch_model.predict_batch(X_scaled)
+                inferred = time.perf_counter()
+                batch_analyses = batch_model.analyze_batch(batch, failure_probs)
+                features_seconds += featurized - start
+                inference_seconds += inferred - featurized
+                analysis_seconds += time.perf_counter() - inferred
+            for i, analysis in zip(indices, batch_analyses):
+                analyses[i] = analysis
+        scored = time.perf_counter()
+        
+        if shadow_batch is not None:
+            shadow.compare(shadow_batch, analyses, scored - simulated)
+        
+        updated_machines = []
+        for machine_id, reading_data, analysis in zip(machine_ids, readings, analyses):
+            machine = self.machines[machine_id]
             
-            if not recent_alerts:
-                alert = Alert(
-                    machine_id=machine_id,
-                    alert_type='health_degradation',
-                    severity=alert_severity,
-                    message=alert_message,
-                    details={
-                        'health_score': machine.health_score,
-                        'failure_probability': machine.failure_probability,
-                        'sensor_readings': readings,
-                        'potential_issues': analysis['potential_issues'],
-                        'recommendation': analysis['recommendation']
-                    }
-                )
-                
-                self.alerts.append(alert)
-                
-                # Keep only recent alerts (memory management)
-                if len(self.alerts) > Config.MAX_ALERTS:
-                    self.alerts = self.alerts[-Config.MAX_ALERTS:]
-                
-                print(f"Generated alert: {alert_message}")
+            # Update sensor readings
+            machine.current_readings = {
+                'temperature': round(reading_data['temperature'], 1),
+                'vibration': round(reading_data['vibration'], 2),
+                'rotation_speed': round(reading_data['rotation_speed'], 0),
+                'load': round(reading_data['load'], 1),
+                'timestamp': reading_data['timestamp'].isoformat()
+            }
+            
+            # Update machine health data
+            machine.health_score = analysis['health_score']
+            machine.failure_probability = analysis['failure_probability']
+            machine.alert_level = analysis['alert_level']
+            machine.potential_issues = analysis['potential_issues']
+            machine.recommendation = analysis['recommendation']
+            machine.last_updated = datetime.now()
+            self.fleet_stats.update_machine(machine)
+            self.machine_index.update(machine)
+            updated_machines.append(machine)
+        
+        # Generate alerts if needed
+        self._check_and_generate_alerts(updated_machines, analyses)
+        alerted = time.perf_counter()
+        
+        self._persist_tick(updated_machines)
+        persisted = time.perf_counter()
+        
+        self.last_tick_stages = {
+            'simulate': simulated - tick_start,
+            'features': features_seconds,
+            'inference': inference_seconds,
+            'alerting': alerted - scored + analysis_seconds,
+            'persist': persisted - alerted
+        }
+        for stage, seconds in self.last_tick_stages.items():
+            self.tick_stage_duration.observe(seconds, stage=stage)
+        self.tick_duration.observe(persisted - tick_start)
+        self.inference_batch_size.observe(len(readings))
     
-    def _calculate_system_health(self):
-        """Calculate overall system health percentage"""
-        if not self.machines:
-            return 100
+    def _scoring_batches(self, model, machine_ids):
+        """Batch indices per scoring model
+        
+        Keys are ('tier', tier) for machines served by a distilled student,
+        ('partition', type) for forest machines whose type has its own
+        model, and ('forest', None) for the pooled forest.
+        """
+        batches = {}
+        partitions = model.partitions
+        for i, machine_id in enumerate(machine_ids):
+            tier = self.machine_tiers.get(machine_id, 'forest')
+            machine_type = self.machines[machine_id].type
+            if tier in model.tiers:
+                key = ('tier', tier)
+            elif partitions is not None and machine_type in partitions.available:
+                key = ('partition', machine_type)
+            else:
+                key = ('forest', None)
+            batches.setdefault(key, []).append(i)
+        return batches
+    
+    @staticmethod
+    def _batch_model(model, key):
+        kind, name = key
+        if kind == 'tier':
+            return model.tiers[name]
+        if kind == 'partition':
+            return model.partitions.get(name)
+        return model
+    
+    def _check_and_generate_alerts(self, machines, analyses):
+        """Evaluate the alert rules over the updated machines and open, update or resolve alerts"""
+        if not machines:
+            return
+        self.alert_rules.reload_if_changed()
+        
+        values = {
+            'health_score': np.array([m.health_score for m in machines], dtype=float),
+            'failure_probability': np.array([m.failure_probability for m in machines], dtype=float)
+        }
+        for field in ('temperature', 'vibration', 'rotation_speed', 'load'):
+            values[field] = np.array([m.current_readings[field] for m in machines], dtype=float)
+        
+        machine_ids = [m.machine_id for m in machines]
+        winners = self.alert_rules.evaluate(machine_ids, [m.type for m in machines], values, time.time())
+        
+        now = time.time()
+        observed = set()
+        for index, rule, entered in winners:
+            machine = machines[index]
+            observed.add((machine.machine_id, rule.group))
+            alert, created, changed = self.alert_tracker.observe(machine, rule, entered, analyses[index], now)
+            if created:
+                self._store_alert(alert)
+                print(f"Generated alert: {alert.message}")
+            elif changed:
+                self._persist_alert_update(alert)
+        
+        for alert in self.alert_tracker.sweep(machine_ids, observed, self.alert_rules.active_groups, now):
+            self._persist_alert_update(alert)
+            print(f"Resolved alert: {alert.message}")
+    
+    def _persist_alert_update(self, alert):
+        """Record an in-place alert change (occurrence, severity, resolution)"""
+        self.fleet_stats.track_alert(alert)
+        if self.state_store is not None:
+            self.state_store.log('alert_update', object_state(alert))
+    
+    def _store_alert(self, alert, persist=True):
+        """Add an alert to the live list, archiving beyond MAX_ALERTS"""
+        self.alerts.append(alert)
+        self.fleet_stats.track_alert(alert)
+        if persist and self.state_store is not None:
+            self.state_store.log('alert', object_state(alert))
         
-        total_health = sum(machine.health_score for machine in self.machines.values())
-        average_health = total_health / len(self.machines)
-        return round(average_health, 1)
+        # Keep only recent alerts live, archive the rest in columnar form.
+        # Resolved alerts go first so open incidents stay live and updatable
+        excess = len(self.alerts) - Config.MAX_ALERTS
+        if excess > 0:
+            evicted = [a for a in self.alerts if a.resolved][:excess]
+            if len(evicted) < excess:
+                evicted += [a for a in self.alerts if not a.resolved][:excess - len(evicted)]
+            self._archive_alerts(evicted)
+    
+    def _archive_alerts(self, evicted):
+        """Move alerts from the live list into the columnar archive"""
+        evicted_ids = {id(a) for a in evicted}
+        for alert in evicted:
+            self.alert_history.append(alert)
+            self.alert_tracker.forget(alert)
+            self.fleet_stats.untrack_alert(alert)
+        self.alerts = [a for a in self.alerts if id(a) not in evicted_ids]
+    
+    def _archive_resolved_alerts(self, before):
+        """Archive resolved alerts last seen before a timestamp; returns how many moved"""
+        evicted = [a for a in self.alerts if a.resolved and a.last_seen.timestamp() < before]
+        if evicted:
+            self._archive_alerts(evicted)
+        return len(evicted)
+    
+    def _calculate_system_health(self):
+        """Overall system health percentage (maintained incrementally)"""
+        return self.fleet_stats.average_health()
     
     def _get_historical_readings(self, machine_id, hours=24):
-        """Get simulated historical readings for a machine"""
-        # Generate some historical data for demonstration
-        historical = []
+        """Hourly mean readings of a machine over the last `hours`, from the retained history"""
+        historical = self.retention.series(machine_id, time.time() - hours * 3600, 3600)
+        if historical:
+            return historical
+        
+        # Nothing recorded yet (fresh start): simulate some for demonstration
         now = datetime.now()
         
         for i in range(hours):
@@ -377,35 +1154,89 @@ class AuraAPI:
     
     def _start_background_tasks(self):
         """Start background data simulation and processing"""
-        def background_worker():
-            print("Starting background data simulation...")
-            while True:
-                try:
-                    # Update machine data every few seconds
-                    self._update_machine_data()
-                    time.sleep(Config.SIMULATION_INTERVAL)
-                except Exception as e:
-                    print(f"Error in background worker: {e}")
-                    time.sleep(5)
-        
-        # Start background thread
-        thread = threading.Thread(target=background_worker, daemon=True)
-        thread.start()
+        print("Starting background data simulation...")
+        
+        # Every machine is due on the first tick, then on its alert level's cadence
+        self.machine_cadence = MachineCadence(Config.MACHINE_UPDATE_CADENCE, Config.SIMULATION_INTERVAL)
+        now = time.monotonic()
+        for machine_id in self.machines:
+            self.machine_cadence.add(machine_id, now)
+        
+        # Retention runs on this worker too, between ticks, so it never races alert updates
+        self._retention_due = now + Config.RETENTION_INTERVAL
+        
+        def scheduled_tick(deadline):
+            if deadline >= self._retention_due:
+                self._retention_due = deadline + Config.RETENTION_INTERVAL
+                self.retention.run()
+            machine_ids = self.machine_cadence.due(deadline)
+            if not machine_ids:
+                return
+            try:
+                self._update_machine_data(machine_ids)
+            finally:
+                for machine_id in machine_ids:
+                    self.machine_cadence.reschedule(machine_id, self.machines[machine_id].alert_level, deadline)
+        
+        def on_overrun(skipped):
+            self.worker_overruns.inc()
+            self.worker_skipped_ticks.inc(skipped)
+        
+        def on_error(e):
+            self.worker_errors.inc()
+            print(f"Error in background worker: {e}")
+        
+        self.scheduler = FixedRateScheduler(
+            scheduled_tick,
+            Config.SCHEDULER_TICK_INTERVAL,
+            policy=Config.SCHEDULER_OVERRUN_POLICY,
+            max_catch_up=Config.SCHEDULER_MAX_CATCH_UP,
+            error_backoff_max=Config.SCHEDULER_ERROR_BACKOFF_MAX,
+            on_lag=self.worker_lag.set,
+            on_overrun=on_overrun,
+            on_error=on_error
+        )
+        self.scheduler.start()
         print("Background simulation started")
+        
+        if Config.RETRAIN_INTERVAL > 0:
+            self.retrain_scheduler = FixedRateScheduler(
+                lambda deadline: self.retraining.maybe_start(self.ml_model.version),
+                Config.RETRAIN_INTERVAL,
+                on_error=lambda e: print(f"Error starting retraining: {e}")
+            )
+            self.retrain_scheduler.start()
     
-    def run(self, host='0.0.0.0', port=5000, debug=True):
-        """Run the Flask application"""
-        print(f"\n🚀 Starting Aura API Server...")
+    def run(self, host='0.0.0.0', port=5000, debug=True, async_mode=None):
+        """Run the API with the Flask dev server or, in async mode, as an ASGI app"""
+        if async_mode is None:
+            async_mode = Config.ASYNC_MODE
+        
+        print(f"\n🚀 Starting Aura API Server{' (async mode)' if async_mode else ''}...")
         print(f"📊 Dashboard: http://localhost:{port}")
         print(f"🔧 API Health: http://localhost:{port}/api/health")
         print(f"📈 Machine Status: http://localhost:{port}/api/status")
         print("="*50)
         
-        self.app.run(host=host, port=port, debug=debug, threaded=True)
+        if async_mode:
+            self.run_async(host=host, port=port)
+        else:
+            self.app.run(host=host, port=port, debug=debug, threaded=True)
+    
+    def run_async(self, host='0.0.0.0', port=5000):
+        """Serve the API from an event loop via uvicorn"""
+        try:
+            import uvicorn
+        except ImportError:
+            raise RuntimeError("Async mode requires uvicorn: pip install uvicorn")
+        
+        from asgi_app import AuraASGIApp
+        
+        uvicorn.run(AuraASGIApp(self), host=host, port=port, log_level='warning')
 
-def create_app():
-    """Application factory"""
-    return AuraAPI()
+def create_app(**options):
+    """Application factory; options are passed to AuraAPI"""
+    return AuraAPI(**options)
 
 if __name__ == '__main__':
     # Create and run the application
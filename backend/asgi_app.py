@@ -0,0 +1,301 @@
+import asyncio
+import io
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+from config import Config
+from encoding import UnsupportedFormat, compress, negotiate_encoding, negotiate_format, should_compress
+
+class AuraASGIApp:
+    """ASGI front-end for AuraAPI.
+
+    Status, alerts, health and streaming endpoints are served directly from
+    the event loop; CPU-bound work (ad-hoc predictions) is dispatched to a
+    thread pool. Every other route registered in
+    AuraAPI._setup_routes is forwarded to the Flask app so both serving
+    modes expose exactly the same API.
+    """
+
+    def __init__(self, api, max_workers=None):
+        self.api = api
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or Config.ASYNC_INFERENCE_WORKERS,
+            thread_name_prefix='aura-worker'
+        )
+        self.routes = {
+            ('GET', '/api/status'): self.get_status,
+            ('GET', '/api/alerts'): self.get_alerts,
+            ('GET', '/api/health'): self.health_check,
+            ('GET', '/api/stream'): self.stream_status,
+            ('POST', '/api/predict'): self.predict_failure,
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._handle_lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        handler = self.routes.get((scope['method'], scope['path']))
+        if handler is None:
+            await self._forward_to_flask(scope, receive, send)
+            return
+
+        send = self._with_cors(scope, send)
+        start = time.perf_counter()
+        response_status = [500]
+
+        async def send_and_record_status(message):
+            if message['type'] == 'http.response.start':
+                response_status[0] = message['status']
+            await send(message)
+
+        try:
+            await handler(scope, receive, send_and_record_status)
+        except Exception as e:
+            await self._send_json(send_and_record_status, {'error': str(e)}, status=500)
+        finally:
+            self.api.request_latency.observe(
+                time.perf_counter() - start,
+                endpoint=scope['path'], method=scope['method'], status=response_status[0]
+            )
+
+    @staticmethod
+    def _with_cors(scope, send):
+        """Wrap send so native responses carry the same CORS headers as Flask-CORS adds"""
+        origin = dict(scope.get('headers', [])).get(b'origin', b'').decode('latin-1')
+        if origin not in Config.CORS_ORIGINS:
+            return send
+
+        async def send_with_cors(message):
+            if message['type'] == 'http.response.start':
+                message['headers'] = list(message.get('headers', [])) + [
+                    (b'access-control-allow-origin', origin.encode('latin-1')),
+                    (b'vary', b'Origin'),
+                ]
+            await send(message)
+
+        return send_with_cors
+
+    async def _handle_lifespan(self, receive, send):
+        """Handle server startup/shutdown events"""
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _run_in_pool(self, func, *args):
+        """Run a blocking function on the worker pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    # Native async handlers
+
+    async def get_status(self, scope, receive, send):
+        """Get current status of all machines"""
+        # Fleet inference runs on the background worker; this only assembles
+        # the response from cached per-machine JSON fragments
+        headers = self._headers(scope)
+        try:
+            fmt = negotiate_format(self._query_args(scope).get('format'), headers.get('accept'))
+        except UnsupportedFormat as e:
+            await self._send_json(send, {'error': str(e)}, status=406)
+            return
+        body, mimetype = self.api._build_status_payload(fmt)
+        await self._send_body(scope, send, body, mimetype)
+
+    async def get_alerts(self, scope, receive, send):
+        """Get recent alerts"""
+        args = self._query_args(scope)
+        try:
+            limit = int(args.get('limit', 50))
+        except ValueError:
+            limit = 50
+        severity = args.get('severity') or None
+
+        await self._send_body(scope, send, self.api._build_alerts_json(limit, severity), 'application/json')
+
+    async def health_check(self, scope, receive, send):
+        """API health check"""
+        await self._send_json(send, self.api._build_health_payload())
+
+    async def predict_failure(self, scope, receive, send):
+        """Predict failure for given sensor data"""
+        body = await self._read_body(receive)
+        try:
+            data = json.loads(body) if body else None
+        except ValueError:
+            data = None
+
+        if not data or 'sensor_data' not in data:
+            await self._send_json(send, {'error': 'Invalid request data'}, status=400)
+            return
+
+        if self.api.ml_model is None:
+            await self._send_json(send, {'error': self.api.model_error or 'The ML model is still loading'}, status=503)
+            return
+        payload = await self._run_in_pool(self.api._build_prediction_payload, data['sensor_data'])
+        await self._send_json(send, payload)
+
+    async def stream_status(self, scope, receive, send):
+        """Push machine status as server-sent events until the client disconnects"""
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'text/event-stream'),
+                (b'cache-control', b'no-cache'),
+            ]
+        })
+
+        disconnected = asyncio.Event()
+
+        async def watch_disconnect():
+            while True:
+                message = await receive()
+                if message['type'] == 'http.disconnect':
+                    disconnected.set()
+                    return
+
+        watcher = asyncio.ensure_future(watch_disconnect())
+        try:
+            while not disconnected.is_set():
+                event = self.api._format_stream_event(self.api._build_status_json())
+                await send({'type': 'http.response.body', 'body': event.encode('utf-8'), 'more_body': True})
+                try:
+                    await asyncio.wait_for(disconnected.wait(), timeout=Config.STREAM_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            watcher.cancel()
+
+    # Flask fallback
+
+    async def _forward_to_flask(self, scope, receive, send):
+        """Serve a request through the wrapped Flask (WSGI) app on the worker pool"""
+        body = await self._read_body(receive)
+        status, headers, chunks = await self._run_in_pool(self._call_wsgi, scope, body)
+
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': b''.join(chunks)})
+
+    def _call_wsgi(self, scope, body):
+        """Invoke the Flask app with a WSGI environ built from the ASGI scope"""
+        environ = self._build_environ(scope, body)
+        response_start = {}
+
+        def start_response(status, response_headers, exc_info=None):
+            response_start['status'] = int(status.split(' ', 1)[0])
+            response_start['headers'] = [
+                (name.lower().encode('latin-1'), value.encode('latin-1'))
+                for name, value in response_headers
+            ]
+
+        result = self.api.app(environ, start_response)
+        try:
+            chunks = list(result)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+
+        return response_start['status'], response_start['headers'], chunks
+
+    @staticmethod
+    def _build_environ(scope, body):
+        """Translate an ASGI HTTP scope into a WSGI environ"""
+        server = scope.get('server') or ('localhost', 80)
+        client = scope.get('client') or ('', 0)
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': scope.get('root_path', ''),
+            'PATH_INFO': scope['path'],
+            'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+            'SERVER_NAME': server[0],
+            'SERVER_PORT': str(server[1]),
+            'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+            'REMOTE_ADDR': client[0],
+            'REMOTE_PORT': str(client[1]),
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+
+        for name, value in scope.get('headers', []):
+            name = name.decode('latin-1').upper().replace('-', '_')
+            value = value.decode('latin-1')
+            if name == 'CONTENT_TYPE':
+                environ['CONTENT_TYPE'] = value
+            elif name != 'CONTENT_LENGTH':
+                key = f'HTTP_{name}'
+                environ[key] = f"{environ[key]},{value}" if key in environ else value
+
+        return environ
+
+    # Helpers
+
+    @staticmethod
+    def _query_args(scope):
+        """Parse the query string into a dict of first values"""
+        parsed = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+        return {key: values[0] for key, values in parsed.items()}
+
+    @staticmethod
+    async def _read_body(receive):
+        """Read the full request body"""
+        body = b''
+        while True:
+            message = await receive()
+            if message['type'] != 'http.request':
+                break
+            body += message.get('body', b'')
+            if not message.get('more_body', False):
+                break
+        return body
+
+    @staticmethod
+    def _headers(scope):
+        """Request headers as a dict of lower-case names to str values"""
+        return {name.decode('latin-1'): value.decode('latin-1') for name, value in scope.get('headers', [])}
+
+    async def _send_body(self, scope, send, body, mimetype, status=200):
+        """Send a complete response, gzip/brotli-encoded when large and accepted"""
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        headers = [(b'content-type', mimetype.encode('latin-1')), (b'vary', b'Accept-Encoding')]
+        if status == 200 and should_compress(body, mimetype):
+            coding = negotiate_encoding(self._headers(scope).get('accept-encoding'))
+            if coding is not None:
+                body = compress(body, coding)
+                headers.append((b'content-encoding', coding.encode('latin-1')))
+        headers.append((b'content-length', str(len(body)).encode('latin-1')))
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': body})
+
+    @staticmethod
+    async def _send_json(send, payload, status=200):
+        """Send a complete JSON response; payload may be an already-encoded JSON string"""
+        if not isinstance(payload, str):
+            payload = json.dumps(payload)
+        body = payload.encode('utf-8')
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(body)).encode('latin-1')),
+            ]
+        })
+        await send({'type': 'http.response.body', 'body': body})
@@ -2,6 +2,11 @@ import os
 from datetime import datetime, timedelta
 
 class Config:
+    # Paths
+    BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    STORAGE_DIR = os.environ.get('AURA_STORAGE_DIR') or os.path.join(BASE_DIR, 'storage')
+    FRONTEND_DIR = os.path.join(BASE_DIR, 'frontend')
+    
     # Flask settings
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'aura-industrial-maintenance-2024'
     DEBUG = True
@@ -9,8 +14,59 @@ class Config:
     # Data simulation settings
     SIMULATION_INTERVAL = 3  # seconds between data updates
     
+    # Background scheduler (fixed-rate ticks; machines are updated on their own cadence)
+    SCHEDULER_TICK_INTERVAL = 1.0  # seconds between scheduler ticks
+    SCHEDULER_OVERRUN_POLICY = 'skip'  # 'skip' missed ticks or 'catch_up' up to SCHEDULER_MAX_CATCH_UP
+    SCHEDULER_MAX_CATCH_UP = 3
+    SCHEDULER_ERROR_BACKOFF_MAX = 30  # seconds; failing ticks back off exponentially up to this
+    MACHINE_UPDATE_CADENCE = {  # seconds between updates per alert level
+        'danger': 1,
+        'critical': 1,
+        'warning': SIMULATION_INTERVAL,
+        'healthy': SIMULATION_INTERVAL * 2
+    }
+    
+    # Sharded fleet scoring (features + inference + analysis in worker processes)
+    FLEET_WORKERS = int(os.environ.get('AURA_FLEET_WORKERS', '0'))  # 0 or 1 scores in-process
+    FLEET_SHARDING_THRESHOLD = 1000  # smaller batches are scored in-process (IPC costs more)
+    FLEET_MIN_SHARD_SIZE = 250
+    FLEET_START_METHOD = 'forkserver'  # workers never inherit the API's threads and locks
+    
     # ML Model settings
     MODEL_UPDATE_INTERVAL = 60  # seconds between model predictions
+    MODEL_REGISTRY_DIR = os.path.join(STORAGE_DIR, 'models')  # versioned artifacts + active/shadow pointer
+    MODEL_TRAIN_IF_MISSING = os.environ.get('AURA_TRAIN_IF_MISSING', '1') == '1'  # else startup fails without a model
+    
+    # Model tiers: each machine is scored by the forest or a distilled student, by criticality
+    # (set 'criticality' per machine in MACHINES; students are distilled once per model version)
+    MODEL_TIER_BY_CRITICALITY = {'high': 'forest', 'medium': 'gbm', 'low': 'lookup'}
+    DEFAULT_CRITICALITY = 'high'
+    DISTILL_MIN_SAMPLES = 5000  # captured readings needed to distill from live data, else simulated history
+    DISTILL_GBM_TREES = 40
+    DISTILL_GBM_DEPTH = 3
+    DISTILL_LOOKUP_BINS = 12  # per sensor; the table has bins**4 uint8 cells
+    
+    # Per-machine-type model partitions (smaller forests trained on one MachineData.type each)
+    MODEL_PARTITIONS = os.environ.get('AURA_MODEL_PARTITIONS', '0') == '1'
+    MODEL_PARTITION_MEMORY_BUDGET_MB = 64  # loaded partitions beyond this are evicted, least recently used first
+    MODEL_PARTITION_MIN_ROWS = 500  # types with less training data keep using the pooled forest
+    MODEL_PARTITION_TREES = 50
+    MODEL_PARTITION_MAX_DEPTH = 8
+    
+    # Incremental retraining (new forest trees fitted on labeled live readings in a low-priority process)
+    READING_HISTORY_MAX_ROWS = 500_000  # scored readings kept for retraining; the oldest are dropped beyond this
+    RETRAIN_INTERVAL = int(os.environ.get('AURA_RETRAIN_INTERVAL', '3600'))  # seconds; 0 retrains only on request
+    RETRAIN_MIN_READINGS = 1000
+    RETRAIN_MIN_OUTCOMES = 3  # repair/replacement logs (failure labels) needed in the reading window
+    RETRAIN_LABEL_HORIZON = 6 * 3600  # a reading followed by a repair within this many seconds is a failure
+    RETRAIN_NEW_TREES = 25  # trees fitted on the live window per retrain
+    RETRAIN_MAX_TREES = 200  # oldest trees are dropped beyond this
+    RETRAIN_HOLDOUT = 0.2  # share of labeled readings kept out of fitting for the evaluation report
+    RETRAIN_PUBLISH = 'shadow'  # new versions go to 'shadow' scoring, are 'promote'd, or only published ('none')
+    RETRAIN_NICE = 19
+    RETRAIN_MEMORY_LIMIT_MB = 2048  # address-space limit of the retraining process
+    RETRAIN_CPUS = 1  # cores the retraining process may run on
+    RETRAIN_START_METHOD = 'forkserver'
     HEALTH_SCORE_THRESHOLD = {
         'healthy': 80,
         'warning': 60,
@@ -52,8 +108,50 @@ class Config:
     }
     
     # Alert settings
-    ALERT_COOLDOWN = 300  # 5 minutes between similar alerts
+    ALERT_COOLDOWN = 300  # 5 minutes: a resolved alert whose condition returns within this is reopened
+    ALERT_RESOLVE_AFTER = 60  # seconds an issue must stay clear before its alert auto-resolves
+    ALERT_REFRESH_INTERVAL = 30  # seconds between last_seen/details refreshes of an unchanged open alert
     MAX_ALERTS = 100  # Maximum stored alerts
+    ALERT_RULES_PATH = os.environ.get('AURA_ALERT_RULES') or os.path.join(BASE_DIR, 'backend', 'alert_rules.json')
+    
+    # Maintenance log storage
+    MAINTENANCE_DB_PATH = os.path.join(STORAGE_DIR, 'maintenance.db')
+    MAINTENANCE_LOG_BATCH_SIZE = 64  # records per commit (one fsync per batch)
+    MAINTENANCE_LOG_FLUSH_INTERVAL = 1.0  # max seconds a record waits before commit
+    MAINTENANCE_WAL_CHECKPOINT_PAGES = 256  # bounds WAL size and crash recovery time
+    MAINTENANCE_RECOVERY_BUDGET = 1.0  # seconds; slower startup recovery is reported
+    
+    # Machine/alert state persistence (snapshot + write-ahead log)
+    STATE_PERSISTENCE = os.environ.get('AURA_STATE_PERSISTENCE', '1') == '1'
+    STATE_DIR = os.path.join(STORAGE_DIR, 'state')
+    STATE_SNAPSHOT_INTERVAL = 60  # seconds between full snapshots
+    
+    # Retention of in-process history (compacted on the background worker)
+    RETENTION_INTERVAL = 60  # seconds between retention passes
+    READING_RAW_RETENTION = 12 * 3600  # raw readings then roll into the first tier; keep above RETRAIN_LABEL_HORIZON
+    READING_TIERS = ((60, 7 * 24 * 3600), (3600, 180 * 24 * 3600))  # (bucket seconds, seconds kept) per tier
+    READING_HISTORY_MAX_BYTES = 128 * 1024 * 1024  # raw readings plus tiers
+    ALERT_ARCHIVE_MAX_AGE = 90 * 24 * 3600
+    ALERT_ARCHIVE_MAX_ROWS = 500_000
+    RESOLVED_ALERT_LIVE_SECONDS = 24 * 3600  # resolved alerts move to the archive after this
+    MAINTENANCE_LOG_MAX_AGE = 5 * 365 * 24 * 3600
+    MAINTENANCE_LOG_MAX_ROWS = 1_000_000
+    MEMORY_CEILING_MB = int(os.environ.get('AURA_MEMORY_CEILING_MB', '1024'))  # above it older history is dropped; 0 disables
+    MEMORY_PRESSURE_MIN_SHARE = 0.1  # history must be at least this share of the excess over the ceiling to be trimmed
+    
+    # Recording of the raw reading stream fed to each tick (replayed with benchmarks/replay.py)
+    READING_LOG_PATH = os.environ.get('AURA_RECORD_READINGS') or None  # binary log path; unset disables recording
+    READING_LOG_MAX_BYTES = int(os.environ.get('AURA_RECORD_MAX_MB', '1024')) * 1024 * 1024  # recording stops beyond this
     
     # API settings
-    CORS_ORIGINS = ['http://localhost:5000', 'http://127.0.0.1:5000']
\ No newline at end of file
+    CORS_ORIGINS = ['http://localhost:5000', 'http://127.0.0.1:5000']
+    
+    # Response compression (brotli needs the optional brotli package, else gzip is used)
+    COMPRESSION_MIN_BYTES = 1024  # smaller responses are sent uncompressed
+    GZIP_LEVEL = 6
+    BROTLI_QUALITY = 5  # 11 compresses best but costs far more CPU per response
+    
+    # Async serving settings
+    ASYNC_MODE = os.environ.get('AURA_ASYNC_MODE', '0') == '1'  # serve via ASGI instead of the Flask dev server
+    ASYNC_INFERENCE_WORKERS = 4  # thread pool size for CPU-bound work in async mode
+    STREAM_INTERVAL = SIMULATION_INTERVAL  # seconds between /api/stream events
@@ -0,0 +1,92 @@
+import gzip
+import json
+
+from config import Config
+
+# Optional codecs: brotli falls back to gzip, msgpack requests are refused
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPE = 'application/msgpack'
+COMPRESSIBLE_MIMETYPES = (JSON_MIMETYPE, MSGPACK_MIMETYPE, 'text/plain', 'text/html', 'text/css', 'application/javascript')
+
+FORMATS = ('json', 'columnar', 'msgpack')
+
+class UnsupportedFormat(ValueError):
+    pass
+
+def _accepted_codings(accept_encoding):
+    """{coding: q} for every coding listed in an Accept-Encoding header, q = 0 included"""
+    accepted = {}
+    for part in (accept_encoding or '').split(','):
+        coding, *params = part.split(';')
+        coding = coding.strip().lower()
+        q = 1.0
+        for param in params:
+            name, _, value = param.strip().partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding:
+            accepted[coding] = q
+    return accepted
+
+def negotiate_encoding(accept_encoding):
+    """'br', 'gzip' or None for an Accept-Encoding header
+
+    A coding's own q wins over the `*` wildcard, so `br;q=0, *` refuses
+    br (RFC 9110 12.5.3). Among acceptable codings the highest q wins,
+    then br over gzip.
+    """
+    accepted = _accepted_codings(accept_encoding)
+    wildcard = accepted.get('*', 0.0)
+    available = ('br', 'gzip') if brotli is not None else ('gzip',)
+    best, best_q = None, 0.0
+    for coding in available:
+        q = accepted.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+def compress(body, coding):
+    if coding == 'br':
+        return brotli.compress(body, quality=Config.BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=Config.GZIP_LEVEL)
+
+def should_compress(body, mimetype):
+    return len(body) >= Config.COMPRESSION_MIN_BYTES and mimetype in COMPRESSIBLE_MIMETYPES
+
+def negotiate_format(format_arg, accept):
+    """Response format from ?format= or the Accept header"""
+    fmt = format_arg or ('msgpack' if accept and MSGPACK_MIMETYPE in accept else 'json')
+    if fmt not in FORMATS:
+        raise UnsupportedFormat(f"Unknown format {fmt}; expected one of {', '.join(FORMATS)}")
+    if fmt == 'msgpack' and msgpack is None:
+        raise UnsupportedFormat("MessagePack responses need the msgpack package")
+    return fmt
+
+def columnar(records):
+    """A list of dicts as {key: [values...]}, keys taken from the first record"""
+    if not records:
+        return {}
+    return {key: [record.get(key) for record in records] for key in records[0]}
+
+def encode_payload(payload, fmt, columnar_keys=()):
+    """(body, mimetype) for a payload; compact formats turn columnar_keys lists into columns"""
+    if fmt != 'json':
+        payload = dict(payload)
+        for key in columnar_keys:
+            payload[key] = columnar(payload[key])
+    if fmt == 'msgpack':
+        return msgpack.packb(payload, default=str), MSGPACK_MIMETYPE
+    return json.dumps(payload, separators=(',', ':')), JSON_MIMETYPE
@@ -0,0 +1,90 @@
+import atexit
+import math
+import multiprocessing
+
+import numpy as np
+
+from train_model import AuraMachineHealthModel
+
+# Model replica owned by each worker process, loaded once by _init_worker
+_worker_model = None
+
+def _init_worker(model_path, scaler_path):
+    """Load the model replica for this worker
+
+    Arrays are memory-mapped read-only, so every worker shares the same
+    page-cache pages instead of holding a private copy of the forest.
+    """
+    import joblib
+    
+    global _worker_model
+    model = AuraMachineHealthModel()
+    model.model = joblib.load(model_path, mmap_mode='r')
+    model.scaler = joblib.load(scaler_path, mmap_mode='r')
+    _worker_model = model
+
+def _analyze_shard(values):
+    """Features, inference and health analysis for one shard of sensor values"""
+    model = _worker_model
+    readings = [dict(zip(model.feature_columns, row)) for row in values.tolist()]
+    failure_probs = model.predict_batch(model.prepare_batch(readings))
+    # NumPy scalars pickle an order of magnitude slower than plain floats
+    return [
+        {key: value.item() if isinstance(value, np.generic) else value for key, value in analysis.items()}
+        for analysis in model.analyze_batch(readings, failure_probs)
+    ]
+
+class ShardedFleetProcessor:
+    """Scores the fleet in contiguous shards across a pool of worker processes
+
+    Simulation and alerting stay in the API process; only the CPU-bound
+    part of a tick (feature preparation, inference, health analysis) is
+    sharded, and results come back in fleet order.
+    """
+
+    def __init__(self, model_path, scaler_path, workers, min_shard_size=250, start_method=None):
+        self.workers = workers
+        self.min_shard_size = min_shard_size
+        self._columns = AuraMachineHealthModel().feature_columns
+        self._context = multiprocessing.get_context(start_method)
+        self._pool = self._start_pool(model_path, scaler_path)
+        atexit.register(self.close)
+    
+    def _start_pool(self, model_path, scaler_path):
+        return self._context.Pool(
+            processes=self.workers, initializer=_init_worker, initargs=(model_path, scaler_path)
+        )
+    
+    def reload(self, model_path, scaler_path):
+        """Switch to workers serving another model artifact
+
+        The new pool is started before the swap; a batch already running on
+        the old pool finishes there and its workers exit afterwards.
+        """
+        pool = self._start_pool(model_path, scaler_path)
+        old, self._pool = self._pool, pool
+        if old is not None:
+            old.close()
+
+    def shards(self, readings):
+        """Split readings into at most `workers` contiguous shards"""
+        shard_count = max(1, min(self.workers, len(readings) // self.min_shard_size))
+        shard_size = math.ceil(len(readings) / shard_count)
+        return [readings[i:i + shard_size] for i in range(0, len(readings), shard_size)]
+
+    def analyze(self, readings):
+        """Health analyses for readings, in the same order"""
+        # Ship only the sensor values as one float array per shard; pickling
+        # dicts with machine_info and timestamps costs more than the scoring
+        pool = self._pool
+        columns = self._columns
+        values = np.array([[reading[column] for column in columns] for reading in readings], dtype=np.float64)
+        analyses = []
+        for shard_result in pool.map(_analyze_shard, self.shards(values)):
+            analyses.extend(shard_result)
+        return analyses
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool = None
@@ -0,0 +1,164 @@
+import heapq
+import threading
+
+class _Rollup:
+    """Machine count, health total and alert-level counts for one slice of the fleet"""
+
+    __slots__ = ('count', 'health_tenths', 'levels')
+
+    def __init__(self):
+        self.count = 0
+        self.health_tenths = 0  # integer tenths, so repeated add/remove never drifts
+        self.levels = {}
+
+    def add(self, health_tenths, level, sign=1):
+        self.count += sign
+        self.health_tenths += sign * health_tenths
+        remaining = self.levels.get(level, 0) + sign
+        if remaining:
+            self.levels[level] = remaining
+        else:
+            self.levels.pop(level, None)
+
+    def average_health(self):
+        return round(self.health_tenths / self.count / 10, 1) if self.count else 100
+
+    def to_dict(self):
+        return {
+            'machines': self.count,
+            'average_health': self.average_health(),
+            'alert_levels': dict(self.levels)
+        }
+
+class FleetAggregates:
+    """Fleet-wide rollups maintained incrementally as machines and alerts change
+
+    Each machine or alert change adjusts the totals in O(1). The worst
+    machines come from a min-heap on health score with lazy deletion:
+    every update pushes a new versioned entry, superseded entries are
+    skipped when read and the heap is compacted once they outnumber the
+    live ones.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._machines = {}  # machine_id -> (health_tenths, alert_level, type, location, name, version)
+        self.fleet = _Rollup()
+        self.by_type = {}
+        self.by_location = {}
+        self._open_alerts = {}  # alert_id -> severity
+        self.open_alerts_by_severity = {}
+        self._heap = []  # (health_tenths, version, machine_id)
+        self._version = 0
+
+    def rebuild(self, machines, alerts):
+        """Recompute everything from scratch (after a state restore)"""
+        self.__init__()
+        for machine in machines:
+            self.update_machine(machine)
+        for alert in alerts:
+            self.track_alert(alert)
+
+    def _apply(self, record, sign):
+        health_tenths, level, machine_type, location = record[:4]
+        self.fleet.add(health_tenths, level, sign)
+        for rollups, key in ((self.by_type, machine_type), (self.by_location, location)):
+            rollup = rollups.get(key)
+            if rollup is None:
+                rollup = rollups[key] = _Rollup()
+            rollup.add(health_tenths, level, sign)
+            if not rollup.count:
+                del rollups[key]
+
+    def update_machine(self, machine):
+        health_tenths = int(round(machine.health_score * 10))
+        with self._lock:
+            old = self._machines.get(machine.machine_id)
+            if old is not None:
+                if old[0] == health_tenths and old[1] == machine.alert_level:
+                    return
+                self._apply(old, -1)
+
+            self._version += 1
+            record = (health_tenths, machine.alert_level, machine.type, machine.location, machine.name, self._version)
+            self._machines[machine.machine_id] = record
+            self._apply(record, 1)
+
+            heapq.heappush(self._heap, (health_tenths, self._version, machine.machine_id))
+            if len(self._heap) > 2 * len(self._machines) + 64:
+                self._heap = [(r[0], r[5], mid) for mid, r in self._machines.items()]
+                heapq.heapify(self._heap)
+
+    def remove_machine(self, machine_id):
+        with self._lock:
+            old = self._machines.pop(machine_id, None)
+            if old is not None:
+                self._apply(old, -1)
+
+    def track_alert(self, alert):
+        """Count an alert as open (by its current severity) until it resolves"""
+        with self._lock:
+            previous = self._open_alerts.pop(alert.alert_id, None)
+            if previous is not None:
+                self._count_alert(previous, -1)
+            if not alert.resolved:
+                self._open_alerts[alert.alert_id] = alert.severity
+                self._count_alert(alert.severity, 1)
+
+    def untrack_alert(self, alert):
+        with self._lock:
+            previous = self._open_alerts.pop(alert.alert_id, None)
+            if previous is not None:
+                self._count_alert(previous, -1)
+
+    def _count_alert(self, severity, sign):
+        remaining = self.open_alerts_by_severity.get(severity, 0) + sign
+        if remaining:
+            self.open_alerts_by_severity[severity] = remaining
+        else:
+            self.open_alerts_by_severity.pop(severity, None)
+
+    def average_health(self):
+        return self.fleet.average_health()
+
+    def open_alert_count(self):
+        return len(self._open_alerts)
+
+    def worst(self, k=10):
+        """The k machines with the lowest health score, worst first"""
+        with self._lock:
+            heap = self._heap
+            found = []
+            while heap and len(found) < k:
+                entry = heapq.heappop(heap)
+                record = self._machines.get(entry[2])
+                if record is not None and record[5] == entry[1]:
+                    found.append(entry)
+            for entry in found:
+                heapq.heappush(heap, entry)
+
+            return [
+                {
+                    'machine_id': machine_id,
+                    'name': self._machines[machine_id][4],
+                    'health_score': health_tenths / 10,
+                    'alert_level': self._machines[machine_id][1]
+                }
+                for health_tenths, _, machine_id in found
+            ]
+
+    def summary(self, top=10):
+        worst = self.worst(top)
+        with self._lock:
+            return {
+                'machines': self.fleet.count,
+                'average_health': self.fleet.average_health(),
+                'alert_levels': dict(self.fleet.levels),
+                'by_type': {key: rollup.to_dict() for key, rollup in self.by_type.items()},
+                'by_location': {key: rollup.to_dict() for key, rollup in self.by_location.items()},
+                'open_alerts': {
+                    'total': len(self._open_alerts),
+                    'by_severity': dict(self.open_alerts_by_severity)
+                },
+                'worst_machines': worst
+            }
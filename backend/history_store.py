@@ -0,0 +1,403 @@
+from datetime import datetime
+import json
+import threading
+
+import numpy as np
+
+def _float32_value(value):
+    """Decode a float32 cell, undoing float32 rounding noise"""
+    return None if np.isnan(value) else round(float(value), 3)
+
+class StringTable:
+    """Interns repeated strings (machine ids, severities, messages) as small integer codes"""
+
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+    def encode(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+    def lookup(self, value):
+        """Code for value, or None if it was never stored"""
+        return self.codes.get(value)
+
+    def decode(self, code):
+        return self.values[code]
+
+    def nbytes(self):
+        return sum(len(value) for value in self.values)
+
+class ColumnarHistory:
+    """Append-only struct-of-arrays store
+
+    Each field lives in a numpy column grown by doubling, so a stored record
+    costs a few dozen bytes instead of a full Python object graph, and
+    queries filter whole columns with vectorized masks.
+    """
+
+    # Subclasses define (column_name, dtype) pairs
+    COLUMNS = ()
+    # Columns holding StringTable codes; re-encoded when rows are dropped
+    STRING_COLUMNS = ()
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self):
+        self.size = 0
+        self.capacity = self.INITIAL_CAPACITY
+        self.columns = {name: np.empty(self.capacity, dtype=dtype) for name, dtype in self.COLUMNS}
+        self.strings = StringTable()
+        # Held by anything that replaces the columns, and by readers on other threads
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return self.size
+
+    def _append_row(self, **values):
+        if self.size == self.capacity:
+            self._grow()
+        index = self.size
+        for name, value in values.items():
+            self.columns[name][index] = value
+        # Publish the row only once every column is written
+        self.size = index + 1
+
+    def _append_rows(self, count, **values):
+        """Append `count` rows at once from equal-length arrays (or scalars)"""
+        while self.size + count > self.capacity:
+            self._grow()
+        rows = slice(self.size, self.size + count)
+        for name, value in values.items():
+            self.columns[name][rows] = value
+        self.size += count
+
+    def _grow(self):
+        self.capacity *= 2
+        for name, column in self.columns.items():
+            grown = np.empty(self.capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            self.columns[name] = grown
+
+    def column(self, name):
+        """Read-only view of the filled part of a column"""
+        view = self.columns[name][:self.size]
+        view.flags.writeable = False
+        return view
+
+    def _select(self, machine_id=None, since=None, limit=None, newest_first=False, mask=None):
+        """Row indices matching the common machine/time filters"""
+        size = self.size
+        if mask is None:
+            mask = np.ones(size, dtype=bool)
+        else:
+            mask = mask[:size]
+
+        if machine_id is not None:
+            code = self.strings.lookup(machine_id)
+            if code is None:
+                return np.empty(0, dtype=np.int64)
+            mask &= self.columns['machine'][:size] == code
+        if since is not None:
+            mask &= self.columns['timestamp'][:size] >= since.timestamp()
+
+        indices = np.flatnonzero(mask)
+        if newest_first:
+            indices = indices[::-1]
+        if limit is not None:
+            indices = indices[:limit]
+        return indices
+
+    def _keep(self, keep):
+        """Keep only the rows at the sorted indices `keep`
+
+        Columns are reallocated at the smallest doubling of INITIAL_CAPACITY
+        that fits, and the string table is rebuilt from the codes still in
+        use, so dropped rows give their memory back instead of leaving
+        oversized columns and orphaned strings behind.
+        """
+        with self._lock:
+            size = len(keep)
+            capacity = self.INITIAL_CAPACITY
+            while capacity < size:
+                capacity *= 2
+            columns = {}
+            for name, column in self.columns.items():
+                kept = np.empty(capacity, dtype=column.dtype)
+                kept[:size] = column[keep]
+                columns[name] = kept
+
+            if self.STRING_COLUMNS:
+                strings = StringTable()
+                remap = np.zeros(len(self.strings.values), dtype=np.uint32)
+                used = np.unique(np.concatenate([columns[name][:size] for name in self.STRING_COLUMNS]))
+                for code in used:
+                    remap[code] = strings.encode(self.strings.values[code])
+                for name in self.STRING_COLUMNS:
+                    columns[name][:size] = remap[columns[name][:size]]
+                self.strings = strings
+
+            self.columns = columns
+            self.capacity = capacity
+            self.size = size
+
+    def drop_before(self, timestamp):
+        """Drop rows older than timestamp; returns the number dropped"""
+        with self._lock:
+            timestamps = self.columns['timestamp'][:self.size]
+            keep = np.flatnonzero(timestamps >= timestamp)
+            dropped = self.size - len(keep)
+            if dropped:
+                self._keep(keep)
+            return dropped
+
+    def drop_oldest(self, count):
+        """Drop the `count` rows with the oldest timestamps"""
+        with self._lock:
+            count = min(count, self.size)
+            if count <= 0:
+                return 0
+            timestamps = self.columns['timestamp'][:self.size]
+            if count == self.size:
+                keep = np.empty(0, dtype=np.int64)
+            else:
+                keep = np.sort(np.argpartition(timestamps, count)[count:])
+            self._keep(keep)
+            return count
+
+    def oldest(self):
+        """Timestamp of the oldest row, or None when empty"""
+        with self._lock:
+            return float(self.columns['timestamp'][:self.size].min()) if self.size else None
+
+    def export_state(self):
+        """Copy of the filled columns and string table, for snapshots"""
+        with self._lock:
+            return {
+                'size': self.size,
+                'columns': {name: column[:self.size].copy() for name, column in self.columns.items()},
+                'strings': list(self.strings.values)
+            }
+
+    def restore_state(self, state):
+        """Replace the contents with an export_state() copy"""
+        with self._lock:
+            size = state['size']
+            self.capacity = max(self.INITIAL_CAPACITY, size)
+            self.columns = {}
+            for name, dtype in self.COLUMNS:
+                column = np.empty(self.capacity, dtype=dtype)
+                column[:size] = state['columns'][name]
+                self.columns[name] = column
+            self.strings = StringTable()
+            for value in state['strings']:
+                self.strings.encode(value)
+            self.size = size
+
+    def nbytes(self):
+        """Approximate memory held by the columns and string table"""
+        return sum(column.nbytes for column in self.columns.values()) + self.strings.nbytes()
+
+class AlertHistory(ColumnarHistory):
+    """Columnar store for alerts evicted from the live alert list"""
+
+    COLUMNS = (
+        ('timestamp', np.float64),
+        ('id_suffix', np.int64),
+        ('machine', np.uint32),
+        ('alert_type', np.uint32),
+        ('severity', np.uint32),
+        ('message', np.uint32),
+        ('recommendation', np.uint32),
+        ('potential_issues', np.uint32),
+        ('health_score', np.float32),
+        ('failure_probability', np.float32),
+        ('temperature', np.float32),
+        ('vibration', np.float32),
+        ('rotation_speed', np.float32),
+        ('load', np.float32),
+        ('flags', np.uint8),
+        ('occurrences', np.uint32),
+        ('last_seen', np.float64),
+    )
+
+    STRING_COLUMNS = ('machine', 'alert_type', 'severity', 'message', 'recommendation', 'potential_issues')
+
+    ACKNOWLEDGED = 1
+    RESOLVED = 2
+
+    def append(self, alert):
+        details = alert.details or {}
+        readings = details.get('sensor_readings') or {}
+        encode = self.strings.encode
+        self._append_row(
+            timestamp=alert.timestamp.timestamp(),
+            id_suffix=int(alert.alert_id.rsplit('_', 1)[1]),
+            machine=encode(alert.machine_id),
+            alert_type=encode(alert.alert_type),
+            severity=encode(alert.severity),
+            message=encode(alert.message),
+            recommendation=encode(details.get('recommendation', '')),
+            potential_issues=encode(json.dumps(details.get('potential_issues', []))),
+            health_score=details.get('health_score', np.nan),
+            failure_probability=details.get('failure_probability', np.nan),
+            temperature=readings.get('temperature', np.nan),
+            vibration=readings.get('vibration', np.nan),
+            rotation_speed=readings.get('rotation_speed', np.nan),
+            load=readings.get('load', np.nan),
+            flags=(self.ACKNOWLEDGED if alert.acknowledged else 0) | (self.RESOLVED if alert.resolved else 0),
+            occurrences=alert.occurrences,
+            last_seen=alert.last_seen.timestamp()
+        )
+
+    def rows(self, machine_id=None, since=None, severity=None, limit=None, newest_first=False):
+        """Stored alerts in Alert.to_dict() format"""
+        with self._lock:
+            mask = None
+            if severity is not None:
+                code = self.strings.lookup(severity)
+                if code is None:
+                    return []
+                mask = self.columns['severity'][:self.size] == code
+
+            indices = self._select(machine_id, since, limit, newest_first, mask)
+            return [self._row(i) for i in indices]
+
+    def _row(self, i):
+        c = self.columns
+        decode = self.strings.decode
+        machine_id = decode(c['machine'][i])
+        readings = {
+            name: _float32_value(c[name][i])
+            for name in ('temperature', 'vibration', 'rotation_speed', 'load')
+            if not np.isnan(c[name][i])
+        }
+        return {
+            'alert_id': f"{machine_id}_{c['id_suffix'][i]}",
+            'machine_id': machine_id,
+            'alert_type': decode(c['alert_type'][i]),
+            'severity': decode(c['severity'][i]),
+            'message': decode(c['message'][i]),
+            'details': {
+                'health_score': _float32_value(c['health_score'][i]),
+                'failure_probability': _float32_value(c['failure_probability'][i]),
+                'sensor_readings': readings,
+                'potential_issues': json.loads(decode(c['potential_issues'][i])),
+                'recommendation': decode(c['recommendation'][i])
+            },
+            'timestamp': datetime.fromtimestamp(c['timestamp'][i]).isoformat(),
+            'acknowledged': bool(c['flags'][i] & self.ACKNOWLEDGED),
+            'resolved': bool(c['flags'][i] & self.RESOLVED),
+            'occurrences': int(c['occurrences'][i]),
+            'last_seen': datetime.fromtimestamp(c['last_seen'][i]).isoformat()
+        }
+
+class ReadingHistory(ColumnarHistory):
+    """Columnar store of the sensor readings scored by the background worker"""
+
+    COLUMNS = (
+        ('timestamp', np.float64),
+        ('machine', np.uint32),
+        ('temperature', np.float32),
+        ('vibration', np.float32),
+        ('rotation_speed', np.float32),
+        ('load', np.float32),
+    )
+
+    STRING_COLUMNS = ('machine',)
+    SENSORS = ('temperature', 'vibration', 'rotation_speed', 'load')
+
+    def __init__(self, max_rows=None):
+        super().__init__()
+        self.max_rows = max_rows
+
+    def append_batch(self, machine_ids, readings, timestamp):
+        """Store one tick's readings (dicts with the SENSORS keys) under a shared timestamp"""
+        count = len(machine_ids)
+        if not count:
+            return
+        with self._lock:
+            machines = np.fromiter((self.strings.encode(mid) for mid in machine_ids), dtype=np.uint32, count=count)
+            self._append_rows(
+                count, timestamp=timestamp, machine=machines,
+                **{name: [reading[name] for reading in readings] for name in self.SENSORS})
+            if self.max_rows is not None and self.size > self.max_rows:
+                # Drop the oldest quarter at once so trimming is amortized over many ticks
+                self.drop_oldest(self.size - self.max_rows * 3 // 4)
+
+    def _bucket_inputs(self, indices):
+        """(counts, {sensor: (sums, mins, maxs)}) of rows, for rolling them into buckets"""
+        counts = np.ones(len(indices), dtype=np.float64)
+        stats = {}
+        for name in self.SENSORS:
+            values = self.columns[name][indices].astype(np.float64)
+            stats[name] = (values, values, values)
+        return counts, stats
+
+class DownsampledReadings(ColumnarHistory):
+    """Per-machine sample count and mean/min/max of the readings in fixed time buckets
+
+    A tier absorbs rows older than its cut-off from a finer store (raw
+    readings or the previous tier) and drops them there. Cut-offs are
+    aligned to the bucket width, so a bucket is always rolled up in one
+    pass and never split across two rows.
+    """
+
+    COLUMNS = (('timestamp', np.float64), ('machine', np.uint32), ('samples', np.uint32)) + tuple(
+        (f"{sensor}_{stat}", np.float32) for sensor in ReadingHistory.SENSORS for stat in ('mean', 'min', 'max'))
+
+    STRING_COLUMNS = ('machine',)
+    SENSORS = ReadingHistory.SENSORS
+
+    def __init__(self, bucket_seconds, max_age):
+        super().__init__()
+        self.bucket_seconds = bucket_seconds
+        self.max_age = max_age
+
+    def cutoff(self, timestamp):
+        """The bucket boundary at or before timestamp"""
+        return np.floor(timestamp / self.bucket_seconds) * self.bucket_seconds
+
+    def absorb(self, source, before):
+        """Roll the rows of source older than before into buckets; returns the rows rolled"""
+        with source._lock:
+            size = source.size
+            timestamps = source.columns['timestamp'][:size]
+            rolled = np.flatnonzero(timestamps < before)
+            if not len(rolled):
+                return 0
+            counts, stats = source._bucket_inputs(rolled)
+            buckets = self.cutoff(timestamps[rolled])
+            machines = source.columns['machine'][rolled]
+            names = source.strings.values
+
+            order = np.lexsort((buckets, machines))
+            buckets, machines, counts = buckets[order], machines[order], counts[order]
+            starts = np.flatnonzero(np.r_[True, (machines[1:] != machines[:-1]) | (buckets[1:] != buckets[:-1])])
+            totals = np.add.reduceat(counts, starts)
+            columns = {'timestamp': buckets[starts], 'samples': totals}
+            for name, (sums, mins, maxs) in stats.items():
+                columns[f"{name}_mean"] = np.add.reduceat(sums[order], starts) / totals
+                columns[f"{name}_min"] = np.minimum.reduceat(mins[order], starts)
+                columns[f"{name}_max"] = np.maximum.reduceat(maxs[order], starts)
+
+            with self._lock:
+                columns['machine'] = [self.strings.encode(names[code]) for code in machines[starts]]
+                self._append_rows(len(starts), **columns)
+            source._keep(np.flatnonzero(timestamps >= before))
+            return len(rolled)
+
+    def _bucket_inputs(self, indices):
+        counts = self.columns['samples'][indices].astype(np.float64)
+        stats = {}
+        for name in self.SENSORS:
+            stats[name] = (
+                self.columns[f"{name}_mean"][indices] * counts,
+                self.columns[f"{name}_min"][indices].astype(np.float64),
+                self.columns[f"{name}_max"][indices].astype(np.float64)
+            )
+        return counts, stats
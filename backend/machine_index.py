@@ -0,0 +1,99 @@
+import base64
+import json
+import threading
+from bisect import bisect_left, bisect_right, insort
+
+class InvalidCursor(ValueError):
+    pass
+
+class MachineIndex:
+    """Sorted indexes over the fleet for cursor-paginated listings
+
+    Each sortable field keeps a list of (value, machine_id) in order,
+    updated with bisect when a machine's value changes. A page resumes
+    right after the (value, machine_id) key encoded in its cursor, so
+    paging never re-sorts the fleet or skips/repeats rows because of
+    offsets shifting underneath it.
+    """
+
+    SORT_FIELDS = ('machine_id', 'health_score', 'failure_probability')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys = {}  # machine_id -> {field: (value, machine_id)}
+        self._indexes = {field: [] for field in self.SORT_FIELDS}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def update(self, machine):
+        machine_id = machine.machine_id
+        with self._lock:
+            keys = self._keys.setdefault(machine_id, {})
+            for field in self.SORT_FIELDS:
+                key = (getattr(machine, field), machine_id)
+                old = keys.get(field)
+                if old == key:
+                    continue
+                index = self._indexes[field]
+                if old is not None:
+                    del index[bisect_left(index, old)]
+                insort(index, key)
+                keys[field] = key
+
+    def remove(self, machine_id):
+        with self._lock:
+            keys = self._keys.pop(machine_id, None) or {}
+            for field, key in keys.items():
+                index = self._indexes[field]
+                del index[bisect_left(index, key)]
+
+    @staticmethod
+    def encode_cursor(sort, order, key):
+        raw = json.dumps([sort, order, key[0], key[1]], separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor, sort, order):
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            cursor_sort, cursor_order, value, machine_id = json.loads(raw)
+        except (ValueError, TypeError) as e:
+            raise InvalidCursor(f"Malformed cursor: {e}")
+        if (cursor_sort, cursor_order) != (sort, order):
+            raise InvalidCursor("Cursor was issued for a different sort order")
+        # The key is compared against index keys, so its types must match the field's
+        value_type = str if sort == 'machine_id' else (int, float)
+        if not isinstance(value, value_type) or isinstance(value, bool) or not isinstance(machine_id, str):
+            raise InvalidCursor(f"Cursor value does not match the {sort} field")
+        return (value, machine_id)
+
+    def page(self, sort='machine_id', order='asc', limit=50, cursor=None, match=None):
+        """Machine ids for one page plus the cursor for the next (None at the end)"""
+        if sort not in self._indexes:
+            raise ValueError(f"Cannot sort by {sort}")
+        after = self.decode_cursor(cursor, sort, order) if cursor else None
+        descending = order == 'desc'
+
+        with self._lock:
+            index = self._indexes[sort]
+            if descending:
+                stop = bisect_left(index, after) if after is not None else len(index)
+                candidates = (index[i] for i in range(stop - 1, -1, -1))
+            else:
+                start = bisect_right(index, after) if after is not None else 0
+                candidates = (index[i] for i in range(start, len(index)))
+
+            # One extra match tells whether another page exists
+            keys = []
+            for key in candidates:
+                if match is None or match(key[1]):
+                    keys.append(key)
+                    if len(keys) > limit:
+                        break
+
+        next_cursor = None
+        if len(keys) > limit:
+            keys = keys[:limit]
+            next_cursor = self.encode_cursor(sort, order, keys[-1])
+        return [key[1] for key in keys], next_cursor
@@ -0,0 +1,201 @@
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from config import Config
+
+class MaintenanceLogStore:
+    """Durable, append-only maintenance log backed by SQLite
+
+    Appends are buffered and committed in batches (one WAL fsync per batch)
+    by a small flusher thread, either when BATCH_SIZE records are pending or
+    after FLUSH_INTERVAL seconds. Reads merge indexed range queries with the
+    not-yet-committed tail, so callers always see their own writes.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS maintenance_logs (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            log_id TEXT NOT NULL,
+            machine_id TEXT NOT NULL,
+            activity_type TEXT NOT NULL,
+            description TEXT NOT NULL,
+            technician TEXT,
+            timestamp REAL NOT NULL,
+            duration REAL,
+            parts_used TEXT,
+            cost REAL
+        );
+        CREATE INDEX IF NOT EXISTS idx_maintenance_machine_time
+            ON maintenance_logs (machine_id, timestamp);
+        CREATE INDEX IF NOT EXISTS idx_maintenance_time
+            ON maintenance_logs (timestamp);
+    """
+
+    COLUMNS = ('log_id', 'machine_id', 'activity_type', 'description', 'technician',
+               'timestamp', 'duration', 'parts_used', 'cost')
+
+    def __init__(self, path=None, batch_size=None, flush_interval=None):
+        self.path = path or Config.MAINTENANCE_DB_PATH
+        self.batch_size = batch_size or Config.MAINTENANCE_LOG_BATCH_SIZE
+        self.flush_interval = flush_interval or Config.MAINTENANCE_LOG_FLUSH_INTERVAL
+
+        self._lock = threading.Lock()
+        self._pending = []
+        self._closed = False
+        self._flush_requested = threading.Event()
+
+        self.recovery_seconds = self._open()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM maintenance_logs").fetchone()[0]
+
+        self._flusher = threading.Thread(target=self._flush_loop, name='maintenance-log-flusher', daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def _open(self):
+        """Open the database, replay any WAL left by a crash and return the time it took"""
+        start = time.perf_counter()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        # Keep the WAL short so crash recovery (WAL replay) stays bounded
+        self._conn.execute(f"PRAGMA wal_autocheckpoint={Config.MAINTENANCE_WAL_CHECKPOINT_PAGES}")
+        self._conn.execute(f"PRAGMA journal_size_limit={Config.MAINTENANCE_WAL_CHECKPOINT_PAGES * 4096}")
+        self._conn.executescript(self.SCHEMA)
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+        elapsed = time.perf_counter() - start
+        if elapsed > Config.MAINTENANCE_RECOVERY_BUDGET:
+            print(f"Maintenance log recovery took {elapsed:.2f}s (budget {Config.MAINTENANCE_RECOVERY_BUDGET}s)")
+        return elapsed
+
+    def __len__(self):
+        return self._count
+
+    def append(self, log):
+        """Queue a MaintenanceLog for the next batched commit"""
+        row = (
+            log.log_id,
+            log.machine_id,
+            log.activity_type,
+            log.description,
+            log.technician,
+            log.timestamp.timestamp(),
+            None if log.duration is None else float(log.duration),
+            json.dumps(log.parts_used),
+            float(log.cost)
+        )
+        with self._lock:
+            self._pending.append(row)
+            self._count += 1
+            if len(self._pending) >= self.batch_size:
+                self._flush_requested.set()
+
+    def flush(self):
+        """Commit all pending records in one transaction"""
+        with self._lock:
+            if not self._pending or self._closed:
+                return
+            batch, self._pending = self._pending, []
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    f"INSERT INTO maintenance_logs ({', '.join(self.COLUMNS)}) "
+                    f"VALUES ({', '.join('?' for _ in self.COLUMNS)})",
+                    batch
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                self._pending = batch + self._pending
+                raise
+
+    def _flush_loop(self):
+        while not self._closed:
+            self._flush_requested.wait(self.flush_interval)
+            self._flush_requested.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Error flushing maintenance log: {e}")
+
+    def rows(self, machine_id=None, since=None, until=None, limit=None, newest_first=False):
+        """Logs in MaintenanceLog.to_dict() format, read through the (machine_id, timestamp) index"""
+        clauses = []
+        params = []
+        if machine_id is not None:
+            clauses.append("machine_id = ?")
+            params.append(machine_id)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since.timestamp())
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(until.timestamp())
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        order = "DESC" if newest_first else "ASC"
+        query = f"SELECT {', '.join(self.COLUMNS)} FROM maintenance_logs {where} ORDER BY timestamp {order}, seq {order}"
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+
+        def matches(row):
+            return ((machine_id is None or row[1] == machine_id) and
+                    (since is None or row[5] >= since.timestamp()) and
+                    (until is None or row[5] < until.timestamp()))
+
+        with self._lock:
+            stored = self._conn.execute(query, params).fetchall()
+            pending = [row for row in self._pending if matches(row)]
+
+        # Pending records are always newer than committed ones
+        combined = pending[::-1] + stored if newest_first else stored + pending
+        if limit is not None:
+            combined = combined[:limit]
+        return [self._to_dict(row) for row in combined]
+
+    def prune(self, before=None, max_rows=None):
+        """Delete logs older than before and all but the newest max_rows; returns the count deleted"""
+        self.flush()
+        with self._lock:
+            if self._closed:
+                return 0
+            deleted = 0
+            self._conn.execute("BEGIN")
+            try:
+                if before is not None:
+                    deleted += self._conn.execute(
+                        "DELETE FROM maintenance_logs WHERE timestamp < ?", (before.timestamp(),)).rowcount
+                if max_rows is not None:
+                    deleted += self._conn.execute(
+                        "DELETE FROM maintenance_logs WHERE seq NOT IN "
+                        "(SELECT seq FROM maintenance_logs ORDER BY timestamp DESC, seq DESC LIMIT ?)",
+                        (int(max_rows),)).rowcount
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._count -= deleted
+            return deleted
+
+    def _to_dict(self, row):
+        record = dict(zip(self.COLUMNS, row))
+        record['timestamp'] = datetime.fromtimestamp(record['timestamp']).isoformat()
+        record['parts_used'] = json.loads(record['parts_used']) if record['parts_used'] else []
+        return record
+
+    def close(self):
+        """Flush pending records and close the database"""
+        if self._closed:
+            return
+        self.flush()
+        with self._lock:
+            self._closed = True
+            self._flush_requested.set()
+            self._conn.close()
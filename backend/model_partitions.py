@@ -0,0 +1,62 @@
+import threading
+from collections import OrderedDict
+
+class PartitionCache:
+    """Per-machine-type models of one registry version, loaded on first use
+
+    Only partitions that machines in the current tick route to are read
+    from disk. Loaded models are kept in least-recently-used order and
+    evicted once their artifact sizes exceed budget_bytes, so a fleet
+    with many machine types holds only its active partitions in memory.
+    An evicted partition is simply loaded again the next time it is
+    needed.
+    """
+
+    def __init__(self, registry, version, budget_bytes):
+        self.registry = registry
+        self.version = version
+        self.budget_bytes = budget_bytes
+        self.sizes = registry.partitions(version)  # machine_type -> artifact bytes
+        self.available = frozenset(self.sizes)
+        self._loaded = OrderedDict()
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.hits = 0
+        self.evictions = 0
+
+    def loaded_bytes(self):
+        return sum(self.sizes[machine_type] for machine_type in self._loaded)
+
+    def get(self, machine_type):
+        """The partition model for machine_type, or None if the version has none"""
+        if machine_type not in self.available:
+            return None
+        with self._lock:
+            model = self._loaded.get(machine_type)
+            if model is not None:
+                self._loaded.move_to_end(machine_type)
+                self.hits += 1
+                return model
+
+            model = self.registry.load_partition(self.version, machine_type)
+            self._loaded[machine_type] = model
+            self.loads += 1
+            # Never evict the partition just loaded, even if it alone exceeds the budget
+            while len(self._loaded) > 1 and self.loaded_bytes() > self.budget_bytes:
+                evicted, _ = self._loaded.popitem(last=False)
+                self.evictions += 1
+                print(f"Evicted {evicted} model partition (memory budget)")
+            return model
+
+    def stats(self):
+        with self._lock:
+            return {
+                'version': self.version,
+                'available': sorted(self.available),
+                'loaded': list(self._loaded),
+                'loaded_bytes': self.loaded_bytes(),
+                'budget_bytes': self.budget_bytes,
+                'loads': self.loads,
+                'hits': self.hits,
+                'evictions': self.evictions
+            }
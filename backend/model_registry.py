@@ -0,0 +1,320 @@
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+from train_model import AuraMachineHealthModel
+
+class UnknownModelVersion(KeyError):
+    pass
+
+class ModelRegistry:
+    """Versioned model artifacts on disk with an atomically switched active pointer
+
+    Each version is a directory v0001, v0002, ... holding model.pkl,
+    scaler.pkl, meta.json and the model's evaluation.json report. A
+    version is written to a temporary directory and renamed into place,
+    so readers never see a partial artifact, and the model is never
+    modified afterwards; distilled students (tier-<tier>.pkl) and
+    per-machine-type models (partitions/<type>/) are added beside it
+    later, each renamed into place. active.json names the serving
+    version and the shadow candidate; it is replaced with os.replace so
+    a crash leaves either the old or the new pointer. Publishing from
+    another process (retraining) is safe: a version number taken
+    concurrently makes the rename fail and the next one is tried.
+    """
+
+    POINTER = 'active.json'
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _version_dir(self, version):
+        return os.path.join(self.root, f"v{version:04d}")
+
+    def versions(self):
+        found = []
+        for name in os.listdir(self.root):
+            if name.startswith('v') and name[1:].isdigit():
+                found.append(int(name[1:]))
+        return sorted(found)
+
+    def metadata(self, version):
+        try:
+            with open(os.path.join(self._version_dir(version), 'meta.json')) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise UnknownModelVersion(version)
+
+    def evaluation(self, version):
+        """The evaluation report published with a version, or None"""
+        self.artifact_paths(version)
+        try:
+            with open(os.path.join(self._version_dir(version), 'evaluation.json')) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _evaluation_summary(report):
+        """Headline numbers for listings; the full report is served per version"""
+        if report is None:
+            return None
+        cross_validation = report.get('cross_validation') or {}
+        return {
+            'holdout_roc_auc': report['holdout']['roc_auc'],
+            'holdout_recall': report['holdout']['recall'],
+            'cv_roc_auc': cross_validation.get('roc_auc', {}).get('mean'),
+            'brier': report['calibration']['brier'],
+            'batch_us_per_row': report['latency']['batch_us_per_row']
+        }
+
+    def artifact_paths(self, version):
+        """(model_path, scaler_path) of a published version"""
+        directory = self._version_dir(version)
+        if not os.path.isdir(directory):
+            raise UnknownModelVersion(version)
+        return os.path.join(directory, 'model.pkl'), os.path.join(directory, 'scaler.pkl')
+
+    def publish(self, model, source, metrics=None):
+        """Write a trained AuraMachineHealthModel as a new version and return its number"""
+        import joblib
+        tmp = os.path.join(self.root, f".publish-{os.getpid()}-{threading.get_ident()}")
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        joblib.dump(model.model, os.path.join(tmp, 'model.pkl'))
+        joblib.dump(model.scaler, os.path.join(tmp, 'scaler.pkl'))
+        if model.evaluation is not None:
+            with open(os.path.join(tmp, 'evaluation.json'), 'w') as f:
+                json.dump(model.evaluation, f, indent=2)
+
+        while True:
+            version = max(self.versions(), default=0) + 1
+            meta = {
+                'version': version,
+                'created_at': datetime.now().isoformat(),
+                'source': source,
+                'metrics': metrics or {}
+            }
+            with open(os.path.join(tmp, 'meta.json'), 'w') as f:
+                json.dump(meta, f, indent=2)
+            try:
+                os.rename(tmp, self._version_dir(version))
+                break
+            except OSError:
+                if not os.path.isdir(self._version_dir(version)):
+                    raise
+        print(f"Published model version {version} ({source})")
+        return version
+
+    def load(self, version):
+        """An AuraMachineHealthModel loaded from a published version"""
+        model_path, scaler_path = self.artifact_paths(version)
+        model = AuraMachineHealthModel()
+        model.model_path = model_path
+        model.scaler_path = scaler_path
+        model.load_model()
+        model.version = version
+        return model
+
+    def _tier_path(self, version, tier):
+        return os.path.join(self._version_dir(version), f"tier-{tier}.pkl")
+
+    def publish_tier(self, distilled):
+        """Store a distilled student next to its forest (written aside, then renamed)"""
+        path = self._tier_path(distilled.version, distilled.tier)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        import joblib
+        joblib.dump(distilled.model, tmp)
+        os.replace(tmp, path)
+
+    def load_tier(self, model, tier):
+        """The distilled `tier` student of a loaded version, or None if not distilled yet"""
+        path = self._tier_path(model.version, tier)
+        if not os.path.exists(path):
+            return None
+        import joblib
+        distilled = AuraMachineHealthModel()
+        distilled.model = joblib.load(path)
+        distilled.scaler = model.scaler
+        distilled.version = model.version
+        distilled.tier = tier
+        return distilled
+
+    def _partition_dir(self, version, machine_type):
+        return os.path.join(self._version_dir(version), 'partitions', machine_type)
+
+    def publish_partition(self, version, model):
+        """Store a per-machine-type model of a version (written aside, then renamed)"""
+        directory = self._partition_dir(version, model.partition)
+        tmp = f"{directory}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        model.model_path = os.path.join(tmp, 'model.pkl')
+        model.scaler_path = os.path.join(tmp, 'scaler.pkl')
+        model.save_model()
+        os.rename(tmp, directory)
+        model.model_path = os.path.join(directory, 'model.pkl')
+        model.scaler_path = os.path.join(directory, 'scaler.pkl')
+
+    def partitions(self, version):
+        """{machine_type: model.pkl size in bytes} for the partitions of a version"""
+        root = os.path.join(self._version_dir(version), 'partitions')
+        if not os.path.isdir(root):
+            return {}
+        return {
+            name: os.path.getsize(os.path.join(root, name, 'model.pkl'))
+            for name in os.listdir(root)
+            if os.path.isdir(os.path.join(root, name)) and not name.endswith('.tmp')
+        }
+
+    def load_partition(self, version, machine_type):
+        directory = self._partition_dir(version, machine_type)
+        model = AuraMachineHealthModel()
+        model.model_path = os.path.join(directory, 'model.pkl')
+        model.scaler_path = os.path.join(directory, 'scaler.pkl')
+        model.load_model()
+        model.version = version
+        model.partition = machine_type
+        return model
+
+    def _read_pointer(self):
+        try:
+            with open(os.path.join(self.root, self.POINTER)) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write_pointer(self, **changes):
+        with self._lock:
+            pointer = self._read_pointer()
+            pointer.update(changes)
+            tmp = os.path.join(self.root, f".{self.POINTER}.tmp")
+            with open(tmp, 'w') as f:
+                json.dump(pointer, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, os.path.join(self.root, self.POINTER))
+
+    def active_version(self):
+        return self._read_pointer().get('active')
+
+    def shadow_version(self):
+        return self._read_pointer().get('shadow')
+
+    def set_active(self, version):
+        self.artifact_paths(version)
+        self._write_pointer(active=version)
+
+    def set_shadow(self, version):
+        if version is not None:
+            self.artifact_paths(version)
+        self._write_pointer(shadow=version)
+
+    def describe(self):
+        pointer = self._read_pointer()
+        return {
+            'active': pointer.get('active'),
+            'shadow': pointer.get('shadow'),
+            'versions': [
+                dict(self.metadata(version), evaluation=self._evaluation_summary(self.evaluation(version)))
+                for version in self.versions()
+            ]
+        }
+
+class ShadowScorer:
+    """Scores each tick's batch with a candidate model next to the live model
+
+    The candidate runs on its own thread while the tick scores with the
+    live model (tree inference releases the GIL), and the tick never
+    waits for it: results are compared against the live analyses when
+    both are done. If the candidate is still busy with the previous
+    batch, the new batch is skipped rather than queued, so a slow
+    candidate cannot hold back or pile up behind the tick.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.version = model.version
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='aura-shadow')
+        self._pending = None
+        self._lock = threading.Lock()
+        self.started_at = datetime.now()
+        self.batches = 0
+        self.skipped = 0
+        self.errors = 0
+        self.machines = 0
+        self.abs_diff_total = 0.0
+        self.max_abs_diff = 0.0
+        self.level_disagreements = 0
+        self.live_seconds = 0.0
+        self.shadow_seconds = 0.0
+
+    def _score(self, readings):
+        start = time.perf_counter()
+        model = self.model
+        analyses = model.analyze_batch(readings, model.predict_batch(model.prepare_batch(readings)))
+        return analyses, time.perf_counter() - start
+
+    def submit(self, readings):
+        """Start scoring a batch; returns a handle for compare(), or None when skipped"""
+        if self._pending is not None and not self._pending.done():
+            self.skipped += 1
+            return None
+        self._pending = self._executor.submit(self._score, readings)
+        return self._pending
+
+    def compare(self, future, live_analyses, live_seconds):
+        """Fold the candidate's results for a batch into the running comparison"""
+        def record(done):
+            try:
+                shadow_analyses, shadow_seconds = done.result()
+            except Exception as e:
+                self.errors += 1
+                print(f"Shadow model {self.version} failed: {e}")
+                return
+            live_probs = np.array([a['failure_probability'] for a in live_analyses], dtype=float)
+            shadow_probs = np.array([a['failure_probability'] for a in shadow_analyses], dtype=float)
+            diff = np.abs(live_probs - shadow_probs)
+            disagreements = sum(
+                live['alert_level'] != shadow['alert_level']
+                for live, shadow in zip(live_analyses, shadow_analyses)
+            )
+            with self._lock:
+                self.batches += 1
+                self.machines += len(diff)
+                self.abs_diff_total += float(diff.sum())
+                self.max_abs_diff = max(self.max_abs_diff, float(diff.max(initial=0.0)))
+                self.level_disagreements += disagreements
+                self.live_seconds += live_seconds
+                self.shadow_seconds += shadow_seconds
+
+        future.add_done_callback(record)
+
+    def stats(self):
+        with self._lock:
+            machines = self.machines or 1
+            batches = self.batches or 1
+            return {
+                'version': self.version,
+                'since': self.started_at.isoformat(),
+                'batches': self.batches,
+                'skipped_batches': self.skipped,
+                'errors': self.errors,
+                'machines_scored': self.machines,
+                'mean_abs_probability_diff': round(self.abs_diff_total / machines, 3),
+                'max_abs_probability_diff': round(self.max_abs_diff, 3),
+                'alert_level_agreement': round(1 - self.level_disagreements / machines, 4),
+                'live_ms_per_batch': round(self.live_seconds / batches * 1000, 3),
+                'shadow_ms_per_batch': round(self.shadow_seconds / batches * 1000, 3)
+            }
+
+    def close(self):
+        self._executor.shutdown(wait=False)
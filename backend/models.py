@@ -1,7 +1,88 @@
 from datetime import datetime, timedelta
 import json
 
-class MachineData:
+_UNSET = object()
+
+# to_json() cache [hits, misses] per model class, reported by /api/metrics
+serialization_cache_counts = {}
+
+_last_alert_suffix = 0
+
+def _next_alert_suffix():
+    """Alert id suffix: the current epoch second, bumped to stay unique when
+    several rules fire for a machine within the same second"""
+    global _last_alert_suffix
+    _last_alert_suffix = max(int(datetime.now().timestamp()), _last_alert_suffix + 1)
+    return _last_alert_suffix
+
+class CachedSerialization:
+    """Mixin caching to_dict()/to_json() output until a public field changes
+    
+    Assigning an attribute invalidates the cache only if the new value differs
+    from the old one. In-place mutation of a nested dict/list is not tracked;
+    call invalidate() after doing that.
+    
+    A write assigns the value first, then bumps a generation counter and
+    drops the caches. A serialization keeps its result only if no write
+    bumped the generation while it ran, so a request thread that read a
+    field just before it changed cannot leave the stale form cached.
+    """
+    __slots__ = ('_dict_cache', '_json_cache', '_generation')
+    
+    def __setattr__(self, name, value):
+        if name[0] != '_' and getattr(self, name, _UNSET) != value:
+            object.__setattr__(self, name, value)
+            self.invalidate()
+        else:
+            object.__setattr__(self, name, value)
+    
+    def invalidate(self):
+        """Drop the cached serialized form"""
+        object.__setattr__(self, '_generation', getattr(self, '_generation', 0) + 1)
+        object.__setattr__(self, '_dict_cache', None)
+        object.__setattr__(self, '_json_cache', None)
+    
+    def _store(self, slot, value, generation):
+        """Cache a serialized form built at `generation`, unless a write happened meanwhile"""
+        object.__setattr__(self, slot, value)
+        # Checked after storing: a write that lands between a check and the
+        # store would otherwise not see (and clear) the stale value
+        if getattr(self, '_generation', 0) != generation:
+            object.__setattr__(self, slot, None)
+    
+    def to_dict(self):
+        """Serialized form (shared cached dict, treat as read-only)"""
+        cached = getattr(self, '_dict_cache', None)
+        if cached is None:
+            generation = getattr(self, '_generation', 0)
+            cached = self._serialize()
+            self._store('_dict_cache', cached, generation)
+        return cached
+    
+    def to_json(self):
+        """Serialized form as a JSON fragment, for assembling larger responses"""
+        cached = getattr(self, '_json_cache', None)
+        counts = serialization_cache_counts.get(type(self))
+        if counts is None:
+            counts = serialization_cache_counts.setdefault(type(self), [0, 0])
+        if cached is None:
+            counts[1] += 1
+            generation = getattr(self, '_generation', 0)
+            # Built from the fields, not _dict_cache: a stale dict can sit there
+            # briefly before the write that made it stale clears it
+            cached = json.dumps(self._serialize(), separators=(',', ':'))
+            self._store('_json_cache', cached, generation)
+        else:
+            counts[0] += 1
+        return cached
+
+class MachineData(CachedSerialization):
+    __slots__ = (
+        'machine_id', 'name', 'type', 'location', 'current_readings', 'health_score',
+        'alert_level', 'last_maintenance', 'next_maintenance', 'failure_probability',
+        'potential_issues', 'recommendation', 'last_updated'
+    )
+    
     def __init__(self, machine_id, name, machine_type, location):
         self.machine_id = machine_id
         self.name = name
@@ -17,7 +98,7 @@ class MachineData:
         self.recommendation = "Continue normal operation"
         self.last_updated = datetime.now()
     
-    def to_dict(self):
+    def _serialize(self):
         return {
             'machine_id': self.machine_id,
             'name': self.name,
@@ -34,9 +115,14 @@ class MachineData:
             'next_maintenance': self.next_maintenance.isoformat() if self.next_maintenance else None
         }
 
-class Alert:
+class Alert(CachedSerialization):
+    __slots__ = (
+        'alert_id', 'machine_id', 'alert_type', 'severity', 'message', 'details',
+        'timestamp', 'acknowledged', 'resolved', 'occurrences', 'last_seen'
+    )
+    
     def __init__(self, machine_id, alert_type, severity, message, details=None):
-        self.alert_id = f"{machine_id}_{int(datetime.now().timestamp())}"
+        self.alert_id = f"{machine_id}_{_next_alert_suffix()}"
         self.machine_id = machine_id
         self.alert_type = alert_type
         self.severity = severity  # 'info', 'warning', 'critical', 'danger'
@@ -45,8 +131,10 @@ class Alert:
         self.timestamp = datetime.now()
         self.acknowledged = False
         self.resolved = False
+        self.occurrences = 1  # times the condition re-entered while this alert was open
+        self.last_seen = self.timestamp
     
-    def to_dict(self):
+    def _serialize(self):
         return {
             'alert_id': self.alert_id,
             'machine_id': self.machine_id,
@@ -56,10 +144,17 @@ class Alert:
             'details': self.details,
             'timestamp': self.timestamp.isoformat(),
             'acknowledged': self.acknowledged,
-            'resolved': self.resolved
+            'resolved': self.resolved,
+            'occurrences': self.occurrences,
+            'last_seen': self.last_seen.isoformat()
         }
 
 class MaintenanceLog:
+    __slots__ = (
+        'log_id', 'machine_id', 'activity_type', 'description', 'technician',
+        'timestamp', 'duration', 'parts_used', 'cost'
+    )
+    
     def __init__(self, machine_id, activity_type, description, technician=None):
         self.log_id = f"{machine_id}_{int(datetime.now().timestamp())}"
         self.machine_id = machine_id
@@ -0,0 +1,143 @@
+import os
+import struct
+import threading
+from datetime import datetime
+
+import numpy as np
+
+MAGIC = b'AURAREC1'
+FRAME_HEADER = struct.Struct('<BI')  # kind, payload bytes
+MACHINE_FRAME = 1  # payload: u32 code, then the machine id in UTF-8
+TICK_FRAME = 2  # payload: f64 tick time, then one READING_DTYPE row per machine
+TICK_TIME = struct.Struct('<d')
+MACHINE_CODE = struct.Struct('<I')
+
+SENSORS = ('temperature', 'vibration', 'rotation_speed', 'load')
+READING_DTYPE = np.dtype(
+    [('machine', '<u4'), ('timestamp', '<f8')] + [(name, '<f8') for name in SENSORS] + [('state', 'i1')])
+
+class ReadingRecorder:
+    """Appends the raw reading stream of each tick to a compact binary log
+
+    The log starts with MAGIC and is a sequence of frames. A machine frame
+    assigns a numeric code to a machine id the first time it is seen (per
+    recorder, so a log appended to by a restarted server simply redefines
+    its codes); a tick frame holds the tick time and one fixed-size row
+    per machine: code, reading timestamp, the four sensors as float64 (so
+    a replay scores exactly what was scored live) and the simulator
+    state. Each tick is flushed, and recording stops once the file
+    reaches max_bytes.
+    """
+
+    def __init__(self, path, max_bytes=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        self._codes = {}
+        self._lock = threading.Lock()
+        self.ticks = 0
+        self.readings = 0
+        self.stopped = False
+
+    def _frame(self, kind, payload):
+        self._file.write(FRAME_HEADER.pack(kind, len(payload)))
+        self._file.write(payload)
+
+    def record(self, machine_ids, readings, now):
+        """Append one tick: parallel lists of machine ids and reading dicts"""
+        with self._lock:
+            if self.stopped or self._file.closed:
+                return
+            rows = np.empty(len(readings), dtype=READING_DTYPE)
+            for machine_id in machine_ids:
+                if machine_id not in self._codes:
+                    code = self._codes[machine_id] = len(self._codes)
+                    self._frame(MACHINE_FRAME, MACHINE_CODE.pack(code) + machine_id.encode('utf-8'))
+            rows['machine'] = [self._codes[machine_id] for machine_id in machine_ids]
+            rows['timestamp'] = [reading['timestamp'].timestamp() for reading in readings]
+            for name in SENSORS:
+                rows[name] = [reading[name] for reading in readings]
+            rows['state'] = [reading.get('state', -1) for reading in readings]
+            self._frame(TICK_FRAME, TICK_TIME.pack(now) + rows.tobytes())
+            self._file.flush()
+            self.ticks += 1
+            self.readings += len(readings)
+
+            if self.max_bytes and self._file.tell() >= self.max_bytes:
+                self.stopped = True
+                print(f"Reading log {self.path} reached {self.max_bytes / 1e6:.0f} MB; recording stopped")
+
+    def status(self):
+        return {
+            'path': self.path,
+            'ticks': self.ticks,
+            'readings': self.readings,
+            'bytes': os.path.getsize(self.path),
+            'stopped': self.stopped
+        }
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+def read_ticks(path):
+    """Yield (tick_time, machine_ids, rows) per recorded tick; rows is a READING_DTYPE array
+
+    A frame cut short (the server was killed mid-write) ends the log.
+    """
+    machines = {}
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not an Aura reading log")
+        while True:
+            header = f.read(FRAME_HEADER.size)
+            if len(header) < FRAME_HEADER.size:
+                return
+            kind, size = FRAME_HEADER.unpack(header)
+            payload = f.read(size)
+            if len(payload) < size:
+                return
+            if kind == MACHINE_FRAME:
+                machines[MACHINE_CODE.unpack_from(payload)[0]] = payload[MACHINE_CODE.size:].decode('utf-8')
+            elif kind == TICK_FRAME:
+                rows = np.frombuffer(payload, dtype=READING_DTYPE, offset=TICK_TIME.size)
+                yield TICK_TIME.unpack_from(payload)[0], [machines[code] for code in rows['machine'].tolist()], rows
+
+class ReplaySource:
+    """Stands in for DataSimulator, serving recorded ticks to AuraAPI.tick()
+
+    load() stages a recorded tick; the following get_all_current_readings()
+    call decodes it into the reading dicts the simulator would have
+    returned, so decoding is timed as the tick's 'simulate' stage.
+    """
+
+    def __init__(self, machines):
+        self.machines = machines
+        self.machine_states = {machine_id: 0 for machine_id in machines}
+        self._machine_ids = []
+        self._rows = None
+
+    def load(self, machine_ids, rows):
+        self._machine_ids = machine_ids
+        self._rows = rows
+
+    def get_all_current_readings(self, machine_ids=None):
+        wanted = None if machine_ids is None else set(machine_ids)
+        columns = {name: self._rows[name].tolist() for name in READING_DTYPE.names}
+        readings = {}
+        for i, machine_id in enumerate(self._machine_ids):
+            if wanted is not None and machine_id not in wanted:
+                continue
+            reading = {name: columns[name][i] for name in SENSORS}
+            reading['timestamp'] = datetime.fromtimestamp(columns['timestamp'][i])
+            reading['machine_info'] = self.machines.get(machine_id)
+            reading['state'] = columns['state'][i]
+            if columns['state'][i] >= 0:
+                self.machine_states[machine_id] = columns['state'][i]
+            readings[machine_id] = reading
+        return readings
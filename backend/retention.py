@@ -0,0 +1,215 @@
+import ctypes
+import gc
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+from config import Config
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+try:
+    # glibc keeps freed small allocations in its arenas; malloc_trim hands them back
+    _malloc_trim = ctypes.CDLL('libc.so.6').malloc_trim
+except (OSError, AttributeError):
+    _malloc_trim = None
+
+def current_rss():
+    """Resident set size of this process in bytes"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        pass
+    if resource is not None:
+        # Peak rather than current RSS off Linux; kilobytes on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    return 0
+
+class RetentionManager:
+    """Keeps the in-process history bounded by age, row count and bytes
+
+    Raw readings older than READING_RAW_RETENTION roll into the first
+    downsampled tier, each tier rolls into the next once its rows are
+    older than the tier's max_age, and the last tier simply drops them.
+    The alert archive and the maintenance log are trimmed by age and
+    count, resolved alerts leave the live list after a grace period, and
+    if the readings still exceed their byte budget the oldest rows of the
+    largest store go. Finally the process RSS is checked against
+    MEMORY_CEILING_MB: above it, half of every history store is dropped
+    and freed memory is handed back to the OS. That only happens while
+    history is a meaningful share (MEMORY_PRESSURE_MIN_SHARE) of the
+    excess, since RSS also counts the model, libraries and allocator
+    slack; and after a trim that did not lower RSS, not again until
+    history has grown past its trimmed size.
+    """
+
+    def __init__(self, readings, tiers, alert_history, maintenance_logs, archive_resolved_alerts=None):
+        self.readings = readings
+        self.tiers = tiers
+        self.alert_history = alert_history
+        self.maintenance_logs = maintenance_logs
+        self.archive_resolved_alerts = archive_resolved_alerts
+        self.ceiling_bytes = Config.MEMORY_CEILING_MB * 1024 * 1024
+        self.runs = 0
+        self.pressure_events = 0
+        self.pressure_skipped = None  # why the last over-ceiling pass did not trim
+        self._ineffective_trim_bytes = None  # history size after a trim that did not lower RSS
+        self.evicted = {'readings': 0, 'alert_archive': 0, 'live_alerts': 0, 'maintenance_logs': 0}
+        self.last_run = None
+        self.last_run_seconds = 0.0
+        self.last_rss = current_rss()
+
+    def reading_stores(self):
+        return [self.readings] + list(self.tiers)
+
+    def reading_bytes(self):
+        return sum(store.nbytes() for store in self.reading_stores())
+
+    def history_bytes(self):
+        return self.reading_bytes() + self.alert_history.nbytes()
+
+    def _compact_readings(self, now):
+        rolled = 0
+        source, keep_for = self.readings, Config.READING_RAW_RETENTION
+        for tier in self.tiers:
+            rolled += tier.absorb(source, tier.cutoff(now - keep_for))
+            source, keep_for = tier, tier.max_age
+        self.evicted['readings'] += source.drop_before(now - keep_for)
+        return rolled
+
+    def _enforce_reading_budget(self):
+        for _ in range(8):
+            if self.reading_bytes() <= Config.READING_HISTORY_MAX_BYTES:
+                return
+            largest = max(self.reading_stores(), key=lambda store: store.nbytes())
+            if not len(largest):
+                return
+            self.evicted['readings'] += largest.drop_oldest(max(1, len(largest) // 4))
+
+    def _relieve_pressure(self):
+        """Drop the older half of every history store and return freed memory to the OS"""
+        self.pressure_events += 1
+        for store in self.reading_stores():
+            self.evicted['readings'] += store.drop_oldest(len(store) // 2)
+        self.evicted['alert_archive'] += self.alert_history.drop_oldest(len(self.alert_history) // 2)
+        gc.collect()
+        if _malloc_trim is not None:
+            _malloc_trim(0)
+
+    def _check_pressure(self):
+        """Trim history for an RSS above the ceiling, if trimming history can help"""
+        history = self.history_bytes()
+        excess = self.last_rss - self.ceiling_bytes
+        if history < excess * Config.MEMORY_PRESSURE_MIN_SHARE:
+            skipped = 'history_small'
+        elif self._ineffective_trim_bytes is not None and history <= self._ineffective_trim_bytes:
+            skipped = 'last_trim_ineffective'
+        else:
+            skipped = None
+
+        if skipped is not None:
+            if skipped != self.pressure_skipped:
+                print(f"Memory above ceiling ({self.last_rss / 1e6:.0f} MB RSS), history "
+                      f"{history / 1e6:.1f} MB; not trimming ({skipped})")
+            self.pressure_skipped = skipped
+            return
+
+        before = self.last_rss
+        self._relieve_pressure()
+        self.last_rss = current_rss()
+        self.pressure_skipped = None
+        self._ineffective_trim_bytes = self.history_bytes() if self.last_rss >= before else None
+        print(f"Memory above ceiling: dropped older history, RSS now {self.last_rss / 1e6:.0f} MB")
+
+    def run(self, now=None):
+        """One retention pass; called periodically from the background worker"""
+        start = time.perf_counter()
+        now = time.time() if now is None else now
+
+        rolled = self._compact_readings(now)
+        self._enforce_reading_budget()
+
+        self.evicted['alert_archive'] += self.alert_history.drop_before(now - Config.ALERT_ARCHIVE_MAX_AGE)
+        excess = len(self.alert_history) - Config.ALERT_ARCHIVE_MAX_ROWS
+        if excess > 0:
+            self.evicted['alert_archive'] += self.alert_history.drop_oldest(excess)
+        if self.archive_resolved_alerts is not None:
+            self.evicted['live_alerts'] += self.archive_resolved_alerts(now - Config.RESOLVED_ALERT_LIVE_SECONDS)
+        self.evicted['maintenance_logs'] += self.maintenance_logs.prune(
+            before=datetime.fromtimestamp(now - Config.MAINTENANCE_LOG_MAX_AGE),
+            max_rows=Config.MAINTENANCE_LOG_MAX_ROWS)
+
+        self.last_rss = current_rss()
+        if self.ceiling_bytes and self.last_rss > self.ceiling_bytes:
+            self._check_pressure()
+        else:
+            self.pressure_skipped = None
+            self._ineffective_trim_bytes = None
+
+        self.runs += 1
+        self.last_run = datetime.now()
+        self.last_run_seconds = time.perf_counter() - start
+        return rolled
+
+    def series(self, machine_id, since, bucket_seconds):
+        """Mean readings of a machine per bucket since a timestamp, across raw rows and tiers"""
+        counts, sums = [], {name: [] for name in self.readings.SENSORS}
+        buckets = []
+        for store in self.reading_stores():
+            with store._lock:
+                code = store.strings.lookup(machine_id)
+                if code is None:
+                    continue
+                size = store.size
+                rows = np.flatnonzero(
+                    (store.columns['machine'][:size] == code) & (store.columns['timestamp'][:size] >= since))
+                store_counts, stats = store._bucket_inputs(rows)
+                buckets.append(np.floor(store.columns['timestamp'][rows] / bucket_seconds) * bucket_seconds)
+            counts.append(store_counts)
+            for name, (store_sums, _, _) in stats.items():
+                sums[name].append(store_sums)
+
+        if not buckets:
+            return []
+        keys, inverse = np.unique(np.concatenate(buckets), return_inverse=True)
+        totals = np.bincount(inverse, weights=np.concatenate(counts), minlength=len(keys))
+        means = {
+            name: np.bincount(inverse, weights=np.concatenate(parts), minlength=len(keys)) / totals
+            for name, parts in sums.items()
+        }
+        return [
+            dict({'timestamp': datetime.fromtimestamp(key).isoformat()},
+                 **{name: round(float(means[name][i]), 3) for name in means})
+            for i, key in enumerate(keys)
+        ]
+
+    def status(self):
+        return {
+            'rss_bytes': self.last_rss,
+            'ceiling_bytes': self.ceiling_bytes or None,
+            'over_ceiling': bool(self.ceiling_bytes) and self.last_rss > self.ceiling_bytes,
+            'pressure_events': self.pressure_events,
+            'pressure_skipped': self.pressure_skipped,
+            'history_bytes': self.history_bytes(),
+            'reading_history': {
+                'raw': {'rows': len(self.readings), 'bytes': self.readings.nbytes()},
+                'tiers': [
+                    {'bucket_seconds': tier.bucket_seconds, 'rows': len(tier), 'bytes': tier.nbytes()}
+                    for tier in self.tiers
+                ],
+                'budget_bytes': Config.READING_HISTORY_MAX_BYTES
+            },
+            'alert_archive_bytes': self.alert_history.nbytes(),
+            'evicted': dict(self.evicted),
+            'runs': self.runs,
+            'last_run': self.last_run.isoformat() if self.last_run else None,
+            'last_run_seconds': round(self.last_run_seconds, 4)
+        }
@@ -0,0 +1,208 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+from config import Config
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+OUTCOME_ACTIVITIES = ('repair', 'replacement')
+
+class InsufficientTrainingData(ValueError):
+    pass
+
+def _limit_resources(nice, memory_mb, cpus):
+    """Worker initializer: lowest CPU priority, capped address space, pinned to `cpus` cores"""
+    if hasattr(os, 'nice'):
+        os.nice(nice)
+    if resource is not None and memory_mb:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    if cpus and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, sorted(os.sched_getaffinity(0))[-cpus:])
+
+def label_readings(readings, outcomes, horizon, now):
+    """(labeled mask, labels) for a ReadingHistory export
+
+    outcomes maps machine_id to the sorted timestamps of its repairs and
+    replacements. A reading followed by one within horizon seconds is a
+    failure example; one whose horizon passed without an outcome is a
+    healthy example; readings still inside their horizon are left out.
+    """
+    timestamps = readings['columns']['timestamp']
+    machines = readings['columns']['machine']
+    labels = np.zeros(readings['size'], dtype=np.int8)
+
+    for code, machine_id in enumerate(readings['strings']):
+        times = np.asarray(outcomes.get(machine_id, ()), dtype=np.float64)
+        if not len(times):
+            continue
+        rows = np.flatnonzero(machines == code)
+        following = np.searchsorted(times, timestamps[rows], side='left')
+        has_outcome = following < len(times)
+        next_outcome = times[np.minimum(following, len(times) - 1)]
+        labels[rows] = has_outcome & (next_outcome - timestamps[rows] <= horizon)
+
+    labeled = (labels == 1) | (timestamps + horizon <= now)
+    return labeled, labels
+
+def retrain(job):
+    """Warm-start the base forest on labeled live readings and publish the result
+
+    Runs in the retraining worker process. New trees are fitted on the
+    live window and appended to the base model's trees; beyond max_trees
+    the oldest trees are dropped, so the forest tracks recent behaviour
+    without refitting from scratch. The base scaler is kept so old and
+    new trees see the same feature space.
+    """
+    import pandas as pd
+    from sklearn.model_selection import train_test_split
+    from sklearn.utils.class_weight import compute_sample_weight
+    from model_registry import ModelRegistry
+
+    start = time.perf_counter()
+    labeled, labels = label_readings(job['readings'], job['outcomes'], job['horizon'], job['now'])
+    y = labels[labeled]
+    positives = int(y.sum())
+    if positives < job['min_positives'] or positives == len(y):
+        raise InsufficientTrainingData(
+            f"{positives} failure and {len(y) - positives} healthy examples among labeled readings")
+
+    registry = ModelRegistry(job['registry_dir'])
+    model = registry.load(job['base_version'])
+    columns = job['readings']['columns']
+    df = pd.DataFrame({name: columns[name][labeled].astype(np.float64) for name in model.feature_columns})
+    X = model.scaler.transform(model.prepare_features(df))
+    # Hold back a stratified slice of the window for the evaluation report
+    X, X_holdout, y, y_holdout = train_test_split(
+        X, y, test_size=job['holdout'], random_state=42, stratify=y)
+
+    forest = model.model
+    base_trees = len(forest.estimators_)
+    # Balance the new window explicitly; the 'balanced' preset is not meant for warm starts
+    forest.set_params(warm_start=True, n_estimators=base_trees + job['new_trees'], n_jobs=1, class_weight=None)
+    forest.fit(X, y, sample_weight=compute_sample_weight('balanced', y))
+    if len(forest.estimators_) > job['max_trees']:
+        forest.estimators_ = forest.estimators_[-job['max_trees']:]
+    forest.set_params(warm_start=False, n_estimators=len(forest.estimators_))
+    # Cross-validation would refit from scratch and lose the warm-started trees; holdout only
+    model.evaluation = model.evaluate(X_holdout, y_holdout, n_jobs=job['n_jobs'])
+
+    metrics = {
+        'base_version': job['base_version'],
+        'training_rows': int(len(y)),
+        'holdout_rows': int(len(y_holdout)),
+        'failure_examples': positives,
+        'trees_added': job['new_trees'],
+        'trees': len(forest.estimators_),
+        'training_seconds': round(time.perf_counter() - start, 2)
+    }
+    return registry.publish(model, 'retrain', metrics), metrics
+
+class RetrainingPipeline:
+    """Retrains from the live reading history in a separate low-priority process
+
+    The API process only snapshots the reading history and the
+    maintenance outcomes; labeling, feature preparation and fitting run in
+    a fresh worker process (niced, memory-capped and pinned to
+    RETRAIN_CPUS cores) that publishes the new version to the registry,
+    so retraining never competes with the inference tick for a core.
+    """
+
+    def __init__(self, registry, readings, maintenance_logs, on_published=None):
+        self.registry = registry
+        self.readings = readings
+        self.maintenance_logs = maintenance_logs
+        self.on_published = on_published
+        self._lock = threading.Lock()
+        self._future = None
+        self.last_started = None
+        self.last_result = None
+        self.last_error = None
+
+    def running(self):
+        return self._future is not None and not self._future.done()
+
+    def _outcomes(self, since):
+        outcomes = {}
+        for log in self.maintenance_logs.rows(since=datetime.fromtimestamp(since)):
+            if log['activity_type'] in OUTCOME_ACTIVITIES:
+                outcomes.setdefault(log['machine_id'], []).append(datetime.fromisoformat(log['timestamp']).timestamp())
+        return {machine_id: sorted(times) for machine_id, times in outcomes.items()}
+
+    def start(self, base_version):
+        """Launch a retraining job; raises InsufficientTrainingData or RuntimeError if one is running"""
+        with self._lock:
+            if self.running():
+                raise RuntimeError("Retraining is already running")
+            if len(self.readings) < Config.RETRAIN_MIN_READINGS:
+                raise InsufficientTrainingData(
+                    f"{len(self.readings)} readings captured, {Config.RETRAIN_MIN_READINGS} needed")
+            readings = self.readings.export_state()
+            outcomes = self._outcomes(float(readings['columns']['timestamp'].min()))
+            outcome_count = sum(len(times) for times in outcomes.values())
+            if outcome_count < Config.RETRAIN_MIN_OUTCOMES:
+                raise InsufficientTrainingData(
+                    f"{outcome_count} repair/replacement logs in the reading window, {Config.RETRAIN_MIN_OUTCOMES} needed")
+
+            job = {
+                'registry_dir': self.registry.root,
+                'base_version': base_version,
+                'readings': readings,
+                'outcomes': outcomes,
+                'horizon': Config.RETRAIN_LABEL_HORIZON,
+                'now': time.time(),
+                'min_positives': Config.RETRAIN_MIN_OUTCOMES,
+                'new_trees': Config.RETRAIN_NEW_TREES,
+                'max_trees': Config.RETRAIN_MAX_TREES,
+                'holdout': Config.RETRAIN_HOLDOUT,
+                'n_jobs': Config.RETRAIN_CPUS
+            }
+            executor = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context(Config.RETRAIN_START_METHOD),
+                initializer=_limit_resources,
+                initargs=(Config.RETRAIN_NICE, Config.RETRAIN_MEMORY_LIMIT_MB, Config.RETRAIN_CPUS)
+            )
+            self._future = executor.submit(retrain, job)
+            self.last_started = datetime.now()
+            # One process per job: its memory is returned as soon as the job ends
+            executor.shutdown(wait=False)
+            self._future.add_done_callback(self._finished)
+            print(f"Retraining from {readings['size']} readings and {outcome_count} maintenance outcomes...")
+
+    def maybe_start(self, base_version):
+        """Periodic trigger: start a job unless one is running or there is not enough data"""
+        try:
+            self.start(base_version)
+            return True
+        except (InsufficientTrainingData, RuntimeError):
+            return False
+
+    def _finished(self, future):
+        try:
+            version, metrics = future.result()
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            print(f"Retraining failed: {self.last_error}")
+            return
+        self.last_error = None
+        self.last_result = {'version': version, 'finished_at': datetime.now().isoformat(), 'metrics': metrics}
+        if self.on_published is not None:
+            self.on_published(version)
+
+    def status(self):
+        return {
+            'running': self.running(),
+            'last_started': self.last_started.isoformat() if self.last_started else None,
+            'last_result': self.last_result,
+            'last_error': self.last_error
+        }
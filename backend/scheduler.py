@@ -0,0 +1,120 @@
+import heapq
+import threading
+import time
+
+class FixedRateScheduler:
+    """Runs tick(deadline) on a fixed-rate grid of deadlines
+
+    Deadlines are start + n * interval, so processing time does not push
+    later ticks back. A tick that finishes past the next deadline is an
+    overrun: the 'skip' policy drops the missed deadlines and resumes on
+    the grid, 'catch_up' runs up to max_catch_up missed ticks back-to-back
+    and skips the rest. Failing ticks back off exponentially (capped at
+    error_backoff_max) instead of sleeping a fixed time.
+    """
+
+    POLICIES = ('skip', 'catch_up')
+
+    def __init__(self, tick, interval, policy='skip', max_catch_up=3, error_backoff_max=30.0,
+                 on_lag=None, on_overrun=None, on_error=None):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown overrun policy: {policy}")
+        self.tick = tick
+        self.interval = interval
+        self.policy = policy
+        self.max_catch_up = max_catch_up
+        self.error_backoff_max = error_backoff_max
+        self.on_lag = on_lag
+        self.on_overrun = on_overrun
+        self.on_error = on_error
+
+        self.ticks = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.errors = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def run(self):
+        next_deadline = time.monotonic()
+        backoff = 0.0
+        while not self._stop.is_set():
+            wait = next_deadline - time.monotonic()
+            if wait > 0 and self._stop.wait(wait):
+                break
+
+            if self.on_lag is not None:
+                self.on_lag(max(0.0, time.monotonic() - next_deadline))
+            try:
+                self.tick(next_deadline)
+            except Exception as e:
+                self.errors += 1
+                if self.on_error is not None:
+                    self.on_error(e)
+                backoff = min(self.error_backoff_max, backoff * 2 if backoff else self.interval)
+                next_deadline = time.monotonic() + backoff
+                continue
+            backoff = 0.0
+            self.ticks += 1
+
+            next_deadline += self.interval
+            behind = time.monotonic() - next_deadline
+            if behind > 0:
+                missed = int(behind // self.interval) + 1
+                allowed = self.max_catch_up if self.policy == 'catch_up' else 0
+                dropped = max(0, missed - allowed)
+                next_deadline += dropped * self.interval
+                self.overruns += 1
+                self.skipped += dropped
+                if self.on_overrun is not None:
+                    self.on_overrun(dropped)
+
+class MachineCadence:
+    """Per-machine update deadlines chosen by alert level
+
+    Keeps a min-heap of (due_time, machine_id) so each tick only touches
+    the machines that are due. Superseded heap entries are dropped lazily.
+    """
+
+    def __init__(self, cadences, default):
+        self.cadences = dict(cadences)
+        self.default = default
+        self._heap = []
+        self._due = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._due)
+
+    def add(self, machine_id, due_time):
+        with self._lock:
+            self._due[machine_id] = due_time
+            heapq.heappush(self._heap, (due_time, machine_id))
+
+    def remove(self, machine_id):
+        with self._lock:
+            self._due.pop(machine_id, None)
+
+    def reschedule(self, machine_id, alert_level, now):
+        """Schedule the next update one cadence period after now"""
+        self.add(machine_id, now + self.cadences.get(alert_level, self.default))
+
+    def due(self, now):
+        """Pop and return machine ids due at or before now"""
+        machine_ids = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                due_time, machine_id = heapq.heappop(self._heap)
+                if self._due.get(machine_id) == due_time:
+                    machine_ids.append(machine_id)
+        return machine_ids
@@ -0,0 +1,225 @@
+import os
+import pickle
+import struct
+import threading
+import time
+
+from config import Config
+
+# Record header: payload length, op name length
+_HEADER = struct.Struct('<IB')
+
+def object_state(obj):
+    """Compact tuple of a slotted model's fields (in __slots__ order)"""
+    return tuple(getattr(obj, name, None) for name in type(obj).__slots__)
+
+_slot_setters = {}
+
+def restore_object(cls, state):
+    """Rebuild a slotted model from object_state() output without running __init__"""
+    setters = _slot_setters.get(cls)
+    if setters is None:
+        setters = [getattr(cls, name).__set__ for name in cls.__slots__]
+        _slot_setters[cls] = setters
+    
+    obj = cls.__new__(cls)
+    # Set slots directly, bypassing change tracking: a freshly restored
+    # object has no serialization cache yet
+    for setter, value in zip(setters, state):
+        setter(obj, value)
+    return obj
+
+class WALRecord:
+    """A WAL entry whose payload is unpickled only when accessed"""
+    __slots__ = ('op', '_raw')
+
+    def __init__(self, op, raw):
+        self.op = op
+        self._raw = raw
+
+    @property
+    def payload(self):
+        return pickle.loads(self._raw)
+
+class Snapshot:
+    """Snapshot sections, each unpickled on first access"""
+
+    def __init__(self, wal_seq, sections):
+        self.wal_seq = wal_seq
+        self._sections = sections
+        self._decoded = {}
+
+    def __getitem__(self, name):
+        if name not in self._decoded:
+            self._decoded[name] = pickle.loads(self._sections[name])
+        return self._decoded[name]
+
+class StateStore:
+    """Snapshot + write-ahead log persistence for machine and alert state
+
+    Every state change is appended to the current WAL segment as an op name
+    plus a length-prefixed pickle and fsynced once per tick. The op is kept
+    outside the pickle so restore can skip decoding superseded records. Periodically the
+    caller hands over a captured copy of the full state; the store rotates
+    to a new WAL segment and writes the snapshot from a separate thread, so
+    the background worker never waits on serialization or disk. Segments
+    covered by a completed snapshot are deleted.
+    """
+
+    SNAPSHOT_FILE = 'state.snapshot'
+    SEGMENT_PREFIX = 'state-'
+    SEGMENT_SUFFIX = '.wal'
+
+    def __init__(self, directory=None, snapshot_interval=None):
+        self.directory = directory or Config.STATE_DIR
+        self.snapshot_interval = snapshot_interval or Config.STATE_SNAPSHOT_INTERVAL
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._wal = None
+        self._wal_seq = 0
+        self._snapshot_thread = None
+        self.last_snapshot_time = time.time()
+        self.last_snapshot_seconds = 0.0
+        self.restore_seconds = 0.0
+
+    def _segment_path(self, seq):
+        return os.path.join(self.directory, f"{self.SEGMENT_PREFIX}{seq:010d}{self.SEGMENT_SUFFIX}")
+
+    def _segment_seqs(self):
+        seqs = []
+        for name in os.listdir(self.directory):
+            if name.startswith(self.SEGMENT_PREFIX) and name.endswith(self.SEGMENT_SUFFIX):
+                seqs.append(int(name[len(self.SEGMENT_PREFIX):-len(self.SEGMENT_SUFFIX)]))
+        return sorted(seqs)
+
+    def restore(self):
+        """Load the latest snapshot and the WAL records written after it
+
+        Returns (Snapshot or None, [WALRecord, ...]) in write order and
+        opens a fresh WAL segment for new writes.
+        """
+        start = time.perf_counter()
+
+        snapshot = None
+        snapshot_path = os.path.join(self.directory, self.SNAPSHOT_FILE)
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, 'rb') as f:
+                wal_seq, sections = pickle.load(f)
+            snapshot = Snapshot(wal_seq, sections)
+        base_seq = snapshot.wal_seq if snapshot else 0
+
+        records = []
+        seqs = self._segment_seqs()
+        for seq in seqs:
+            if seq <= base_seq:
+                # Already folded into the snapshot (deletion was interrupted)
+                os.remove(self._segment_path(seq))
+                continue
+            records.extend(self._read_segment(self._segment_path(seq)))
+
+        with self._lock:
+            self._wal_seq = max(seqs + [base_seq]) + 1
+            self._wal = open(self._segment_path(self._wal_seq), 'ab')
+
+        self.restore_seconds = time.perf_counter() - start
+        return snapshot, records
+
+    @staticmethod
+    def _read_segment(path):
+        """Read records from a WAL segment, stopping at a torn trailing write"""
+        records = []
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        offset = 0
+        while offset + _HEADER.size <= len(data):
+            length, op_length = _HEADER.unpack_from(data, offset)
+            offset += _HEADER.size
+            if offset + op_length + length > len(data):
+                break
+            op = data[offset:offset + op_length].decode('ascii')
+            offset += op_length
+            records.append(WALRecord(op, data[offset:offset + length]))
+            offset += length
+        return records
+
+    def log(self, op, payload):
+        """Append a state change to the WAL (durable after the next sync())"""
+        op_bytes = op.encode('ascii')
+        record = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            if self._wal is not None:
+                self._wal.write(_HEADER.pack(len(record), len(op_bytes)))
+                self._wal.write(op_bytes)
+                self._wal.write(record)
+
+    def sync(self):
+        """Flush and fsync the current WAL segment"""
+        with self._lock:
+            if self._wal is not None:
+                self._wal.flush()
+                os.fsync(self._wal.fileno())
+
+    def snapshot_due(self):
+        """True when the snapshot interval has elapsed and no snapshot is being written"""
+        if self._snapshot_thread is not None and self._snapshot_thread.is_alive():
+            return False
+        return time.time() - self.last_snapshot_time >= self.snapshot_interval
+
+    def write_snapshot(self, state):
+        """Persist a captured state dict in the background
+
+        The WAL is rotated first, so the snapshot covers every segment up to
+        the one just closed and replay after restart starts at the new one.
+        """
+        with self._lock:
+            if self._wal is not None:
+                self._wal.flush()
+                os.fsync(self._wal.fileno())
+                self._wal.close()
+            covered_seq = self._wal_seq
+            self._wal_seq += 1
+            self._wal = open(self._segment_path(self._wal_seq), 'ab')
+
+        self.last_snapshot_time = time.time()
+        self._snapshot_thread = threading.Thread(
+            target=self._write_snapshot_file, args=(state, covered_seq),
+            name='state-snapshot', daemon=True
+        )
+        self._snapshot_thread.start()
+
+    def _write_snapshot_file(self, state, covered_seq):
+        start = time.perf_counter()
+        path = os.path.join(self.directory, self.SNAPSHOT_FILE)
+        tmp_path = path + '.tmp'
+        try:
+            # Sections are pickled separately so restore can skip the ones it
+            # does not need (e.g. machines fully covered by newer WAL ticks)
+            sections = {
+                name: pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+                for name, value in state.items()
+            }
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((covered_seq, sections), f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+
+            for seq in self._segment_seqs():
+                if seq <= covered_seq:
+                    os.remove(self._segment_path(seq))
+            self.last_snapshot_seconds = time.perf_counter() - start
+        except Exception as e:
+            print(f"Error writing state snapshot: {e}")
+
+    def close(self):
+        """Wait for a pending snapshot and close the WAL"""
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+        with self._lock:
+            if self._wal is not None:
+                self._wal.flush()
+                os.fsync(self._wal.fileno())
+                self._wal.close()
+                self._wal = None
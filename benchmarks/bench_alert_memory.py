@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for alert history representations.
+
+Stores the same alerts three ways and reports traced memory per alert:
+  - dict-backed objects (the previous Alert class layout, same fields)
+  - slotted Alert objects (backend/models.py)
+  - columnar AlertHistory (backend/history_store.py)
+
+Most of an alert object's memory is its details payload (readings, issues,
+recommendation), which both object layouts hold as the same dicts and
+lists; CPython 3.11+ also stores instance attributes of plain classes
+compactly. So slotted and dict-backed objects come out within a few
+percent of each other (the slotted Alert also carries its serialization
+cache slots). Only the columnar archive, which interns repeated strings
+and flattens the payload into typed columns, is substantially smaller.
+
+Usage: python benchmarks/bench_alert_memory.py [--count 1000000]
+"""
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import common  # noqa: F401  (sets up project paths)
+
+from history_store import AlertHistory
+from models import Alert
+
+SEVERITIES = ['warning', 'critical', 'danger']
+
+class DictAlert:
+    """Alert with the previous __dict__-based layout"""
+
+    def __init__(self, machine_id, alert_type, severity, message, details=None):
+        self.alert_id = f"{machine_id}_{int(datetime.now().timestamp())}"
+        self.machine_id = machine_id
+        self.alert_type = alert_type
+        self.severity = severity
+        self.message = message
+        self.details = details or {}
+        self.timestamp = datetime.now()
+        self.acknowledged = False
+        self.resolved = False
+        self.occurrences = 1
+        self.last_seen = self.timestamp
+
+def make_alert(cls, i, base_time):
+    """Build a realistic alert with its own readings and details dicts"""
+    machine_id = f"Machine_{i % 500:03d}"
+    readings = {
+        'temperature': round(random.uniform(85, 105), 1),
+        'vibration': round(random.uniform(0.8, 1.5), 2),
+        'rotation_speed': round(random.uniform(1400, 1650), 0),
+        'load': round(random.uniform(80, 100), 1),
+        'timestamp': (base_time + timedelta(seconds=i)).isoformat()
+    }
+    alert = cls(
+        machine_id=machine_id,
+        alert_type='health_degradation',
+        severity=SEVERITIES[i % len(SEVERITIES)],
+        message=f"WARNING: {machine_id} showing signs of deterioration",
+        details={
+            'health_score': round(random.uniform(30, 70), 1),
+            'failure_probability': round(random.uniform(30, 90), 1),
+            'sensor_readings': readings,
+            'potential_issues': ['High temperature detected'],
+            'recommendation': 'Schedule maintenance within 24 hours'
+        }
+    )
+    alert.timestamp = alert.last_seen = base_time + timedelta(seconds=i)
+    return alert
+
+def measure(name, build, count):
+    """Traced memory held by the structure returned from build()"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    store = build(count)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<22} {current / 1024 / 1024:>10.1f} MiB {current / count:>10.1f} B/alert {elapsed:>8.1f}s")
+    del store
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    random.seed(42)
+    base_time = datetime.now() - timedelta(days=30)
+
+    def build_dict_objects(count):
+        return [make_alert(DictAlert, i, base_time) for i in range(count)]
+
+    def build_slotted_objects(count):
+        return [make_alert(Alert, i, base_time) for i in range(count)]
+
+    def build_columnar(count):
+        history = AlertHistory()
+        for i in range(count):
+            history.append(make_alert(Alert, i, base_time))
+        return history
+
+    print(f"{args.count} alerts")
+    print(f"{'representation':<22} {'memory':>14} {'per alert':>16} {'build':>9}")
+    measure('dict objects', build_dict_objects, args.count)
+    measure('slotted objects', build_slotted_objects, args.count)
+    measure('columnar history', build_columnar, args.count)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Load-test comparison of the threaded Flask server and the async (ASGI) serving mode.
+
+For each concurrency level, N clients loop over /api/status and /api/alerts
+while a number of /api/stream connections are held open. The script reports
+p50/p99 latency per level and the highest concurrency each mode sustains
+while staying under the p99 target.
+
+Usage: python benchmarks/bench_async_serving.py [--p99-target-ms 250] [--streams 32]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from common import free_port, http_request, open_stream, percentile, start_server, stop_server
+
+PATHS = ['/api/status', '/api/alerts?limit=20']
+
+async def run_level(port, concurrency, duration, streams):
+    """Drive one concurrency level and collect latencies"""
+    stream_handles = []
+    for _ in range(streams):
+        try:
+            stream_handles.append(await open_stream('127.0.0.1', port))
+        except OSError:
+            break
+
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def client(client_id):
+        nonlocal errors
+        i = client_id
+        while time.perf_counter() < deadline:
+            path = PATHS[i % len(PATHS)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                status, _ = await http_request('127.0.0.1', port, 'GET', path)
+                if status != 200:
+                    errors += 1
+            except (OSError, asyncio.TimeoutError):
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(client(i) for i in range(concurrency)))
+
+    for writer, task in stream_handles:
+        writer.close()
+        task.cancel()
+
+    return {
+        'concurrency': concurrency,
+        'streams': len(stream_handles),
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput_rps': round(len(latencies) / duration, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 1),
+    }
+
+def benchmark_mode(name, port, async_mode, levels, duration, streams, p99_target_ms):
+    """Run all concurrency levels against one serving mode"""
+    print(f"\n=== {name} ===")
+    proc = start_server(port, async_mode=async_mode)
+    results = []
+    try:
+        for concurrency in levels:
+            result = asyncio.run(run_level(port, concurrency, duration, streams))
+            results.append(result)
+            print(f"  c={concurrency:>4}  rps={result['throughput_rps']:>7}  "
+                  f"p50={result['p50_ms']:>7}ms  p99={result['p99_ms']:>7}ms  errors={result['errors']}")
+    finally:
+        stop_server(proc)
+
+    sustained = [r['concurrency'] for r in results if r['p99_ms'] <= p99_target_ms and r['errors'] == 0]
+    return {
+        'mode': name,
+        'levels': results,
+        'max_concurrency_at_p99_target': max(sustained) if sustained else 0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--levels', default='8,16,32,64,128,256', help='comma separated concurrency levels')
+    parser.add_argument('--duration', type=float, default=5.0, help='seconds per level')
+    parser.add_argument('--streams', type=int, default=32, help='open /api/stream connections during each level')
+    parser.add_argument('--p99-target-ms', type=float, default=250.0)
+    parser.add_argument('--output', help='write JSON results to this file')
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.levels.split(',')]
+    report = {
+        'p99_target_ms': args.p99_target_ms,
+        'streams': args.streams,
+        'modes': [
+            benchmark_mode('flask-threaded', free_port(), False, levels, args.duration, args.streams, args.p99_target_ms),
+            benchmark_mode('asgi-async', free_port(), True, levels, args.duration, args.streams, args.p99_target_ms),
+        ]
+    }
+
+    print(f"\nMax concurrent connections with p99 <= {args.p99_target_ms}ms:")
+    for mode in report['modes']:
+        print(f"  {mode['mode']:<16} {mode['max_concurrency_at_p99_target']}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+if __name__ == '__main__':
+    main()
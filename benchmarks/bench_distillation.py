@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Distill the forest into its compact tiers and report accuracy against latency.
+
+Fits each student (small gradient-boosted ensemble, quantized lookup table,
+logistic model) on simulated history and compares it with the forest on a
+separate labeled sample: accuracy, ROC AUC, agreement with the forest, mean
+probability difference, batch and single-row latency, and pickled size.
+
+Usage: python benchmarks/bench_distillation.py [--gbm-trees 40] [--lookup-bins 12]
+"""
+
+import argparse
+
+import common  # noqa: F401  (adds the project paths)
+
+from simulate_data import DataSimulator
+from train_model import AuraMachineHealthModel
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--gbm-trees', type=int, default=40)
+    parser.add_argument('--gbm-depth', type=int, default=3)
+    parser.add_argument('--lookup-bins', type=int, default=12)
+    parser.add_argument('--train-days', type=int, default=30)
+    parser.add_argument('--test-days', type=int, default=15)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    model = AuraMachineHealthModel()
+    model.load_model()
+    simulator = DataSimulator()
+    train = simulator.generate_historical_data(days=args.train_days, output_path=None)
+    test = simulator.generate_historical_data(days=args.test_days, output_path=None)
+    X_train = model.prepare_columns(train)
+
+    students = [
+        model.distill(tier, X_train, gbm_trees=args.gbm_trees, gbm_depth=args.gbm_depth, lookup_bins=args.lookup_bins)
+        for tier in model.DISTILLED_TIERS
+    ]
+
+    print(f"{'tier':<9} {'accuracy':>8} {'roc_auc':>8} {'agree':>7} {'|Δp| %':>7} "
+          f"{'µs/row':>8} {'1-row µs':>9} {'bytes':>9}")
+    for row in model.distillation_report(students, test, repeat=args.repeat):
+        roc_auc = f"{row['roc_auc']:.4f}" if row['roc_auc'] is not None else 'n/a'
+        print(f"{row['tier']:<9} {row['accuracy']:>8.4f} {roc_auc:>8} {row['teacher_agreement']:>7.4f} "
+              f"{row['mean_abs_diff_from_teacher']:>7.2f} {row['batch_us_per_row']:>8.3f} "
+              f"{row['single_row_us']:>9.1f} {row['size_bytes']:>9}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Scaling curve for sharded fleet scoring.
+
+Scores one tick's worth of readings (features, inference, health
+analysis) in-process and then with ShardedFleetProcessor at 1..N worker
+processes, reporting the median tick time and speedup over in-process.
+Results are checked against the in-process analyses.
+
+Usage: python benchmarks/bench_fleet_sharding.py [--fleet 20000] [--max-workers 8] [--rounds 5]
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+from run_benchmarks import sample_readings, trained_model
+
+from config import Config
+from fleet_pool import ShardedFleetProcessor
+
+def median_time(func, rounds):
+    func()  # warm-up
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fleet', type=int, default=20000)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    model = trained_model()
+    readings = sample_readings(args.fleet)
+
+    def in_process():
+        return model.analyze_batch(readings, model.predict_batch(model.prepare_batch(readings)))
+
+    expected = in_process()
+    baseline = median_time(in_process, args.rounds)
+    print(f"{args.fleet} machines, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'tick ms':>9} {'speedup':>8}")
+    print(f"{'in-proc':>8} {baseline * 1000:>9.1f} {1.0:>7.2f}x")
+
+    for workers in range(1, args.max_workers + 1):
+        processor = ShardedFleetProcessor(
+            model.model_path, model.scaler_path, workers,
+            min_shard_size=Config.FLEET_MIN_SHARD_SIZE, start_method=Config.FLEET_START_METHOD
+        )
+        try:
+            assert processor.analyze(readings) == expected, 'sharded results differ from in-process'
+            elapsed = median_time(lambda: processor.analyze(readings), args.rounds)
+        finally:
+            processor.close()
+        print(f"{workers:>8} {elapsed * 1000:>9.1f} {baseline / elapsed:>7.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Show where import time goes for the startup-critical modules.
+
+Each module is imported in a fresh interpreter under `python -X importtime`;
+the report lists its total import time and the slowest modules it pulls in
+(by cumulative time), so a heavy dependency creeping back onto the server
+boot path shows up by name. `run_benchmarks.py -k startup` tracks the totals
+and the time to the first /api/health answer.
+
+Usage: python benchmarks/bench_import_time.py [--top 10] [app simulate_data ...]
+"""
+
+import argparse
+
+import common
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('modules', nargs='*', default=['app', 'simulate_data', 'train_model'])
+    parser.add_argument('--top', type=int, default=10, help='slowest imported modules to list')
+    parser.add_argument('--repeat', type=int, default=3, help='imports per module; the fastest run is reported')
+    args = parser.parse_args()
+
+    for module in args.modules:
+        total, modules = min((common.import_times(module) for _ in range(args.repeat)), key=lambda run: run[0])
+        print(f"\n{module}: {total * 1000:.1f} ms")
+        print(f"  {'module':<40} {'self ms':>9} {'cumulative ms':>14}")
+        nested = [row for row in modules if row[0] != module]
+        for name, self_seconds, cumulative_seconds in sorted(nested, key=lambda row: -row[2])[:args.top]:
+            print(f"  {name:<40} {self_seconds * 1000:>9.1f} {cumulative_seconds * 1000:>14.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark the durable maintenance log store.
+
+Measures append throughput (batched commits), per-machine detail query
+latency against a full list scan, and startup recovery time on reopen.
+
+Usage: python benchmarks/bench_maintenance_store.py [--count 100000] [--machines 500]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from common import percentile
+
+from maintenance_store import MaintenanceLogStore
+from models import MaintenanceLog
+
+ACTIVITIES = ['inspection', 'repair', 'replacement', 'calibration']
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=100_000)
+    parser.add_argument('--machines', type=int, default=500)
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+
+    base_time = datetime.now() - timedelta(days=365)
+    logs = []
+    for i in range(args.count):
+        log = MaintenanceLog(f"Machine_{i % args.machines:04d}", ACTIVITIES[i % 4], f"Routine work #{i}")
+        log.timestamp = base_time + timedelta(minutes=i)
+        logs.append(log)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'maintenance.db')
+        store = MaintenanceLogStore(path=path)
+
+        start = time.perf_counter()
+        for log in logs:
+            store.append(log)
+        store.flush()
+        elapsed = time.perf_counter() - start
+        print(f"append+commit   {args.count / elapsed:>12.0f} logs/s")
+
+        machine_ids = [f"Machine_{i % args.machines:04d}" for i in range(args.queries)]
+
+        timings = []
+        for machine_id in machine_ids:
+            start = time.perf_counter()
+            [log.to_dict() for log in logs if log.machine_id == machine_id]
+            timings.append(time.perf_counter() - start)
+        print(f"list scan       p50={percentile(timings, 50) * 1000:8.3f}ms  p99={percentile(timings, 99) * 1000:8.3f}ms")
+
+        timings = []
+        for machine_id in machine_ids:
+            start = time.perf_counter()
+            store.rows(machine_id=machine_id)
+            timings.append(time.perf_counter() - start)
+        print(f"indexed read    p50={percentile(timings, 50) * 1000:8.3f}ms  p99={percentile(timings, 99) * 1000:8.3f}ms")
+
+        since = datetime.now() - timedelta(days=30)
+        timings = []
+        for machine_id in machine_ids:
+            start = time.perf_counter()
+            store.rows(machine_id=machine_id, since=since)
+            timings.append(time.perf_counter() - start)
+        print(f"indexed range   p50={percentile(timings, 50) * 1000:8.3f}ms  p99={percentile(timings, 99) * 1000:8.3f}ms")
+
+        store.close()
+        reopened = MaintenanceLogStore(path=path)
+        print(f"recovery        {reopened.recovery_seconds * 1000:8.1f}ms for {len(reopened)} logs")
+        reopened.close()
+
+if __name__ == '__main__':
+    main()
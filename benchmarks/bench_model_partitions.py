@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Compare the pooled forest with per-machine-type partitions.
+
+Trains one smaller forest per machine type on simulated history, then scores
+a separate labeled sample per type with both the pooled forest and the type's
+partition: ROC AUC, Brier score, batch latency per row and artifact size.
+
+Usage: python benchmarks/bench_model_partitions.py [--trees 50] [--max-depth 8]
+"""
+
+import argparse
+import pickle
+import time
+
+import numpy as np
+from sklearn.metrics import brier_score_loss, roc_auc_score
+
+import common  # noqa: F401  (adds the project paths)
+
+from simulate_data import DataSimulator
+from train_model import AuraMachineHealthModel
+
+def score(model, df, repeat):
+    X_scaled = model.prepare_columns(df)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        probs = model.model.predict_proba(X_scaled)[:, 1]
+        timings.append(time.perf_counter() - start)
+    y = df['failure'].to_numpy()
+    roc_auc = roc_auc_score(y, probs) if len(np.unique(y)) > 1 else float('nan')
+    return roc_auc, brier_score_loss(y, probs), float(np.median(timings)) / len(df) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--trees', type=int, default=50)
+    parser.add_argument('--max-depth', type=int, default=8)
+    parser.add_argument('--train-days', type=int, default=90)
+    parser.add_argument('--test-days', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    pooled = AuraMachineHealthModel()
+    pooled.load_model()
+    simulator = DataSimulator()
+    types = {machine_id: info['type'] for machine_id, info in simulator.machines.items()}
+    partitions = pooled.train_partitions(
+        simulator.generate_historical_data(days=args.train_days, output_path=None), types,
+        n_estimators=args.trees, max_depth=args.max_depth)
+    test = simulator.generate_historical_data(days=args.test_days, output_path=None)
+
+    print(f"\n{'type':<11} {'model':<9} {'roc_auc':>8} {'brier':>8} {'µs/row':>8} {'bytes':>9}")
+    for machine_type, group in test.groupby(test['machine_id'].map(types)):
+        candidates = [('pooled', pooled)]
+        if machine_type in partitions:
+            candidates.append(('partition', partitions[machine_type]))
+        for name, model in candidates:
+            roc_auc, brier, us_per_row = score(model, group, args.repeat)
+            print(f"{machine_type:<11} {name:<9} {roc_auc:>8.4f} {brier:>8.4f} {us_per_row:>8.3f} "
+                  f"{len(pickle.dumps(model.model)):>9}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark dashboard payload size and encode time per format and content coding.
+
+Encodes the /api/status payload at several fleet sizes and a machine-details
+payload with a day of historical readings as jsonify (previous), cached JSON
+fragments, columnar JSON and MessagePack, each sent raw, gzip'd and
+brotli-compressed. MessagePack and brotli rows are skipped when the optional
+packages are not installed.
+
+Usage: python benchmarks/bench_payload_encoding.py [--sizes 5,500,5000]
+"""
+
+import argparse
+from datetime import datetime, timedelta
+
+from common import percentile
+
+from flask import Flask, jsonify
+
+import encoding
+from bench_status_serialization import build_api, build_fleet, time_call
+
+def history_payload(machine, hours=24 * 7):
+    """Machine-details payload with hourly readings, like /api/machine/<id>"""
+    now = datetime.now()
+    readings = []
+    for i in range(hours):
+        reading = dict(machine.current_readings)
+        reading['timestamp'] = (now - timedelta(hours=hours - i)).isoformat()
+        readings.append(reading)
+    return {
+        'machine': machine.to_dict(),
+        'recent_alerts': [],
+        'maintenance_history': [],
+        'historical_readings': readings
+    }
+
+def codings():
+    available = [('raw', None), ('gzip', 'gzip')]
+    if encoding.brotli is not None:
+        available.append(('br', 'br'))
+    return available
+
+def report(label, variants, repeat):
+    for name, func in variants:
+        body = func()
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        encode_ms = percentile(time_call(func, repeat), 50) * 1000
+        for coding_name, coding in codings():
+            if coding is None:
+                size, total_ms = len(body), encode_ms
+            else:
+                compressed = encoding.compress(body, coding)
+                size = len(compressed)
+                total_ms = encode_ms + percentile(time_call(lambda: encoding.compress(body, coding), repeat), 50) * 1000
+            print(f"{label:>10} {name:<12} {coding_name:<5} {total_ms:>9.3f} {size:>10}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='5,500,5000')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    flask_app = Flask(__name__)
+    formats = ['columnar'] + (['msgpack'] if encoding.msgpack is not None else [])
+
+    print(f"{'payload':>10} {'format':<12} {'coding':<5} {'p50 ms':>9} {'bytes':>10}")
+    for size in [int(s) for s in args.sizes.split(',')]:
+        fleet = build_fleet(size)
+        api = build_api(fleet)
+
+        def jsonify_status():
+            payload = {
+                'timestamp': datetime.now().isoformat(),
+                'machines': {mid: machine.to_dict() for mid, machine in fleet.items()},
+                'system_health': api._calculate_system_health(),
+                'active_alerts': 0,
+                'total_machines': len(fleet)
+            }
+            with flask_app.app_context():
+                return jsonify(payload).get_data()
+
+        variants = [('jsonify', jsonify_status), ('fragments', lambda: api._build_status_payload('json')[0])]
+        variants += [(fmt, lambda fmt=fmt: api._build_status_payload(fmt)[0]) for fmt in formats]
+        report(f"status/{size}", variants, args.repeat)
+
+    payload = history_payload(next(iter(build_fleet(1).values())))
+    keys = ('recent_alerts', 'maintenance_history', 'historical_readings')
+
+    def jsonify_history():
+        with flask_app.app_context():
+            return jsonify(payload).get_data()
+
+    variants = [('jsonify', jsonify_history)]
+    variants += [(fmt, lambda fmt=fmt: encoding.encode_payload(payload, fmt, keys)[0]) for fmt in formats]
+    report('history', variants, args.repeat)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark snapshot + WAL persistence of machine and alert state.
+
+For each fleet size, captures a snapshot (timing the capture the
+background worker pays separately from the off-thread write), appends
+a snapshot interval's worth of tick records to the WAL, then times a
+full restore: snapshot load, WAL replay and rebuilding model objects.
+
+Usage: python benchmarks/bench_state_restore.py [--sizes 5,5000,50000] [--ticks 20]
+"""
+
+import argparse
+import tempfile
+import time
+from datetime import datetime
+
+from bench_status_serialization import build_fleet, update_machine
+from bench_alert_memory import make_alert
+
+from history_store import AlertHistory
+from models import Alert, MachineData
+from state_store import StateStore, object_state, restore_object
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='5,5000,50000')
+    parser.add_argument('--ticks', type=int, default=20, help='WAL ticks written after the snapshot')
+    parser.add_argument('--archived-alerts', type=int, default=100_000)
+    args = parser.parse_args()
+
+    base_time = datetime.now()
+    history = AlertHistory()
+    for i in range(args.archived_alerts):
+        history.append(make_alert(Alert, i, base_time))
+    live_alerts = [make_alert(Alert, i, base_time) for i in range(100)]
+
+    print(f"{'machines':>8} {'capture ms':>11} {'write ms':>9} {'wal tick ms':>12} {'restore ms':>11}")
+    for size in [int(s) for s in args.sizes.split(',')]:
+        fleet = build_fleet(size)
+        with tempfile.TemporaryDirectory() as tmp:
+            store = StateStore(directory=tmp, snapshot_interval=3600)
+            store.restore()
+
+            start = time.perf_counter()
+            state = {
+                'machines': [object_state(machine) for machine in fleet.values()],
+                'alerts': [object_state(alert) for alert in live_alerts],
+                'alert_history': history.export_state(),
+                'simulator_states': {mid: 0 for mid in fleet}
+            }
+            capture = time.perf_counter() - start
+            store.write_snapshot(state)
+            store._snapshot_thread.join()
+
+            tick_timings = []
+            for _ in range(args.ticks):
+                for machine in fleet.values():
+                    update_machine(machine)
+                start = time.perf_counter()
+                store.log('tick', {
+                    'machines': [object_state(machine) for machine in fleet.values()],
+                    'simulator_states': {mid: 0 for mid in fleet}
+                })
+                store.sync()
+                tick_timings.append(time.perf_counter() - start)
+            store.close()
+
+            start = time.perf_counter()
+            reopened = StateStore(directory=tmp)
+            snapshot, records = reopened.restore()
+            # Same steps as AuraAPI._restore_state
+            machine_states = {}
+            for record in reversed(records):
+                if len(machine_states) == len(fleet):
+                    break
+                for s in record.payload['machines']:
+                    machine_states.setdefault(s[0], s)
+            if len(machine_states) < len(fleet):
+                for s in snapshot['machines']:
+                    machine_states.setdefault(s[0], s)
+            alerts = [restore_object(Alert, s) for s in snapshot['alerts']]
+            restored_history = AlertHistory()
+            restored_history.restore_state(snapshot['alert_history'])
+            machines = {mid: restore_object(MachineData, s) for mid, s in machine_states.items()}
+            restore = time.perf_counter() - start
+            reopened.close()
+
+        print(f"{size:>8} {capture * 1000:>11.1f} {store.last_snapshot_seconds * 1000:>9.1f} "
+              f"{sum(tick_timings) / max(1, len(tick_timings)) * 1000:>12.2f} {restore * 1000:>11.1f}")
+
+if __name__ == '__main__':
+    main()
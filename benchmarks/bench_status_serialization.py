@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark /api/status serialization at several fleet sizes.
+
+Compares the previous approach (fresh to_dict() per machine, then jsonify of
+the whole tree) against assembling the body from cached per-machine JSON
+fragments, both with an unchanged fleet (between background ticks) and with
+10% of machines updated before each request.
+
+Usage: python benchmarks/bench_status_serialization.py [--sizes 5,500,5000]
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime
+
+from common import percentile
+
+from flask import Flask, jsonify
+
+from app import AuraAPI
+from fleet_stats import FleetAggregates
+from models import MachineData
+
+def build_fleet(size):
+    """Create a fleet of machines with realistic readings"""
+    fleet = {}
+    for i in range(size):
+        machine = MachineData(f"Machine_{i:05d}", f"Machine {i}", 'Motor', 'Benchmark Floor')
+        update_machine(machine)
+        machine.last_maintenance = datetime.now()
+        machine.next_maintenance = datetime.now()
+        fleet[machine.machine_id] = machine
+    return fleet
+
+def update_machine(machine):
+    """Apply a tick's worth of changes to a machine"""
+    machine.current_readings = {
+        'temperature': round(random.uniform(65, 95), 1),
+        'vibration': round(random.uniform(0.1, 1.2), 2),
+        'rotation_speed': round(random.uniform(1400, 1600), 0),
+        'load': round(random.uniform(70, 95), 1),
+        'timestamp': datetime.now().isoformat()
+    }
+    machine.health_score = round(random.uniform(40, 100), 1)
+    machine.failure_probability = round(random.uniform(0, 60), 1)
+    machine.last_updated = datetime.now()
+
+def build_api(fleet):
+    """AuraAPI with only the state needed to build status responses"""
+    api = AuraAPI.__new__(AuraAPI)
+    api.machines = fleet
+    api.alerts = []
+    api.fleet_stats = FleetAggregates()
+    api.fleet_stats.rebuild(fleet.values(), [])
+    return api
+
+def time_call(func, repeat):
+    """Run func repeatedly and return per-call timings in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='5,500,5000')
+    parser.add_argument('--repeat', type=int, default=30)
+    args = parser.parse_args()
+
+    flask_app = Flask(__name__)
+
+    print(f"{'machines':>8} {'variant':<24} {'p50 ms':>9} {'p99 ms':>9} {'bytes':>10}")
+    for size in [int(s) for s in args.sizes.split(',')]:
+        fleet = build_fleet(size)
+        api = build_api(fleet)
+        changed = list(fleet.values())[:max(1, size // 10)]
+
+        def uncached_jsonify():
+            payload = {
+                'timestamp': datetime.now().isoformat(),
+                'machines': {mid: machine._serialize() for mid, machine in fleet.items()},
+                'system_health': api._calculate_system_health(),
+                'active_alerts': 0,
+                'total_machines': len(fleet)
+            }
+            with flask_app.app_context():
+                return jsonify(payload).get_data()
+
+        def cached_unchanged():
+            return api._build_status_json().encode('utf-8')
+
+        def cached_ten_percent_changed():
+            for machine in changed:
+                update_machine(machine)
+            return api._build_status_json().encode('utf-8')
+
+        variants = [
+            ('jsonify (previous)', uncached_jsonify),
+            ('fragments, unchanged', cached_unchanged),
+            ('fragments, 10% changed', cached_ten_percent_changed),
+        ]
+        for name, func in variants:
+            body_size = len(func())
+            timings = time_call(func, args.repeat)
+            print(f"{size:>8} {name:<24} {percentile(timings, 50) * 1000:>9.3f} "
+                  f"{percentile(timings, 99) * 1000:>9.3f} {body_size:>10}")
+
+if __name__ == '__main__':
+    main()
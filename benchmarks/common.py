@@ -0,0 +1,163 @@
+"""
+Shared helpers for the Aura benchmark scripts.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+# Add project paths (same layout as run_demo.py)
+project_root = Path(__file__).resolve().parent.parent
+for _subdir in ('data', 'ml_model', 'backend'):
+    _path = str(project_root / _subdir)
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+def import_times(module):
+    """Per-module import times for `import module` in a fresh interpreter (python -X importtime)
+
+    Returns (total_seconds, [(name, self_seconds, cumulative_seconds), ...])
+    for `module` and everything it imported, leaving out the interpreter's
+    own startup imports.
+    """
+    code = "import sys; sys.path[:0] = {paths!r}; import {module}".format(
+        paths=[str(project_root / d) for d in ('data', 'ml_model', 'backend')],
+        module=module
+    )
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=str(project_root), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True
+    )
+    # Children are listed before their parent; a top-level import closes its block
+    block = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        block.append((name.strip(), int(self_us) / 1e6, int(cumulative_us) / 1e6))
+        if not name[1:].startswith(' '):
+            if name.strip() == module:
+                return block[-1][2], block
+            block = []
+    raise RuntimeError(f"{module} was not imported")
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_server(port, async_mode=False, env=None, wait_for_model=True):
+    """Start an AuraAPI server in a subprocess and wait until it is ready
+
+    Ready means /api/health reports the model loaded; with
+    wait_for_model=False, any /api/health answer will do (the model may
+    still be loading in the background).
+
+    The server gets a fresh temporary storage directory (AURA_STORAGE_DIR,
+    unless env sets one), so runs neither restore nor leave behind state in
+    storage/; its registry imports ml_model/model.pkl on start. Stop it
+    with stop_server(), which also removes that directory.
+    """
+    code = (
+        "import sys; sys.path[:0] = {paths!r}; "
+        "from app import AuraAPI; "
+        "AuraAPI().run(host='127.0.0.1', port={port}, debug=False, async_mode={async_mode})"
+    ).format(
+        paths=[str(project_root / d) for d in ('data', 'ml_model', 'backend')],
+        port=port,
+        async_mode=async_mode
+    )
+    storage = tempfile.TemporaryDirectory(prefix='aura-server-')
+    proc = subprocess.Popen(
+        [sys.executable, '-c', code],
+        cwd=str(project_root),
+        env=dict(dict(os.environ, AURA_STORAGE_DIR=storage.name), **(env or {})),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    proc.storage = storage
+
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            stop_server(proc)
+            raise RuntimeError(f"Server on port {port} exited with code {proc.returncode}")
+        try:
+            health = json.loads(urllib.request.urlopen(f"http://127.0.0.1:{port}/api/health", timeout=1).read())
+        except (OSError, ValueError):
+            time.sleep(0.05)
+            continue
+        model = health['components']['ml_model']
+        if model == 'failed':
+            stop_server(proc)
+            raise RuntimeError(f"Server on port {port} could not load its model")
+        if model == 'loaded' or not wait_for_model:
+            return proc
+        time.sleep(0.05)
+
+    stop_server(proc)
+    raise RuntimeError(f"Server on port {port} did not become ready")
+
+def stop_server(proc):
+    """Stop a start_server() process and remove its storage directory"""
+    if proc.poll() is None:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+    proc.storage.cleanup()
+
+async def http_request(host, port, method, path, body=None, timeout=10.0):
+    """Minimal HTTP/1.1 client on asyncio streams; returns (status, body_bytes)"""
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    try:
+        headers = [
+            f"{method} {path} HTTP/1.1",
+            f"Host: {host}:{port}",
+            "Connection: close",
+        ]
+        if body is not None:
+            headers.append("Content-Type: application/json")
+            headers.append(f"Content-Length: {len(body)}")
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode('latin-1') + (body or b''))
+        await writer.drain()
+
+        raw = await asyncio.wait_for(reader.read(), timeout)
+        status_line, _, rest = raw.partition(b"\r\n")
+        status = int(status_line.split(b" ")[1]) if status_line else 0
+        _, _, response_body = rest.partition(b"\r\n\r\n")
+        return status, response_body
+    finally:
+        writer.close()
+
+async def open_stream(host, port, path='/api/stream'):
+    """Open a long-lived streaming connection and return its writer so it can be closed later"""
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\n\r\n".encode('latin-1'))
+    await writer.drain()
+
+    async def drain_events():
+        try:
+            while await reader.read(65536):
+                pass
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+
+    return writer, asyncio.ensure_future(drain_events())
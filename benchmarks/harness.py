@@ -0,0 +1,147 @@
+"""
+Minimal benchmark harness: registration, timing, JSON results and comparison.
+
+Benchmarks are plain functions registered with @benchmark. Each one may take
+a `param` (run once per value in `params`) and may return a callable; in
+that case setup is excluded and only the returned callable is timed.
+"""
+
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime
+
+from common import project_root
+
+RESULTS_DIR = project_root / 'benchmarks' / 'results'
+
+_registry = []
+
+def benchmark(group, params=None, min_time=0.5, max_rounds=1000, warmup=1, quick_params=None):
+    """Register a benchmark function
+
+    group        -- name prefix used for filtering/reporting
+    params       -- values passed as `param`, one result per value
+    min_time     -- keep timing rounds until this many seconds have elapsed
+    quick_params -- smaller parameter set used with --quick
+    """
+    def register(func):
+        _registry.append({
+            'name': f"{group}.{func.__name__}",
+            'func': func,
+            'params': params,
+            'quick_params': quick_params,
+            'min_time': min_time,
+            'max_rounds': max_rounds,
+            'warmup': warmup,
+        })
+        return func
+    return register
+
+def registered():
+    return list(_registry)
+
+def _time_callable(func, min_time, max_rounds, warmup):
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < max_rounds:
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+        if time.perf_counter() - started >= min_time:
+            break
+    return timings
+
+def _summarize(timings):
+    ordered = sorted(timings)
+    return {
+        'rounds': len(timings),
+        'min': ordered[0],
+        'median': statistics.median(ordered),
+        'mean': statistics.fmean(ordered),
+        'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        'stddev': statistics.pstdev(ordered) if len(ordered) > 1 else 0.0,
+        'ops_per_sec': 1.0 / statistics.median(ordered) if ordered[0] > 0 else None,
+    }
+
+def run(name_filter=None, quick=False, verbose=True):
+    """Run registered benchmarks and return {name: stats}"""
+    results = {}
+    for entry in _registry:
+        params = (entry['quick_params'] or entry['params']) if quick else entry['params']
+        for param in (params if params is not None else [None]):
+            name = entry['name'] if param is None else f"{entry['name']}[{param}]"
+            if name_filter and name_filter not in name:
+                continue
+
+            # Benchmarked code prints progress; keep the report readable
+            with contextlib.redirect_stdout(io.StringIO()):
+                target = entry['func'](param) if param is not None else entry['func']()
+                if callable(target):
+                    timings = _time_callable(target, entry['min_time'], entry['max_rounds'], entry['warmup'])
+                else:
+                    # The function timed itself and returned a list of timings
+                    timings = target
+
+            results[name] = _summarize(timings)
+            if verbose:
+                stats = results[name]
+                print(f"{name:<55} median={stats['median'] * 1000:>10.3f}ms "
+                      f"p95={stats['p95'] * 1000:>10.3f}ms rounds={stats['rounds']}")
+    return results
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=str(project_root), stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def save(results, path=None):
+    """Write results with commit/environment metadata; returns the file path"""
+    commit = _git_commit()
+    document = {
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'benchmarks': results,
+    }
+    if path is None:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        path = RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}_{commit}.json"
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2)
+    return path
+
+def compare(results, baseline_path, threshold=0.10):
+    """Print median ratios against a saved baseline; returns names that regressed"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    print(f"\nComparison against {baseline.get('commit')} ({baseline_path}), threshold {threshold:.0%}")
+    regressions = []
+    for name, stats in results.items():
+        base = baseline['benchmarks'].get(name)
+        if base is None:
+            print(f"  {name:<55} (new)")
+            continue
+        ratio = stats['median'] / base['median'] if base['median'] else float('inf')
+        marker = ''
+        if ratio > 1 + threshold:
+            marker = '  REGRESSION'
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            marker = '  improved'
+        print(f"  {name:<55} {ratio:>6.2f}x{marker}")
+    return regressions
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Load generator that mimics Aura dashboard traffic.
+
+Each simulated dashboard behaves like frontend/script.js: every
+update interval it fetches /api/fleet/summary, the first page of
+/api/machines and /api/alerts?limit=20, and clients with the machine
+modal open also fetch /api/machine/<id>.
+Open-loop predict (POST /api/predict) and ingest (POST /api/maintenance)
+traffic run alongside at fixed average rates.
+
+Usage:
+  python benchmarks/loadgen.py --url http://localhost:5000 --clients 50 --duration 60
+  python benchmarks/loadgen.py --in-process --clients 20 --report reports/baseline.json
+  python benchmarks/loadgen.py --url ... --label async --compare reports/baseline.json
+
+Note: ingest traffic writes real maintenance logs; use --ingest-rate 0
+against servers whose data matters.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlparse
+
+from common import percentile
+
+# Same page request as AuraDashboard.loadMachinePages
+MACHINES_PAGE = ('/api/machines?limit=24&fields=machine_id,name,type,location,alert_level,'
+                 'health_score,current_readings,potential_issues')
+
+class HttpTarget:
+    """Drive a running server over keep-alive HTTP connections (one per thread)"""
+
+    def __init__(self, base_url, timeout=30):
+        parsed = urlparse(base_url)
+        self.host = parsed.hostname
+        self.port = parsed.port or 80
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def request(self, method, path, body=None):
+        """Returns (status, response_bytes); status 0 means a transport error"""
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        payload = json.dumps(body).encode('utf-8') if body is not None else None
+        try:
+            conn = self._connection()
+            conn.request(method, path, body=payload, headers=headers)
+            response = conn.getresponse()
+            return response.status, response.read()
+        except (OSError, http.client.HTTPException):
+            self._local.conn = None
+            return 0, b''
+
+class InProcessTarget:
+    """Drive an in-process AuraAPI through the Flask test client"""
+
+    def __init__(self):
+        from app import create_app
+        # Keep generated data away from the real storage directory
+        self.api = create_app(storage_dir=tempfile.mkdtemp(prefix='aura-loadgen-'))
+        self._local = threading.local()
+        # The model loads in the background; load before it is ready would only measure 503s
+        while not self.api.model_ready.wait(0.1):
+            if self.api.model_error:
+                raise RuntimeError(f"In-process AuraAPI could not load its model: {self.api.model_error}")
+
+    def request(self, method, path, body=None):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.api.app.test_client()
+        response = client.open(path, method=method, json=body)
+        return response.status_code, response.data
+
+class LoadStats:
+    """Thread-safe latency/error collection per endpoint"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+
+    def record(self, endpoint, latency, ok):
+        with self._lock:
+            self.latencies.setdefault(endpoint, []).append(latency)
+            if not ok:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def summary(self, duration):
+        def describe(latencies, errors):
+            return {
+                'requests': len(latencies),
+                'errors': errors,
+                'error_rate': round(errors / len(latencies), 4) if latencies else 0.0,
+                'throughput_rps': round(len(latencies) / duration, 2),
+                'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+                'p90_ms': round(percentile(latencies, 90) * 1000, 2),
+                'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+                'max_ms': round(max(latencies) * 1000, 2) if latencies else 0.0,
+            }
+
+        with self._lock:
+            endpoints = {
+                endpoint: describe(latencies, self.errors.get(endpoint, 0))
+                for endpoint, latencies in sorted(self.latencies.items())
+            }
+            all_latencies = [value for values in self.latencies.values() for value in values]
+            overall = describe(all_latencies, sum(self.errors.values()))
+        return {'overall': overall, 'endpoints': endpoints}
+
+def timed_request(target, stats, endpoint, method, path, body=None):
+    start = time.perf_counter()
+    status, _ = target.request(method, path, body)
+    stats.record(endpoint, time.perf_counter() - start, 200 <= status < 300)
+    return status
+
+def dashboard_client(target, stats, stop_at, interval, modal_machine, rng):
+    """One browser tab polling like AuraDashboard.startRealTimeUpdates"""
+    # Stagger start-up the way independently opened tabs would be
+    next_tick = time.time() + rng.uniform(0, interval)
+    while True:
+        delay = next_tick - time.time()
+        if delay > 0:
+            time.sleep(delay)
+        if time.time() >= stop_at:
+            return
+
+        timed_request(target, stats, '/api/fleet/summary', 'GET', '/api/fleet/summary?top=0')
+        timed_request(target, stats, '/api/machines', 'GET', MACHINES_PAGE)
+        timed_request(target, stats, '/api/alerts', 'GET', '/api/alerts?limit=20')
+        if modal_machine:
+            timed_request(target, stats, '/api/machine/<id>', 'GET', f'/api/machine/{modal_machine}')
+
+        # setInterval cadence: skip missed ticks instead of bursting
+        next_tick += interval
+        while next_tick < time.time():
+            next_tick += interval
+
+def open_loop_sender(target, stats, stop_at, rate, endpoint, make_request, rng):
+    """Send requests with exponentially distributed gaps averaging `rate` per second"""
+    while True:
+        time.sleep(rng.expovariate(rate))
+        if time.time() >= stop_at:
+            return
+        method, path, body = make_request(rng)
+        timed_request(target, stats, endpoint, method, path, body)
+
+def random_sensor_data(rng):
+    return {
+        'temperature': round(rng.uniform(60, 105), 1),
+        'vibration': round(rng.uniform(0.1, 1.5), 2),
+        'rotation_speed': round(rng.uniform(1350, 1700), 0),
+        'load': round(rng.uniform(60, 100), 1),
+    }
+
+def run_load(target, clients, duration, interval, modal_fraction, predict_rate, ingest_rate, seed=42):
+    rng = random.Random(seed)
+
+    status, body = target.request('GET', '/api/status')
+    if status != 200:
+        raise RuntimeError(f"Target is not serving /api/status (HTTP {status})")
+    machine_ids = sorted(json.loads(body)['machines'])
+
+    stats = LoadStats()
+    stop_at = time.time() + duration
+    threads = []
+
+    for i in range(clients):
+        modal_machine = rng.choice(machine_ids) if machine_ids and rng.random() < modal_fraction else None
+        threads.append(threading.Thread(
+            target=dashboard_client,
+            args=(target, stats, stop_at, interval, modal_machine, random.Random(seed + i)),
+            daemon=True
+        ))
+
+    if predict_rate > 0:
+        threads.append(threading.Thread(
+            target=open_loop_sender,
+            args=(target, stats, stop_at, predict_rate, '/api/predict',
+                  lambda r: ('POST', '/api/predict', {'sensor_data': random_sensor_data(r)}),
+                  random.Random(seed + clients)),
+            daemon=True
+        ))
+
+    if ingest_rate > 0 and machine_ids:
+        def make_ingest(r):
+            return ('POST', '/api/maintenance', {
+                'machine_id': r.choice(machine_ids),
+                'activity_type': r.choice(['inspection', 'calibration', 'repair']),
+                'description': 'Load generator maintenance record',
+                'technician': 'loadgen'
+            })
+        threads.append(threading.Thread(
+            target=open_loop_sender,
+            args=(target, stats, stop_at, ingest_rate, '/api/maintenance', make_ingest,
+                  random.Random(seed + clients + 1)),
+            daemon=True
+        ))
+
+    started = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - started
+
+    return stats.summary(elapsed)
+
+def print_summary(summary):
+    print(f"\n{'endpoint':<20} {'reqs':>7} {'rps':>8} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9} {'err %':>7}")
+    rows = list(summary['endpoints'].items()) + [('TOTAL', summary['overall'])]
+    for endpoint, s in rows:
+        print(f"{endpoint:<20} {s['requests']:>7} {s['throughput_rps']:>8} {s['p50_ms']:>9} "
+              f"{s['p90_ms']:>9} {s['p99_ms']:>9} {s['max_ms']:>9} {s['error_rate'] * 100:>6.2f}%")
+
+def print_comparison(report, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    print(f"\nvs {baseline['config'].get('label') or baseline_path}")
+    print(f"{'endpoint':<20} {'rps':>17} {'p99 ms':>21}")
+    current = dict(report['results']['endpoints'], TOTAL=report['results']['overall'])
+    previous = dict(baseline['results']['endpoints'], TOTAL=baseline['results']['overall'])
+    for endpoint, s in current.items():
+        base = previous.get(endpoint)
+        if base is None:
+            continue
+        print(f"{endpoint:<20} {base['throughput_rps']:>7} -> {s['throughput_rps']:<7} "
+              f"{base['p99_ms']:>9} -> {s['p99_ms']:<9}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    target_group = parser.add_mutually_exclusive_group(required=True)
+    target_group.add_argument('--url', help='base URL of a running AuraAPI, e.g. http://localhost:5000')
+    target_group.add_argument('--in-process', action='store_true', help='start AuraAPI in-process and use the Flask test client')
+    parser.add_argument('--clients', type=int, default=20, help='simulated dashboards')
+    parser.add_argument('--duration', type=float, default=30.0, help='seconds')
+    parser.add_argument('--interval', type=float, default=3.0, help='dashboard updateInterval in seconds')
+    parser.add_argument('--modal-fraction', type=float, default=0.2, help='share of dashboards with the machine modal open')
+    parser.add_argument('--predict-rate', type=float, default=1.0, help='POST /api/predict per second')
+    parser.add_argument('--ingest-rate', type=float, default=0.2, help='POST /api/maintenance per second')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--label', help='name of the configuration under test, stored in the report')
+    parser.add_argument('--report', help='write a JSON report to this path')
+    parser.add_argument('--compare', help='earlier report to compare against')
+    args = parser.parse_args()
+
+    target = HttpTarget(args.url) if args.url else InProcessTarget()
+    print(f"Running {args.clients} dashboards for {args.duration}s against "
+          f"{args.url or 'in-process AuraAPI'}...")
+
+    results = run_load(target, args.clients, args.duration, args.interval, args.modal_fraction,
+                       args.predict_rate, args.ingest_rate, args.seed)
+    print_summary(results)
+
+    report = {
+        'timestamp': datetime.now().isoformat(),
+        'config': {
+            'label': args.label,
+            'target': args.url or 'in-process',
+            'clients': args.clients,
+            'duration': args.duration,
+            'interval': args.interval,
+            'modal_fraction': args.modal_fraction,
+            'predict_rate': args.predict_rate,
+            'ingest_rate': args.ingest_rate,
+            'seed': args.seed,
+        },
+        'results': results,
+    }
+
+    if args.report:
+        os.makedirs(os.path.dirname(os.path.abspath(args.report)), exist_ok=True)
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.report}")
+
+    if args.compare:
+        print_comparison(report, args.compare)
+
+if __name__ == '__main__':
+    main()
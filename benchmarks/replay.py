@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded reading stream through the scoring pipeline, for profiling.
+
+A server started with AURA_RECORD_READINGS=<path> appends the raw readings of
+every tick to a binary log (backend/reading_log.py). `replay` feeds that log
+to an in-process AuraAPI whose simulator is replaced by the recording, so each
+tick runs the production path (features, inference, alerting) on exactly the
+readings that were scored live. `record` writes a log from the seeded
+simulator instead, for trying this out without a server.
+
+Replay runs as fast as possible by default; --speed 1 keeps the recorded tick
+spacing and --speed 10 replays ten times faster. Profiling hooks:
+  --profile out.prof    cProfile of the replay loop (open with pstats or snakeviz)
+  --flame out.folded    sampled stacks in folded format, rooted at the tick
+                        stage they were taken in (flamegraph.pl, speedscope)
+  --stages out.folded   per-stage tick time in microseconds, in folded format
+  --start-delay 5       print the PID and wait, e.g. for
+                        `py-spy record --format raw --pid <pid>`
+Per-stage totals and percentiles are printed at the end; --report saves them.
+
+Usage:
+  python benchmarks/replay.py record readings.bin --ticks 2000 --seed 0
+  python benchmarks/replay.py replay readings.bin --flame replay.folded --stages stages.folded
+  python benchmarks/replay.py replay readings.bin --speed 1 --profile replay.prof
+"""
+
+import argparse
+import contextlib
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from common import percentile
+
+from config import Config
+from reading_log import ReplaySource, read_ticks
+
+STAGES = ('simulate', 'features', 'inference', 'alerting', 'persist')
+
+# Innermost frame that decides which tick stage a sample belongs to
+STAGE_FRAMES = {
+    'get_all_current_readings': 'simulate',
+    'append_batch': 'simulate',
+    'prepare_batch': 'features',
+    'predict_batch': 'inference',
+    'analyze': 'inference',  # sharded scoring (features and analysis run in the workers)
+    'analyze_batch': 'alerting',
+    '_check_and_generate_alerts': 'alerting',
+    '_persist_tick': 'persist',
+}
+
+class StackSampler:
+    """Samples the stack of one thread at a fixed interval into folded stacks
+
+    Each sample is folded from the tick entry point inwards as
+    `stage;function (file:line);...` and counted, the same format as
+    `py-spy record --format raw`. Samples outside a tick are rooted at
+    'replay'.
+    """
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='replay-sampler', daemon=True)
+
+    def _fold(self, frame):
+        names, stage = [], 'replay'
+        while frame is not None:
+            code = frame.f_code
+            if code.co_name == '_update_machine_data':
+                stage = 'tick'
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)})")
+                break
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+            frame = frame.f_back
+        names.reverse()
+        if stage == 'tick':
+            for name in reversed(names):
+                stage = STAGE_FRAMES.get(name.split(' ', 1)[0], stage)
+                if stage != 'tick':
+                    break
+        return ';'.join([stage] + names)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.samples[self._fold(frame)] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path):
+        with open(path, 'w') as f:
+            for stack, count in sorted(self.samples.items()):
+                f.write(f"{stack} {count}\n")
+
+def load_model(args):
+    """The active registry version with its stored tiers and partitions, or the tiny fixture model"""
+    from train_model import AuraMachineHealthModel
+    if args.fixture:
+        return AuraMachineHealthModel.fixture()
+
+    from model_partitions import PartitionCache
+    from model_registry import ModelRegistry
+    registry = ModelRegistry(args.registry)
+    version = args.model_version or registry.active_version()
+    if version is None:
+        sys.exit(f"No active model version in {args.registry}; start the server once or pass --fixture")
+    model = registry.load(version)
+    for tier in AuraMachineHealthModel.DISTILLED_TIERS:
+        distilled = registry.load_tier(model, tier)
+        if distilled is not None:
+            model.tiers[tier] = distilled
+    if Config.MODEL_PARTITIONS and registry.partitions(version):
+        model.partitions = PartitionCache(registry, version, Config.MODEL_PARTITION_MEMORY_BUDGET_MB * 1024 * 1024)
+    return model
+
+def record(args):
+    from app import create_app
+    from simulate_data import DataSimulator
+
+    api = create_app(
+        storage_dir=tempfile.mkdtemp(prefix='aura-record-'),
+        model=load_model(args),
+        simulator=DataSimulator(seed=args.seed),
+        background=False,
+        persist_state=False,
+        record_readings=args.log
+    )
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(args.ticks):
+            api.tick()
+    status = api.reading_recorder.status()
+    api.close()
+    print(f"Recorded {status['ticks']} ticks ({status['readings']} readings, {status['bytes'] / 1e3:.0f} kB) to {args.log}")
+
+def replay(args):
+    from app import create_app
+
+    api = create_app(
+        storage_dir=tempfile.mkdtemp(prefix='aura-replay-'),
+        model=load_model(args),
+        simulator=ReplaySource(Config.MACHINES),
+        background=False,
+        persist_state=args.persist
+    )
+    source = api.data_simulator
+
+    if args.start_delay:
+        print(f"Replay process {os.getpid()} starts in {args.start_delay:g}s "
+              f"(py-spy record --format raw --pid {os.getpid()})")
+        time.sleep(args.start_delay)
+
+    profiler = cProfile.Profile() if args.profile else None
+    sampler = StackSampler(threading.get_ident(), args.interval) if args.flame else None
+    stage_times = {stage: [] for stage in STAGES}
+    tick_times, unknown = [], set()
+    readings = 0
+
+    if sampler is not None:
+        sampler.start()
+    if profiler is not None:
+        profiler.enable()
+    started = time.perf_counter()
+    first_tick = None
+    output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with output:
+        for _ in range(args.repeat):
+            for tick_time, machine_ids, rows in read_ticks(args.log):
+                if args.speed:
+                    first_tick = tick_time if first_tick is None else first_tick
+                    delay = (tick_time - first_tick) / args.speed - (time.perf_counter() - started)
+                    if delay > 0:
+                        time.sleep(delay)
+                unknown.update(machine_id for machine_id in machine_ids if machine_id not in api.machines)
+                source.load(machine_ids, rows)
+
+                start = time.perf_counter()
+                api.tick(machine_ids)
+                tick_times.append(time.perf_counter() - start)
+                for stage in STAGES:
+                    stage_times[stage].append(api.last_tick_stages[stage])
+                readings += len(rows)
+            first_tick = None
+    elapsed = time.perf_counter() - started
+    if profiler is not None:
+        profiler.disable()
+    if sampler is not None:
+        sampler.stop()
+    api.close()
+
+    if unknown:
+        print(f"Skipped readings of {len(unknown)} machines not in Config.MACHINES: {', '.join(sorted(unknown)[:5])}")
+    if not tick_times:
+        sys.exit(f"No ticks in {args.log}")
+    print(f"Replayed {len(tick_times)} ticks ({readings} readings) in {elapsed:.2f}s, "
+          f"{len(tick_times) / elapsed:.0f} ticks/s")
+    print(f"\n{'stage':<10} {'total s':>9} {'share':>7} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    total = sum(tick_times)
+    summary = {}
+    for stage, timings in list(stage_times.items()) + [('tick', tick_times)]:
+        summary[stage] = {
+            'total_seconds': sum(timings),
+            'mean_ms': sum(timings) / len(timings) * 1000,
+            'p50_ms': percentile(timings, 50) * 1000,
+            'p95_ms': percentile(timings, 95) * 1000,
+            'p99_ms': percentile(timings, 99) * 1000,
+        }
+        row = summary[stage]
+        print(f"{stage:<10} {row['total_seconds']:>9.3f} {row['total_seconds'] / total:>7.1%} {row['mean_ms']:>9.3f} "
+              f"{row['p50_ms']:>9.3f} {row['p95_ms']:>9.3f} {row['p99_ms']:>9.3f}")
+
+    if args.stages:
+        with open(args.stages, 'w') as f:
+            for stage in STAGES:
+                f.write(f"tick;{stage} {round(summary[stage]['total_seconds'] * 1e6)}\n")
+        print(f"\nStage timings written to {args.stages}")
+    if sampler is not None:
+        sampler.write(args.flame)
+        print(f"{sum(sampler.samples.values())} stack samples written to {args.flame}")
+    if profiler is not None:
+        profiler.dump_stats(args.profile)
+        print(f"cProfile stats written to {args.profile}; top functions by cumulative time:")
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(15)
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump({
+                'timestamp': datetime.now().isoformat(),
+                'log': args.log,
+                'model': 'fixture' if args.fixture else args.model_version or 'active',
+                'speed': args.speed,
+                'ticks': len(tick_times),
+                'readings': readings,
+                'elapsed_seconds': elapsed,
+                'stages': summary,
+            }, f, indent=2)
+        print(f"Report written to {args.report}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=('record', 'replay'))
+    parser.add_argument('log', help='reading log path')
+    parser.add_argument('--fixture', action='store_true', help='score with the tiny fixture model')
+    parser.add_argument('--registry', default=Config.MODEL_REGISTRY_DIR, help='model registry to load from')
+    parser.add_argument('--model-version', type=int, help='registry version (default: the active one)')
+    parser.add_argument('--ticks', type=int, default=1000, help='record: ticks to record')
+    parser.add_argument('--seed', type=int, default=0, help='record: simulator seed')
+    parser.add_argument('--speed', type=float, default=0, help='replay: 0 as fast as possible, 1 recorded pace')
+    parser.add_argument('--repeat', type=int, default=1, help='replay: passes over the log')
+    parser.add_argument('--persist', action='store_true', help='replay: write the state WAL as the server does')
+    parser.add_argument('--profile', help='replay: write cProfile stats to this path')
+    parser.add_argument('--flame', help='replay: write sampled folded stacks to this path')
+    parser.add_argument('--interval', type=float, default=0.002, help='replay: sampling interval in seconds')
+    parser.add_argument('--stages', help='replay: write per-stage folded timings to this path')
+    parser.add_argument('--start-delay', type=float, default=0, help='replay: seconds to wait after printing the PID')
+    parser.add_argument('--verbose', action='store_true', help='replay: keep the pipeline\'s own output')
+    parser.add_argument('--report', help='replay: write a JSON summary to this path')
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        record(args)
+    else:
+        replay(args)
+
+if __name__ == '__main__':
+    main()
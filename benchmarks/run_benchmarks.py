@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Aura benchmark suite: simulator, model and API hot paths.
+
+Usage:
+  python benchmarks/run_benchmarks.py                 # run everything
+  python benchmarks/run_benchmarks.py --quick         # smaller parameter sets
+  python benchmarks/run_benchmarks.py -k model        # filter by name
+  python benchmarks/run_benchmarks.py --save          # write benchmarks/results/<time>_<commit>.json
+  python benchmarks/run_benchmarks.py --compare benchmarks/results/<baseline>.json
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import common
+import harness
+from harness import benchmark
+
+from simulate_data import DataSimulator
+from train_model import AuraMachineHealthModel
+
+BATCH_SIZES = [1, 10, 100, 1000]
+_cache = {}
+
+def scaled_simulator(fleet_size):
+    """DataSimulator with fleet_size machines cycling through the demo machine types"""
+    simulator = DataSimulator(seed=0)
+    templates = list(simulator.machines.values())
+    patterns = list(simulator.failure_patterns.values())
+    simulator.machines = {
+        f"Machine_{i:05d}": templates[i % len(templates)] for i in range(fleet_size)
+    }
+    simulator.failure_patterns = {
+        machine_id: patterns[i % len(patterns)] for i, machine_id in enumerate(simulator.machines)
+    }
+    simulator.machine_states = {machine_id: i % 3 for i, machine_id in enumerate(simulator.machines)}
+    return simulator
+
+def trained_model():
+    if 'model' not in _cache:
+        model = AuraMachineHealthModel()
+        model.load_model()
+        _cache['model'] = model
+    return _cache['model']
+
+def sample_readings(count):
+    return list(scaled_simulator(count).get_all_current_readings().values())
+
+def api_client():
+    if 'api' not in _cache:
+        from app import create_app
+        # Deterministic app: seeded simulator, no worker thread, storage kept out of the repo
+        api = create_app(
+            storage_dir=tempfile.mkdtemp(prefix='aura-bench-'),
+            model=trained_model(),
+            simulator=DataSimulator(seed=0),
+            background=False,
+            persist_state=False
+        )
+        api.tick()
+        _cache['api'] = api
+    return _cache['api'].app.test_client()
+
+# Simulator
+
+@benchmark('simulator', params=[5, 500, 5000], quick_params=[5, 500])
+def get_all_current_readings(fleet_size):
+    return scaled_simulator(fleet_size).get_all_current_readings
+
+@benchmark('simulator', params=[7, 30], quick_params=[7], min_time=0.0, max_rounds=3)
+def generate_historical_data(days):
+    simulator = DataSimulator()
+    return lambda: simulator.generate_historical_data(days=days, samples_per_day=24, output_path=None)
+
+# Model
+
+@benchmark('model', params=BATCH_SIZES, quick_params=[1, 100])
+def prepare_features(batch_size):
+    import pandas as pd
+    model = trained_model()
+    df = pd.DataFrame(sample_readings(batch_size))[model.feature_columns]
+    return lambda: model.prepare_features(df)
+
+@benchmark('model', params=BATCH_SIZES, quick_params=[1, 100])
+def predict_failure_probability(batch_size):
+    import pandas as pd
+    model = trained_model()
+    df = pd.DataFrame(sample_readings(batch_size))[model.feature_columns]
+    return lambda: model.predict_failure_probability(df)
+
+@benchmark('model', params=BATCH_SIZES, quick_params=[1, 100])
+def analyze_machine_health_per_reading(batch_size):
+    model = trained_model()
+    readings = sample_readings(batch_size)
+    return lambda: [model.analyze_machine_health(reading) for reading in readings]
+
+@benchmark('model', params=BATCH_SIZES, quick_params=[1, 100])
+def analyze_batch(batch_size):
+    model = trained_model()
+    readings = sample_readings(batch_size)
+    return lambda: model.analyze_batch(readings, model.predict_batch(model.prepare_batch(readings)))
+
+@benchmark('model', min_time=0.0, max_rounds=1, warmup=0)
+def train_model():
+    tmp = tempfile.mkdtemp(prefix='aura-bench-model-')
+    data_path = os.path.join(tmp, 'sensor_data.csv')
+    DataSimulator().generate_historical_data(days=90, samples_per_day=24, output_path=data_path)
+
+    model = AuraMachineHealthModel()
+    model.model_path = os.path.join(tmp, 'model.pkl')
+    model.scaler_path = os.path.join(tmp, 'scaler.pkl')
+    return lambda: model.train_model(data_path=data_path)
+
+# Alerting
+
+@benchmark('alerts', params=[5, 500, 5000, 50000], quick_params=[5, 5000])
+def evaluate_rules(fleet_size):
+    import numpy as np
+    from alert_rules import AlertRuleEngine
+    from config import Config
+    engine = AlertRuleEngine(Config.ALERT_RULES_PATH, Config.ALERT_COOLDOWN)
+    readings = sample_readings(fleet_size)
+    machine_ids = [f"Machine_{i:05d}" for i in range(fleet_size)]
+    machine_types = [reading['machine_info']['type'] for reading in readings]
+    values = {
+        field: np.array([reading[field] for reading in readings], dtype=float)
+        for field in ('temperature', 'vibration', 'rotation_speed', 'load')
+    }
+    values['health_score'] = np.random.uniform(20, 100, fleet_size)
+    values['failure_probability'] = 100 - values['health_score']
+    clock = iter(range(10 ** 9))
+    return lambda: engine.evaluate(machine_ids, machine_types, values, next(clock))
+
+# Startup (fresh interpreters, so nothing is already imported)
+
+@benchmark('startup', params=['simulate_data', 'train_model', 'app'], min_time=0.0)
+def import_module(module):
+    return [common.import_times(module)[0] for _ in range(3)]
+
+def _server_start_timings(wait_for_model):
+    timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        proc = common.start_server(common.free_port(), wait_for_model=wait_for_model)
+        timings.append(time.perf_counter() - start)
+        common.stop_server(proc)
+    return timings
+
+@benchmark('startup', min_time=0.0)
+def first_health():
+    """Process start until /api/health first answers (the model still loading)"""
+    return _server_start_timings(wait_for_model=False)
+
+@benchmark('startup', min_time=0.0)
+def model_ready():
+    """Process start until /api/health reports the model loaded and scoring can start"""
+    return _server_start_timings(wait_for_model=True)
+
+# API (Flask test client)
+
+@benchmark('api')
+def status():
+    client = api_client()
+    return lambda: client.get('/api/status')
+
+@benchmark('api')
+def machine_details():
+    client = api_client()
+    return lambda: client.get('/api/machine/Machine_001')
+
+@benchmark('api')
+def alerts():
+    client = api_client()
+    return lambda: client.get('/api/alerts?limit=20')
+
+@benchmark('api')
+def machines_page():
+    client = api_client()
+    return lambda: client.get('/api/machines?limit=24&sort=health_score&fields=machine_id,name,health_score,alert_level')
+
+@benchmark('api')
+def fleet_summary():
+    client = api_client()
+    return lambda: client.get('/api/fleet/summary')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-k', dest='name_filter', help='only run benchmarks whose name contains this')
+    parser.add_argument('--quick', action='store_true', help='use smaller parameter sets')
+    parser.add_argument('--save', action='store_true', help='save results under benchmarks/results/')
+    parser.add_argument('--output', help='save results to this file')
+    parser.add_argument('--compare', help='baseline results file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10, help='regression threshold for --compare')
+    args = parser.parse_args()
+
+    results = harness.run(name_filter=args.name_filter, quick=args.quick)
+
+    if args.save or args.output:
+        path = harness.save(results, args.output)
+        print(f"\nResults saved to {path}")
+
+    if args.compare:
+        regressions = harness.compare(results, args.compare, args.threshold)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,16 @@
-import pandas as pd
-import numpy as np
+import os
 import time
 import json
 from datetime import datetime, timedelta
 import threading
 import random
 
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+
 class DataSimulator:
-    def __init__(self):
+    def __init__(self, seed=None):
+        # A seeded simulator replays the same readings (tests, benchmarks)
+        self.random = random.Random(seed)
         self.machines = {
             'Machine_001': {'name': 'Conveyor Belt A', 'type': 'Conveyor'},
             'Machine_002': {'name': 'Hydraulic Press B', 'type': 'Press'},
@@ -41,22 +44,22 @@ class DataSimulator:
         self.initialize_readings()
         
         # Data storage
-        self.historical_data = []
         self.current_alerts = {}
         
     def initialize_readings(self):
         """Initialize all machines with normal readings"""
         for machine_id in self.machines.keys():
             self.current_readings[machine_id] = {
-                'temperature': random.uniform(65, 85),
-                'vibration': random.uniform(0.1, 0.8),
-                'rotation_speed': random.uniform(1450, 1550),
-                'load': random.uniform(70, 90),
+                'temperature': self.random.uniform(65, 85),
+                'vibration': self.random.uniform(0.1, 0.8),
+                'rotation_speed': self.random.uniform(1450, 1550),
+                'load': self.random.uniform(70, 90),
                 'timestamp': datetime.now()
             }
     
-    def generate_historical_data(self, days=30, samples_per_day=24):
-        """Generate historical training data"""
+    def generate_historical_data(self, days=30, samples_per_day=24,
+                                 output_path=os.path.join(DATA_DIR, 'sensor_data.csv')):
+        """Generate historical training data (saved to output_path unless it is None)"""
         print("Generating historical training data...")
         data = []
         start_date = datetime.now() - timedelta(days=days)
@@ -69,7 +72,7 @@ class DataSimulator:
                     # Simulate normal operation most of the time
                     failure_prob = 0.05 if day < days - 7 else 0.15  # Higher failure rate in recent days
                     
-                    if random.random() < failure_prob:
+                    if self.random.random() < failure_prob:
                         # Generate failure scenario
                         readings = self._generate_failure_scenario(machine_id)
                         failure = 1
@@ -88,18 +91,20 @@ class DataSimulator:
                         'failure': failure
                     })
         
+        import pandas as pd  # only needed here; live simulation runs without it
         df = pd.DataFrame(data)
-        df.to_csv('/home/sakshamkapoor/Projects/Aura/data/sensor_data.csv', index=False)
-        print(f"Generated {len(df)} historical data points and saved to sensor_data.csv")
+        if output_path is not None:
+            df.to_csv(output_path, index=False)
+            print(f"Generated {len(df)} historical data points and saved to {os.path.basename(output_path)}")
         return df
     
     def _generate_normal_readings(self):
         """Generate normal sensor readings with slight variations"""
         return {
-            'temperature': random.uniform(65, 85) + random.gauss(0, 2),
-            'vibration': random.uniform(0.1, 0.8) + random.gauss(0, 0.05),
-            'rotation_speed': random.uniform(1450, 1550) + random.gauss(0, 10),
-            'load': random.uniform(70, 90) + random.gauss(0, 3)
+            'temperature': self.random.uniform(65, 85) + self.random.gauss(0, 2),
+            'vibration': self.random.uniform(0.1, 0.8) + self.random.gauss(0, 0.05),
+            'rotation_speed': self.random.uniform(1450, 1550) + self.random.gauss(0, 10),
+            'load': self.random.uniform(70, 90) + self.random.gauss(0, 3)
         }
     
     def _generate_failure_scenario(self, machine_id):
@@ -108,38 +113,38 @@ class DataSimulator:
         
         if pattern == 'vibration_high':
             return {
-                'temperature': random.uniform(80, 95),
-                'vibration': random.uniform(1.0, 1.5),
-                'rotation_speed': random.uniform(1400, 1600),
-                'load': random.uniform(85, 95)
+                'temperature': self.random.uniform(80, 95),
+                'vibration': self.random.uniform(1.0, 1.5),
+                'rotation_speed': self.random.uniform(1400, 1600),
+                'load': self.random.uniform(85, 95)
             }
         elif pattern == 'temperature_high':
             return {
-                'temperature': random.uniform(90, 105),
-                'vibration': random.uniform(0.5, 1.0),
-                'rotation_speed': random.uniform(1500, 1580),
-                'load': random.uniform(80, 95)
+                'temperature': self.random.uniform(90, 105),
+                'vibration': self.random.uniform(0.5, 1.0),
+                'rotation_speed': self.random.uniform(1500, 1580),
+                'load': self.random.uniform(80, 95)
             }
         elif pattern == 'rotation_anomaly':
             return {
-                'temperature': random.uniform(75, 90),
-                'vibration': random.uniform(0.6, 1.1),
-                'rotation_speed': random.uniform(1300, 1400) if random.random() < 0.5 else random.uniform(1600, 1700),
-                'load': random.uniform(75, 90)
+                'temperature': self.random.uniform(75, 90),
+                'vibration': self.random.uniform(0.6, 1.1),
+                'rotation_speed': self.random.uniform(1300, 1400) if self.random.random() < 0.5 else self.random.uniform(1600, 1700),
+                'load': self.random.uniform(75, 90)
             }
         elif pattern == 'load_high':
             return {
-                'temperature': random.uniform(85, 100),
-                'vibration': random.uniform(0.7, 1.2),
-                'rotation_speed': random.uniform(1420, 1580),
-                'load': random.uniform(92, 100)
+                'temperature': self.random.uniform(85, 100),
+                'vibration': self.random.uniform(0.7, 1.2),
+                'rotation_speed': self.random.uniform(1420, 1580),
+                'load': self.random.uniform(92, 100)
             }
         else:  # temperature_vibration
             return {
-                'temperature': random.uniform(88, 102),
-                'vibration': random.uniform(0.9, 1.4),
-                'rotation_speed': random.uniform(1460, 1590),
-                'load': random.uniform(85, 98)
+                'temperature': self.random.uniform(88, 102),
+                'vibration': self.random.uniform(0.9, 1.4),
+                'rotation_speed': self.random.uniform(1460, 1590),
+                'load': self.random.uniform(85, 98)
             }
     
     def simulate_real_time_degradation(self, machine_id):
@@ -147,14 +152,14 @@ class DataSimulator:
         current_state = self.machine_states[machine_id]
         
         # Random chance of state change
-        if random.random() < 0.02:  # 2% chance per update
-            if current_state == 0 and random.random() < 0.3:
+        if self.random.random() < 0.02:  # 2% chance per update
+            if current_state == 0 and self.random.random() < 0.3:
                 self.machine_states[machine_id] = 1  # Start degrading
                 print(f"{machine_id} started degrading")
-            elif current_state == 1 and random.random() < 0.1:
+            elif current_state == 1 and self.random.random() < 0.1:
                 self.machine_states[machine_id] = 2  # Become critical
                 print(f"{machine_id} became critical")
-            elif current_state == 2 and random.random() < 0.05:
+            elif current_state == 2 and self.random.random() < 0.05:
                 self.machine_states[machine_id] = 0  # Recover (maintenance)
                 print(f"{machine_id} recovered to healthy state")
     
@@ -167,11 +172,11 @@ class DataSimulator:
             readings = self._generate_normal_readings()
         elif state == 1:  # Degrading
             # Mix normal and failure patterns
-            if random.random() < 0.7:
+            if self.random.random() < 0.7:
                 readings = self._generate_normal_readings()
                 # Add slight degradation
-                readings['temperature'] += random.uniform(0, 8)
-                readings['vibration'] += random.uniform(0, 0.2)
+                readings['temperature'] += self.random.uniform(0, 8)
+                readings['vibration'] += self.random.uniform(0, 0.2)
             else:
                 readings = self._generate_failure_scenario(machine_id)
         else:  # Critical
@@ -188,10 +193,10 @@ class DataSimulator:
         
         return readings
     
-    def get_all_current_readings(self):
-        """Get current readings for all machines"""
+    def get_all_current_readings(self, machine_ids=None):
+        """Get current readings for all machines (or only machine_ids)"""
         all_readings = {}
-        for machine_id in self.machines.keys():
+        for machine_id in (self.machines.keys() if machine_ids is None else machine_ids):
             all_readings[machine_id] = self.get_current_readings(machine_id)
             all_readings[machine_id]['machine_info'] = self.machines[machine_id]
             all_readings[machine_id]['state'] = self.machine_states[machine_id]
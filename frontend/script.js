@@ -1,14 +1,177 @@
 // Aura Dashboard JavaScript
+
+// Keyed, windowed list: only the rows in (or near) the viewport are in the
+// DOM, and rows whose data did not change keep their existing elements.
+// Spacers above and below stand in for the rows that are not rendered.
+class VirtualList {
+  constructor(container, options) {
+    this.container = container;
+    this.key = options.key;
+    this.render = options.render; // (item, existingElement) => element
+    this.empty = options.empty || null;
+    this.scroller = options.scroller || null; // null: the page scrolls
+    this.gap = options.gap || 0; // px between rows
+    this.overscanRows = options.overscanRows ?? 2;
+    this.items = [];
+    this.nodes = new Map(); // key -> { element, signature }
+    this.rowHeight = 0;
+    this.frame = null;
+    this.footer = null;
+    this.emptyElement = null;
+
+    this.topSpacer = this.createSpacer();
+    this.bottomSpacer = this.createSpacer();
+    container.innerHTML = "";
+    container.append(this.topSpacer, this.bottomSpacer);
+
+    const onScroll = () => this.scheduleRender();
+    (this.scroller || window).addEventListener("scroll", onScroll, { passive: true });
+    window.addEventListener("resize", onScroll);
+  }
+
+  createSpacer() {
+    const spacer = document.createElement("div");
+    spacer.className = "col-span-full";
+    spacer.hidden = true;
+    return spacer;
+  }
+
+  setItems(items) {
+    this.items = items;
+    this.renderWindow();
+  }
+
+  setFooter(element) {
+    if (this.footer) this.footer.remove();
+    this.footer = element;
+    if (element) this.container.appendChild(element);
+  }
+
+  scheduleRender() {
+    if (this.frame) return;
+    this.frame = requestAnimationFrame(() => {
+      this.frame = null;
+      this.renderWindow();
+    });
+  }
+
+  columns() {
+    const template = getComputedStyle(this.container).gridTemplateColumns;
+    if (!template || template === "none") return 1;
+    return template.split(" ").length;
+  }
+
+  visibleRows(rows) {
+    // Until a row has been measured, render the first few and measure them
+    if (!this.rowHeight) return [0, Math.min(rows, this.overscanRows + 1)];
+
+    const pitch = this.rowHeight + this.gap;
+    let top, height;
+    if (this.scroller) {
+      top = this.scroller.scrollTop;
+      height = this.scroller.clientHeight;
+    } else {
+      top = -this.container.getBoundingClientRect().top;
+      height = window.innerHeight;
+    }
+    const first = Math.max(0, Math.floor(top / pitch) - this.overscanRows);
+    const last = Math.min(rows, Math.ceil((top + height) / pitch) + this.overscanRows);
+    return [Math.min(first, last), last];
+  }
+
+  setSpacer(spacer, rows) {
+    // A spacer is a row itself, so it takes one gap less than the rows it replaces
+    spacer.hidden = rows === 0;
+    spacer.style.height = `${Math.max(0, rows * (this.rowHeight + this.gap) - this.gap)}px`;
+  }
+
+  renderWindow() {
+    if (this.items.length === 0 && this.empty) {
+      this.clear();
+      if (!this.emptyElement) this.emptyElement = this.empty();
+      this.container.insertBefore(this.emptyElement, this.bottomSpacer);
+      return;
+    }
+    if (this.emptyElement) {
+      this.emptyElement.remove();
+      this.emptyElement = null;
+    }
+
+    const columns = this.columns();
+    const rows = Math.ceil(this.items.length / columns);
+    const [firstRow, lastRow] = this.visibleRows(rows);
+    const visible = this.items.slice(firstRow * columns, lastRow * columns);
+
+    const seen = new Set();
+    let cursor = this.topSpacer.nextSibling;
+    visible.forEach((item) => {
+      const key = this.key(item);
+      const signature = JSON.stringify(item);
+      let entry = this.nodes.get(key);
+      seen.add(key);
+      if (!entry) {
+        entry = { element: this.render(item, null), signature };
+        this.nodes.set(key, entry);
+      } else if (entry.signature !== signature) {
+        entry.element = this.render(item, entry.element);
+        entry.signature = signature;
+      }
+      if (entry.element === cursor) {
+        cursor = cursor.nextSibling;
+      } else {
+        this.container.insertBefore(entry.element, cursor);
+      }
+    });
+
+    // Rows that scrolled out or disappeared leave the DOM
+    this.nodes.forEach((entry, key) => {
+      if (!seen.has(key)) {
+        entry.element.remove();
+        this.nodes.delete(key);
+      }
+    });
+
+    const measured = this.rowHeight;
+    this.nodes.forEach((entry) => {
+      this.rowHeight = Math.max(this.rowHeight, entry.element.offsetHeight);
+    });
+    this.setSpacer(this.topSpacer, firstRow);
+    this.setSpacer(this.bottomSpacer, rows - lastRow);
+    if (!measured && this.rowHeight) this.scheduleRender();
+  }
+
+  clear() {
+    this.nodes.forEach((entry) => entry.element.remove());
+    this.nodes.clear();
+    this.setSpacer(this.topSpacer, 0);
+    this.setSpacer(this.bottomSpacer, 0);
+  }
+}
+
 class AuraDashboard {
   constructor() {
     this.apiBaseUrl = "http://localhost:5000/api";
     this.machines = {};
     this.alerts = [];
     this.charts = {};
+    this.chartTimestamps = [];
+    this.chartPoints = 24; // hourly points shown in the modal charts
     this.selectedMachine = null;
     this.updateInterval = 3000; // 3 seconds
     this.isLoading = true;
 
+    // Machine grid paging (/api/machines)
+    this.pageSize = 24;
+    this.visibleMachines = this.pageSize;
+    this.hasMoreMachines = false;
+    this.gridFields =
+      "machine_id,name,type,location,alert_level,health_score,failure_probability," +
+      "current_readings,potential_issues,recommendation,last_updated";
+    this.alertLimit = 100;
+
+    this.machineList = null;
+    this.alertList = null;
+
     this.init();
   }
 
@@ -45,15 +208,24 @@ class AuraDashboard {
 
   async loadDashboardData() {
     try {
-      // Load machine status
-      const statusResponse = await fetch(`${this.apiBaseUrl}/status`);
-      if (!statusResponse.ok) throw new Error(`HTTP ${statusResponse.status}`);
+      // Load fleet-wide numbers without pulling every machine
+      const summaryResponse = await fetch(`${this.apiBaseUrl}/fleet/summary?top=0`);
+      if (!summaryResponse.ok) throw new Error(`HTTP ${summaryResponse.status}`);
+
+      const summary = await summaryResponse.json();
+      const statusData = {
+        system_health: summary.average_health,
+        total_machines: summary.machines,
+        active_alerts: summary.open_alerts.total,
+      };
 
-      const statusData = await statusResponse.json();
-      this.machines = statusData.machines;
+      // Load the machines shown in the grid, page by page
+      await this.loadMachinePages();
 
       // Load alerts
-      const alertsResponse = await fetch(`${this.apiBaseUrl}/alerts?limit=20`);
+      const alertsResponse = await fetch(
+        `${this.apiBaseUrl}/alerts?limit=${this.alertLimit}`
+      );
       if (!alertsResponse.ok) throw new Error(`HTTP ${alertsResponse.status}`);
 
       const alertsData = await alertsResponse.json();
@@ -70,6 +242,37 @@ class AuraDashboard {
     }
   }
 
+  async loadMachinePages() {
+    const machines = {};
+    let cursor = null;
+    let loaded = 0;
+
+    do {
+      const limit = Math.min(this.pageSize, this.visibleMachines - loaded);
+      let url = `${this.apiBaseUrl}/machines?limit=${limit}&fields=${this.gridFields}`;
+      if (cursor) url += `&cursor=${encodeURIComponent(cursor)}`;
+
+      const response = await fetch(url);
+      if (!response.ok) throw new Error(`HTTP ${response.status}`);
+
+      const page = await response.json();
+      page.machines.forEach((machine) => {
+        machines[machine.machine_id] = machine;
+      });
+      loaded += page.count;
+      cursor = page.next_cursor;
+    } while (cursor && loaded < this.visibleMachines);
+
+    this.machines = machines;
+    this.hasMoreMachines = Boolean(cursor);
+  }
+
+  async loadMoreMachines() {
+    this.visibleMachines += this.pageSize;
+    await this.loadMachinePages();
+    this.updateMachinesGrid();
+  }
+
   updateSystemOverview(data) {
     // System Health
     const systemHealthEl = document.getElementById("systemHealth");
@@ -107,18 +310,38 @@ class AuraDashboard {
     const grid = document.getElementById("machinesGrid");
     if (!grid) return;
 
-    grid.innerHTML = "";
-
-    Object.values(this.machines).forEach((machine) => {
-      const card = this.createMachineCard(machine);
-      grid.appendChild(card);
-    });
+    if (!this.machineList) {
+      this.machineList = new VirtualList(grid, {
+        key: (machine) => machine.machine_id,
+        render: (machine, card) => this.createMachineCard(machine, card),
+        gap: 24, // gap-6
+      });
+    }
+    this.machineList.setItems(Object.values(this.machines));
+
+    let loadMore = null;
+    if (this.hasMoreMachines) {
+      loadMore = document.createElement("button");
+      loadMore.className =
+        "col-span-full py-3 rounded-xl border border-gray-200 bg-white text-sm font-medium text-gray-700 hover:bg-gray-50";
+      loadMore.textContent = "Load more machines";
+      loadMore.onclick = () => this.loadMoreMachines();
+    }
+    if (Boolean(loadMore) !== Boolean(this.machineList.footer)) {
+      this.machineList.setFooter(loadMore);
+    }
   }
 
-  createMachineCard(machine) {
-    const card = document.createElement("div");
-    card.className = `machine-card bg-white rounded-xl shadow-sm p-6 border border-gray-200 cursor-pointer fade-in ${machine.alert_level}`;
-    card.onclick = () => this.openMachineModal(machine.machine_id);
+  createMachineCard(machine, card = null) {
+    // A changed card is refilled in place; only new cards fade in
+    const isNew = !card;
+    if (isNew) {
+      card = document.createElement("div");
+      card.onclick = () => this.openMachineModal(machine.machine_id);
+    }
+    card.className = `machine-card bg-white rounded-xl shadow-sm p-6 border border-gray-200 cursor-pointer ${
+      isNew ? "fade-in " : ""
+    }${machine.alert_level}`;
 
     const healthColor = this.getHealthColor(machine.health_score);
     const statusIcon = this.getStatusIcon(machine.alert_level);
@@ -267,24 +490,34 @@ class AuraDashboard {
     const alertsList = document.getElementById("alertsList");
     if (!alertsList) return;
 
-    if (this.alerts.length === 0) {
-      alertsList.innerHTML = `
+    if (!this.alertList) {
+      this.alertList = new VirtualList(alertsList, {
+        key: (alert) => alert.alert_id,
+        render: (alert, row) => this.createAlertRow(alert, row),
+        empty: () => {
+          const empty = document.createElement("div");
+          empty.innerHTML = `
                 <div class="text-center py-8 text-gray-500">
                     <i data-lucide="check-circle" class="w-12 h-12 mx-auto mb-3 text-green-500"></i>
                     <p class="text-lg font-medium">No Active Alerts</p>
                     <p class="text-sm">All systems are operating normally</p>
                 </div>
             `;
-      return;
+          return empty;
+        },
+        scroller: alertsList,
+        gap: 12, // space-y-3
+      });
     }
+    this.alertList.setItems(this.alerts);
+  }
 
-    alertsList.innerHTML = this.alerts
-      .slice(0, 10)
-      .map(
-        (alert) => `
-            <div class="flex items-center space-x-4 p-3 bg-gray-50 rounded-lg border-l-4 ${this.getAlertBorderColor(
-              alert.severity
-            )}">
+  createAlertRow(alert, row = null) {
+    row = row || document.createElement("div");
+    row.className = `flex items-center space-x-4 p-3 bg-gray-50 rounded-lg border-l-4 ${this.getAlertBorderColor(
+      alert.severity
+    )}`;
+    row.innerHTML = `
                 <div class="flex-shrink-0">
                     <i data-lucide="${this.getAlertIcon(
                       alert.severity
@@ -307,10 +540,8 @@ class AuraDashboard {
                         ${alert.severity.toUpperCase()}
                     </span>
                 </div>
-            </div>
-        `
-      )
-      .join("");
+        `;
+    return row;
   }
 
   async openMachineModal(machineId) {
@@ -330,7 +561,7 @@ class AuraDashboard {
       const data = await response.json();
 
       this.updateModalContent(data);
-      this.createModalCharts(data);
+      this.updateModalCharts(data, true);
     } catch (error) {
       console.error("Error loading machine details:", error);
     }
@@ -485,117 +716,101 @@ class AuraDashboard {
     }
   }
 
-  createModalCharts(data) {
-    // Destroy existing charts
-    Object.values(this.charts).forEach((chart) => {
-      if (chart) chart.destroy();
-    });
-    this.charts = {};
-
-    // Create temperature chart
-    const tempCtx = document.getElementById("temperatureChart");
-    if (tempCtx && data.historical_readings) {
-      const tempData = data.historical_readings.slice(-24); // Last 24 hours
-
-      this.charts.temperature = new Chart(tempCtx, {
-        type: "line",
-        data: {
-          labels: tempData.map((d) =>
-            new Date(d.timestamp).toLocaleTimeString()
-          ),
-          datasets: [
-            {
-              label: "Temperature (°C)",
-              data: tempData.map((d) => d.temperature),
-              borderColor: "rgb(239, 68, 68)",
-              backgroundColor: "rgba(239, 68, 68, 0.1)",
-              tension: 0.4,
-              fill: true,
-            },
-          ],
+  createLineChart(canvas, label, color, beginAtZero) {
+    return new Chart(canvas, {
+      type: "line",
+      data: {
+        labels: [],
+        datasets: [
+          {
+            label,
+            data: [],
+            borderColor: `rgb(${color})`,
+            backgroundColor: `rgba(${color}, 0.1)`,
+            tension: 0.4,
+            fill: true,
+          },
+        ],
+      },
+      options: {
+        responsive: true,
+        maintainAspectRatio: false,
+        animation: false,
+        plugins: {
+          legend: {
+            display: false,
+          },
         },
-        options: {
-          responsive: true,
-          maintainAspectRatio: false,
-          plugins: {
-            legend: {
-              display: false,
+        scales: {
+          y: {
+            beginAtZero,
+            grid: {
+              color: "rgba(0, 0, 0, 0.1)",
             },
           },
-          scales: {
-            y: {
-              beginAtZero: false,
-              grid: {
-                color: "rgba(0, 0, 0, 0.1)",
-              },
-            },
-            x: {
-              grid: {
-                color: "rgba(0, 0, 0, 0.1)",
-              },
+          x: {
+            grid: {
+              color: "rgba(0, 0, 0, 0.1)",
             },
           },
         },
+      },
+    });
+  }
+
+  updateModalCharts(data, reset = false) {
+    // Charts are created once and reused; polls append (or refresh the
+    // latest) hourly points in place instead of rebuilding the chart
+    const series = [
+      ["temperature", "temperatureChart", "Temperature (°C)", "239, 68, 68", false],
+      ["vibration", "vibrationChart", "Vibration", "59, 130, 246", true],
+    ];
+    series.forEach(([field, canvasId, label, color, beginAtZero]) => {
+      const canvas = document.getElementById(canvasId);
+      if (canvas && !this.charts[field]) {
+        this.charts[field] = this.createLineChart(canvas, label, color, beginAtZero);
+      }
+    });
+
+    const timestamps = this.chartTimestamps;
+    const charts = series.map(([field]) => [field, this.charts[field]]).filter(([, chart]) => chart);
+    if (reset) {
+      timestamps.length = 0;
+      charts.forEach(([, chart]) => {
+        chart.data.labels.length = 0;
+        chart.data.datasets[0].data.length = 0;
       });
     }
 
-    // Create vibration chart
-    const vibCtx = document.getElementById("vibrationChart");
-    if (vibCtx && data.historical_readings) {
-      const vibData = data.historical_readings.slice(-24); // Last 24 hours
-
-      this.charts.vibration = new Chart(vibCtx, {
-        type: "line",
-        data: {
-          labels: vibData.map((d) =>
-            new Date(d.timestamp).toLocaleTimeString()
-          ),
-          datasets: [
-            {
-              label: "Vibration",
-              data: vibData.map((d) => d.vibration),
-              borderColor: "rgb(59, 130, 246)",
-              backgroundColor: "rgba(59, 130, 246, 0.1)",
-              tension: 0.4,
-              fill: true,
-            },
-          ],
-        },
-        options: {
-          responsive: true,
-          maintainAspectRatio: false,
-          plugins: {
-            legend: {
-              display: false,
-            },
-          },
-          scales: {
-            y: {
-              beginAtZero: true,
-              grid: {
-                color: "rgba(0, 0, 0, 0.1)",
-              },
-            },
-            x: {
-              grid: {
-                color: "rgba(0, 0, 0, 0.1)",
-              },
-            },
-          },
-        },
+    (data.historical_readings || []).slice(-this.chartPoints).forEach((point) => {
+      const last = timestamps[timestamps.length - 1];
+      if (last !== undefined && point.timestamp < last) return;
+      const isLatest = point.timestamp === last;
+      if (!isLatest) timestamps.push(point.timestamp);
+      charts.forEach(([field, chart]) => {
+        const values = chart.data.datasets[0].data;
+        if (isLatest) {
+          values[values.length - 1] = point[field];
+        } else {
+          chart.data.labels.push(new Date(point.timestamp).toLocaleTimeString());
+          values.push(point[field]);
+        }
+      });
+    });
+
+    while (timestamps.length > this.chartPoints) {
+      timestamps.shift();
+      charts.forEach(([, chart]) => {
+        chart.data.labels.shift();
+        chart.data.datasets[0].data.shift();
       });
     }
+    charts.forEach(([, chart]) => chart.update("none"));
   }
 
   closeMachineModal() {
     document.getElementById("machineModal").classList.add("hidden");
     this.selectedMachine = null;
-
-    // Destroy charts to free memory
-    Object.values(this.charts).forEach((chart) => {
-      if (chart) chart.destroy();
-    });
-    this.charts = {};
   }
 
   startRealTimeUpdates() {
@@ -610,7 +825,11 @@ class AuraDashboard {
               `${this.apiBaseUrl}/machine/${this.selectedMachine}`
             );
             const data = await response.json();
-            this.updateModalContent(data);
+            // The modal may have switched machines while this was in flight
+            if (data.machine && data.machine.machine_id === this.selectedMachine) {
+              this.updateModalContent(data);
+              this.updateModalCharts(data);
+            }
           }
         } catch (error) {
           console.error("Error during real-time update:", error);
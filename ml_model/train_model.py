@@ -1,22 +1,75 @@
-import pandas as pd
+# pandas, sklearn and joblib are imported where they are used: together they
+# take seconds to import, and serving only needs them once a model is loaded
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import classification_report, confusion_matrix
-import joblib
+from datetime import datetime
+import json
 import os
 import sys
-sys.path.append('/home/sakshamkapoor/Projects/Aura/data')
+import time
+MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(os.path.dirname(MODEL_DIR), 'data'))
 from simulate_data import DataSimulator
 
+class DistilledRegressor:
+    """Student regressor fitted to the forest's failure probabilities, exposing predict_proba
+
+    With link='logit' the regressor predicts log-odds (a logistic model of
+    the teacher); with 'identity' it predicts probabilities directly.
+    """
+    
+    def __init__(self, regressor, link='identity'):
+        self.regressor = regressor
+        self.link = link
+    
+    def fit(self, X, probabilities):
+        if self.link == 'logit':
+            clipped = np.clip(probabilities, 1e-3, 1 - 1e-3)
+            self.regressor.fit(X, np.log(clipped / (1 - clipped)))
+        else:
+            self.regressor.fit(X, probabilities)
+        return self
+    
+    def predict_proba(self, X):
+        predicted = self.regressor.predict(X)
+        if self.link == 'logit':
+            p = 1 / (1 + np.exp(-predicted))
+        else:
+            p = np.clip(predicted, 0, 1)
+        return np.column_stack((1 - p, p))
+
+class QuantizedLookup:
+    """Failure probability table over the binned raw sensor features
+
+    Each of the four scaled sensor columns is cut into equal-width bins;
+    the table holds the teacher's probability at every bin-center
+    combination, quantized to uint8. Scoring is one searchsorted per
+    column plus a table read.
+    """
+    
+    def __init__(self, inner_edges, table):
+        self.inner_edges = inner_edges  # per sensor column, the bin boundaries between first and last bin
+        self.table = table
+    
+    def predict_proba(self, X):
+        cell = tuple(np.searchsorted(edges, X[:, j]) for j, edges in enumerate(self.inner_edges))
+        p = self.table[cell] / 255.0
+        return np.column_stack((1 - p, p))
+
 class AuraMachineHealthModel:
+    DISTILLED_TIERS = ('gbm', 'lookup', 'logistic')
+    
     def __init__(self):
         self.model = None
-        self.scaler = StandardScaler()
+        self.scaler = None  # fitted StandardScaler, set by fit() or load_model()
         self.feature_columns = ['temperature', 'vibration', 'rotation_speed', 'load']
-        self.model_path = '/home/sakshamkapoor/Projects/Aura/ml_model/model.pkl'
-        self.scaler_path = '/home/sakshamkapoor/Projects/Aura/ml_model/scaler.pkl'
+        self.model_path = os.path.join(MODEL_DIR, 'model.pkl')
+        self.scaler_path = os.path.join(MODEL_DIR, 'scaler.pkl')
+        self.version = None  # registry version, set when loaded from the model registry
+        self.tier = 'forest'  # or one of DISTILLED_TIERS for a distilled student
+        self.tiers = {}  # distilled students of this forest by tier, attached by the serving layer
+        self.evaluation = None  # report from evaluate(), saved as evaluation.json beside the model
+        self.partition = None  # machine type this model was trained for (None for the pooled forest)
+        self.partitions = None  # PartitionCache of per-type models, attached by the serving layer
         
     def prepare_features(self, df):
         """Prepare features for training or prediction"""
@@ -43,29 +96,72 @@ class AuraMachineHealthModel:
             (df['load'] > 90).astype(int) * 1
         )
         
-        # Feature columns for model
-        feature_cols = self.feature_columns + [
+        return df[self.feature_names()]
+    
+    def feature_names(self):
+        """Columns of prepare_features output, in model input order"""
+        return self.feature_columns + [
             'temp_deviation', 'vibration_high', 'speed_anomaly', 
             'load_stress', 'risk_score'
         ]
-        
-        return df[feature_cols]
     
     def train_model(self, data_path=None):
         """Train the machine learning model"""
         print("Training Aura ML Model...")
         
         # Generate data if not provided
-        if data_path is None or not os.path.exists('/home/sakshamkapoor/Projects/Aura/data/sensor_data.csv'):
+        if data_path is None or not os.path.exists(data_path):
             print("Generating training data...")
             simulator = DataSimulator()
             df = simulator.generate_historical_data(days=90, samples_per_day=24)
         else:
+            import pandas as pd
             df = pd.read_csv(data_path)
         
+        from sklearn.metrics import classification_report
+        
         print(f"Training data shape: {df.shape}")
         print(f"Failure rate: {df['failure'].mean():.2%}")
         
+        X_test_scaled, y_test = self.fit(df)
+        
+        # Evaluate model
+        y_pred = self.model.predict(X_test_scaled)
+        print("\nModel Performance:")
+        print(classification_report(y_test, y_pred))
+        
+        cv_auc = self.evaluation['cross_validation']['roc_auc']
+        print(f"\n{self.evaluation['cross_validation']['folds']}-fold CV ROC AUC: "
+              f"{cv_auc['mean']:.4f} ± {cv_auc['std']:.4f}")
+        print(f"Brier score: {self.evaluation['calibration']['brier']:.4f}")
+        
+        print("\nTop 5 Most Important Features (permutation):")
+        for row in self.evaluation['permutation_importance'][:5]:
+            print(f"  {row['feature']:<16} {row['mean']:.4f} ± {row['std']:.4f}")
+        
+        # Save model, scaler and evaluation report
+        self.save_model()
+        
+        return self.model
+    
+    @classmethod
+    def fixture(cls, seed=0, days=3):
+        """A tiny, deterministic model (8 shallow trees on seeded simulated readings) for tests and benchmarks"""
+        model = cls()
+        df = DataSimulator(seed=seed).generate_historical_data(days=days, output_path=None)
+        model.fit(df, n_estimators=8, max_depth=4, evaluate=False)
+        model.model_path = model.scaler_path = None  # never saved over the real artifacts
+        return model
+    
+    def fit(self, df, n_estimators=100, max_depth=10, n_jobs=-1, evaluate=True):
+        """Fit scaler and forest on labeled readings and evaluate on a stratified holdout
+        
+        Returns the scaled holdout rows and labels.
+        """
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.model_selection import train_test_split
+        from sklearn.preprocessing import StandardScaler
+        
         # Prepare features
         X = self.prepare_features(df)
         y = df['failure']
@@ -76,13 +172,14 @@ class AuraMachineHealthModel:
         )
         
         # Scale features
+        self.scaler = StandardScaler()
         X_train_scaled = self.scaler.fit_transform(X_train)
         X_test_scaled = self.scaler.transform(X_test)
         
         # Train Random Forest model
         self.model = RandomForestClassifier(
-            n_estimators=100,
-            max_depth=10,
+            n_estimators=n_estimators,
+            max_depth=max_depth,
             min_samples_split=5,
             min_samples_leaf=2,
             random_state=42,
@@ -90,25 +187,29 @@ class AuraMachineHealthModel:
         )
         
         self.model.fit(X_train_scaled, y_train)
+        if evaluate:
+            self.evaluation = self.evaluate(X_test_scaled, y_test, X_train_scaled, y_train, n_jobs=n_jobs)
+        return X_test_scaled, y_test
+    
+    def train_partitions(self, df, machine_types, min_rows=500, n_estimators=50, max_depth=8):
+        """One smaller forest per machine type, trained on that type's readings only
         
-        # Evaluate model
-        y_pred = self.model.predict(X_test_scaled)
-        print("\nModel Performance:")
-        print(classification_report(y_test, y_pred))
-        
-        # Feature importance
-        feature_importance = pd.DataFrame({
-            'feature': X.columns,
-            'importance': self.model.feature_importances_
-        }).sort_values('importance', ascending=False)
-        
-        print("\nTop 5 Most Important Features:")
-        print(feature_importance.head())
-        
-        # Save model and scaler
-        self.save_model()
-        
-        return self.model
+        machine_types maps the machine_id column of df to a type; types
+        with fewer than min_rows readings or a single class are skipped
+        (their machines keep using the pooled forest).
+        """
+        partitions = {}
+        for machine_type, group in df.groupby(df['machine_id'].map(machine_types)):
+            if len(group) < min_rows or group['failure'].nunique() < 2:
+                print(f"Skipping {machine_type} partition ({len(group)} rows)")
+                continue
+            model = AuraMachineHealthModel()
+            model.fit(group, n_estimators=n_estimators, max_depth=max_depth)
+            model.partition = machine_type
+            partitions[machine_type] = model
+            print(f"Trained {machine_type} partition on {len(group)} rows "
+                  f"(holdout ROC AUC {model.evaluation['holdout']['roc_auc']})")
+        return partitions
     
     def predict_failure_probability(self, sensor_data):
         """Predict failure probability for given sensor data"""
@@ -117,6 +218,7 @@ class AuraMachineHealthModel:
         
         # Convert to DataFrame if it's a dict
         if isinstance(sensor_data, dict):
+            import pandas as pd
             sensor_data = pd.DataFrame([sensor_data])
         
         # Prepare features
@@ -128,10 +230,39 @@ class AuraMachineHealthModel:
         
         return failure_probs
     
+    def prepare_batch(self, sensor_batch):
+        """Scaled feature matrix for a list of sensor reading dicts"""
+        import pandas as pd
+        df = pd.DataFrame({col: [reading[col] for reading in sensor_batch] for col in self.feature_columns})
+        return self.scaler.transform(self.prepare_features(df))
+    
+    def prepare_columns(self, columns):
+        """Scaled feature matrix for sensor columns (a DataFrame or a dict of arrays)"""
+        import pandas as pd
+        df = pd.DataFrame({col: np.asarray(columns[col], dtype=float) for col in self.feature_columns})
+        return self.scaler.transform(self.prepare_features(df))
+    
+    def predict_batch(self, X_scaled):
+        """Failure probabilities for a matrix from prepare_batch"""
+        if self.model is None:
+            self.load_model()
+        
+        return self.model.predict_proba(X_scaled)[:, 1]
+    
+    def analyze_batch(self, sensor_batch, failure_probs):
+        """Health analyses for a batch, given probabilities from predict_batch"""
+        return [
+            self._build_analysis(sensor_data, failure_prob)
+            for sensor_data, failure_prob in zip(sensor_batch, failure_probs)
+        ]
+    
     def calculate_health_score(self, sensor_data):
         """Calculate health score (0-100%) based on failure probability"""
         failure_prob = self.predict_failure_probability(sensor_data)[0]
-        
+        return self._health_score_from_probability(sensor_data, failure_prob)
+    
+    def _health_score_from_probability(self, sensor_data, failure_prob):
+        """Health score for a known failure probability"""
         # Convert failure probability to health score
         # Lower failure probability = higher health score
         health_score = max(0, min(100, (1 - failure_prob) * 100))
@@ -172,7 +303,11 @@ class AuraMachineHealthModel:
     def analyze_machine_health(self, sensor_data):
         """Complete machine health analysis"""
         failure_prob = self.predict_failure_probability(sensor_data)[0]
-        health_score = self.calculate_health_score(sensor_data)
+        return self._build_analysis(sensor_data, failure_prob)
+    
+    def _build_analysis(self, sensor_data, failure_prob):
+        """Health analysis for a known failure probability"""
+        health_score = self._health_score_from_probability(sensor_data, failure_prob)
         alert_level = self.get_alert_level(health_score)
         
         # Identify potential issues
@@ -208,23 +343,219 @@ class AuraMachineHealthModel:
         else:
             return "URGENT: Stop operation and inspect immediately"
     
+    def evaluate(self, X_test, y_test, X_train=None, y_train=None, folds=5, n_jobs=-1,
+                 permutation_repeats=10, calibration_bins=10):
+        """Evaluation report for the fitted model over scaled prepare_features rows
+        
+        Holdout metrics, calibration curve and latency come from the test
+        rows; k-fold cross-validation refits a clone of the model on the
+        training rows (skipped without them), and permutation importance
+        shuffles each feature of the test rows. Folds and permutations run
+        in parallel on n_jobs cores.
+        """
+        from sklearn.base import clone
+        from sklearn.calibration import calibration_curve
+        from sklearn.inspection import permutation_importance
+        from sklearn.metrics import (
+            brier_score_loss, confusion_matrix, precision_recall_fscore_support, roc_auc_score
+        )
+        from sklearn.model_selection import StratifiedKFold, cross_validate
+        
+        y_test = np.asarray(y_test)
+        probs = self.model.predict_proba(X_test)[:, 1]
+        y_pred = (probs >= 0.5).astype(int)
+        precision, recall, f1, _ = precision_recall_fscore_support(y_test, y_pred, average='binary', zero_division=0)
+        both_classes = len(np.unique(y_test)) > 1
+        
+        cross_validation = None
+        if X_train is not None and folds > 1:
+            scoring = ('accuracy', 'precision', 'recall', 'f1', 'roc_auc')
+            scores = cross_validate(
+                clone(self.model), X_train, np.asarray(y_train),
+                cv=StratifiedKFold(n_splits=folds, shuffle=True, random_state=42),
+                scoring=scoring, n_jobs=n_jobs
+            )
+            cross_validation = {'folds': folds}
+            for name in scoring:
+                values = scores[f'test_{name}']
+                cross_validation[name] = {'mean': round(float(values.mean()), 4), 'std': round(float(values.std()), 4)}
+        
+        importance = permutation_importance(
+            self.model, X_test, y_test, scoring='roc_auc' if both_classes else 'accuracy',
+            n_repeats=permutation_repeats, n_jobs=n_jobs, random_state=42
+        )
+        permutation = sorted(
+            (
+                {'feature': name, 'mean': round(float(mean), 4), 'std': round(float(std), 4)}
+                for name, mean, std in zip(self.feature_names(), importance.importances_mean, importance.importances_std)
+            ),
+            key=lambda row: row['mean'], reverse=True
+        )
+        
+        observed, predicted = calibration_curve(y_test, probs, n_bins=calibration_bins, strategy='quantile')
+        
+        timings = []
+        for rows in (X_test, X_test[:1]):
+            samples = []
+            for _ in range(10):
+                start = time.perf_counter()
+                self.model.predict_proba(rows)
+                samples.append(time.perf_counter() - start)
+            timings.append(float(np.median(samples)))
+        
+        return {
+            'created_at': datetime.now().isoformat(),
+            'samples': {
+                'train': int(len(X_train)) if X_train is not None else None,
+                'test': int(len(y_test)),
+                'failure_rate': round(float(y_test.mean()), 4)
+            },
+            'holdout': {
+                'accuracy': round(float(np.mean(y_pred == y_test)), 4),
+                'precision': round(float(precision), 4),
+                'recall': round(float(recall), 4),
+                'f1': round(float(f1), 4),
+                'roc_auc': round(float(roc_auc_score(y_test, probs)), 4) if both_classes else None,
+                'confusion_matrix': confusion_matrix(y_test, y_pred, labels=[0, 1]).tolist()
+            },
+            'cross_validation': cross_validation,
+            'permutation_importance': permutation,
+            'calibration': {
+                'brier': round(float(brier_score_loss(y_test, probs)), 4),
+                'curve': [
+                    {'predicted': round(float(p), 4), 'observed': round(float(o), 4)}
+                    for p, o in zip(predicted, observed)
+                ]
+            },
+            'latency': {
+                'batch_rows': int(len(X_test)),
+                'batch_us_per_row': round(timings[0] / len(X_test) * 1e6, 3),
+                'single_row_us': round(timings[1] * 1e6, 1)
+            }
+        }
+    
+    def evaluation_path(self):
+        return os.path.join(os.path.dirname(self.model_path), 'evaluation.json')
+    
+    def distill(self, tier, X_scaled, gbm_trees=40, gbm_depth=3, lookup_bins=12):
+        """A compact student of this forest over the same prepare_features inputs
+        
+        X_scaled is a sample of scaled feature rows (prepare_batch output)
+        the student is fitted on; it learns the forest's probabilities, not
+        the original labels. The student shares this model's scaler.
+        """
+        from sklearn.ensemble import GradientBoostingRegressor
+        from sklearn.linear_model import LinearRegression
+        
+        if self.model is None:
+            self.load_model()
+        teacher_probs = self.model.predict_proba(X_scaled)[:, 1]
+        
+        if tier == 'gbm':
+            regressor = GradientBoostingRegressor(
+                n_estimators=gbm_trees, max_depth=gbm_depth, learning_rate=0.2, random_state=42)
+            student = DistilledRegressor(regressor).fit(X_scaled, teacher_probs)
+        elif tier == 'logistic':
+            student = DistilledRegressor(LinearRegression(), link='logit').fit(X_scaled, teacher_probs)
+        elif tier == 'lookup':
+            student = self._build_lookup(X_scaled, lookup_bins)
+        else:
+            raise ValueError(f"Unknown model tier: {tier}")
+        
+        distilled = AuraMachineHealthModel()
+        distilled.model = student
+        distilled.scaler = self.scaler
+        distilled.version = self.version
+        distilled.tier = tier
+        return distilled
+    
+    def _build_lookup(self, X_scaled, bins):
+        """Evaluate the forest at every bin center of the four sensor columns"""
+        sensor_count = len(self.feature_columns)
+        inner_edges, centers = [], []
+        for j in range(sensor_count):
+            low, high = np.percentile(X_scaled[:, j], [0.5, 99.5])
+            edges = np.linspace(low, high, bins + 1)
+            inner_edges.append(edges[1:-1])
+            centers.append((edges[:-1] + edges[1:]) / 2)
+        
+        grid = np.stack(np.meshgrid(*centers, indexing='ij'), axis=-1).reshape(-1, sensor_count)
+        # Back to sensor units so the derived features see real thresholds
+        raw = grid * self.scaler.scale_[:sensor_count] + self.scaler.mean_[:sensor_count]
+        import pandas as pd
+        df = pd.DataFrame(raw, columns=self.feature_columns)
+        probs = self.model.predict_proba(self.scaler.transform(self.prepare_features(df)))[:, 1]
+        table = np.round(probs * 255).astype(np.uint8).reshape((bins,) * sensor_count)
+        return QuantizedLookup(inner_edges, table)
+    
+    def distillation_report(self, students, df, repeat=20):
+        """Accuracy, agreement with this forest and latency per tier, side by side
+        
+        df holds labeled readings (the columns of prepare_features plus
+        'failure'); students are models from distill().
+        """
+        import pickle
+        from sklearn.metrics import roc_auc_score
+        
+        X_scaled = self.scaler.transform(self.prepare_features(df))
+        y = df['failure'].to_numpy()
+        teacher_probs = self.model.predict_proba(X_scaled)[:, 1]
+        single_row = X_scaled[:1]
+        
+        report = []
+        for model in [self] + list(students):
+            estimator = model.model
+            probs = estimator.predict_proba(X_scaled)[:, 1]
+            
+            batch_timings, row_timings = [], []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                estimator.predict_proba(X_scaled)
+                batch_timings.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                estimator.predict_proba(single_row)
+                row_timings.append(time.perf_counter() - start)
+            
+            report.append({
+                'tier': model.tier,
+                'accuracy': round(float(np.mean((probs >= 0.5) == y)), 4),
+                'roc_auc': round(float(roc_auc_score(y, probs)), 4) if len(np.unique(y)) > 1 else None,
+                'teacher_agreement': round(float(np.mean((probs >= 0.5) == (teacher_probs >= 0.5))), 4),
+                'mean_abs_diff_from_teacher': round(float(np.mean(np.abs(probs - teacher_probs)) * 100), 2),
+                'batch_us_per_row': round(float(np.median(batch_timings)) / len(X_scaled) * 1e6, 3),
+                'single_row_us': round(float(np.median(row_timings)) * 1e6, 1),
+                'size_bytes': len(pickle.dumps(estimator))
+            })
+        return report
+    
     def save_model(self):
         """Save trained model and scaler"""
+        import joblib
         os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
         joblib.dump(self.model, self.model_path)
         joblib.dump(self.scaler, self.scaler_path)
         print(f"Model saved to {self.model_path}")
         print(f"Scaler saved to {self.scaler_path}")
+        if self.evaluation is not None:
+            with open(self.evaluation_path(), 'w') as f:
+                json.dump(self.evaluation, f, indent=2)
+            print(f"Evaluation saved to {self.evaluation_path()}")
     
-    def load_model(self):
-        """Load trained model and scaler"""
+    def load_model(self, train_if_missing=False):
+        """Load trained model and scaler; missing files raise unless train_if_missing"""
         if os.path.exists(self.model_path) and os.path.exists(self.scaler_path):
+            import joblib
             self.model = joblib.load(self.model_path)
             self.scaler = joblib.load(self.scaler_path)
+            if os.path.exists(self.evaluation_path()):
+                with open(self.evaluation_path()) as f:
+                    self.evaluation = json.load(f)
             print("Model and scaler loaded successfully")
-        else:
+        elif train_if_missing:
             print("Model files not found. Training new model...")
             self.train_model()
+        else:
+            raise FileNotFoundError(f"Model files not found: {self.model_path}, {self.scaler_path}")
 
 if __name__ == "__main__":
     # Create and train model
@@ -12,6 +12,7 @@ Usage: python run_demo.py
 Then open: http://localhost:5000
 """
 
+import importlib.util
 import os
 import sys
 import subprocess
@@ -19,6 +20,7 @@ import threading
 import time
 import webbrowser
 from pathlib import Path
+from urllib.request import urlopen
 
 # Add project paths
 project_root = Path(__file__).parent
@@ -28,19 +30,17 @@ sys.path.append(str(project_root / 'backend'))
 
 def check_dependencies():
     """Check if required Python packages are installed"""
-    required_packages = [
-        'flask', 'flask_cors', 'pandas', 'numpy', 
-        'scikit-learn', 'joblib'
+    required_packages = {
+        'flask': 'flask', 'flask_cors': 'flask-cors', 'pandas': 'pandas', 'numpy': 'numpy',
+        'sklearn': 'scikit-learn', 'joblib': 'joblib'
+    }
+    
+    # find_spec locates a package without importing it (sklearn alone takes seconds)
+    missing_packages = [
+        package for module, package in required_packages.items()
+        if importlib.util.find_spec(module) is None
     ]
     
-    missing_packages = []
-    
-    for package in required_packages:
-        try:
-            __import__(package)
-        except ImportError:
-            missing_packages.append(package)
-    
     if missing_packages:
         print("❌ Missing required packages:")
         for package in missing_packages:
@@ -66,16 +66,14 @@ def setup_ml_model():
     print("\n🤖 Setting up Machine Learning Model...")
     
     try:
-        from train_model import AuraMachineHealthModel
-        
-        # Check if model already exists
+        # Check if model already exists; the server loads it, so only train here
         model_path = project_root / 'ml_model' / 'model.pkl'
         
         if model_path.exists():
-            print("✅ ML model already exists, loading...")
-            ml_model = AuraMachineHealthModel()
-            ml_model.load_model()
+            print("✅ ML model already exists")
         else:
+            from train_model import AuraMachineHealthModel
+            
             print("🔄 Training new ML model...")
             ml_model = AuraMachineHealthModel()
             ml_model.train_model()
@@ -129,8 +127,14 @@ def start_backend_server():
         server_thread = threading.Thread(target=run_server, daemon=True)
         server_thread.start()
         
-        # Wait a moment for server to start
-        time.sleep(3)
+        # Wait for the server to answer; the model keeps loading in the background
+        deadline = time.time() + 30
+        while time.time() < deadline:
+            try:
+                with urlopen('http://localhost:5000/api/health', timeout=1):
+                    break
+            except OSError:
+                time.sleep(0.1)
         
         print("✅ Backend server started on http://localhost:5000!")
         return True
@@ -0,0 +1,36 @@
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from app import create_app
+from simulate_data import DataSimulator
+from train_model import AuraMachineHealthModel
+
+@pytest.fixture(scope='session')
+def fixture_model():
+    """The tiny deterministic model, trained once per test session"""
+    return AuraMachineHealthModel.fixture()
+
+@pytest.fixture
+def api(tmp_path, fixture_model):
+    """An AuraAPI on fresh storage with no background threads, after a few scoring ticks"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        api = create_app(
+            storage_dir=str(tmp_path),
+            model=fixture_model,
+            simulator=DataSimulator(seed=0),
+            background=False
+        )
+        for _ in range(5):
+            api.tick()
+    yield api
+    api.close()
+
+@pytest.fixture
+def client(api):
+    return api.app.test_client()
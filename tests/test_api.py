@@ -0,0 +1,73 @@
+import pytest
+
+from models import Alert
+
+@pytest.fixture
+def machine_id(api):
+    return sorted(api.machines)[0]
+
+def test_status(client, api):
+    response = client.get('/api/status')
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert payload['total_machines'] == len(api.machines)
+    assert set(payload['machines']) == set(api.machines)
+    assert 0 <= payload['system_health'] <= 100
+
+def test_machines_pages_cover_fleet_once(client, api):
+    seen, cursor = [], None
+    while True:
+        url = '/api/machines?limit=3' + (f'&cursor={cursor}' if cursor else '')
+        payload = client.get(url).get_json()
+        assert payload['count'] == len(payload['machines']) <= 3
+        seen += [machine['machine_id'] for machine in payload['machines']]
+        cursor = payload['next_cursor']
+        if cursor is None:
+            break
+    assert seen == sorted(api.machines)
+
+def test_machines_sparse_fields(client):
+    payload = client.get('/api/machines?limit=2&fields=machine_id,health_score,last_updated').get_json()
+    assert [sorted(machine) for machine in payload['machines']] == [['health_score', 'last_updated', 'machine_id']] * 2
+
+def test_machines_rejects_bad_parameters(client):
+    assert client.get('/api/machines?fields=machine_id,nope').status_code == 400
+    assert client.get('/api/machines?cursor=not-a-cursor').status_code == 400
+    assert client.get('/api/machines?order=sideways').status_code == 400
+
+def test_alerts_newest_first_and_filtered(client, api, machine_id):
+    for severity in ('warning', 'critical'):
+        api._store_alert(Alert(machine_id, 'health_degradation', severity, f"{severity} alert"))
+
+    payload = client.get('/api/alerts').get_json()
+    assert payload['total_count'] == len(api.alerts)
+    assert [alert['severity'] for alert in payload['alerts']][:2] == ['critical', 'warning']
+
+    payload = client.get('/api/alerts?severity=warning').get_json()
+    assert {alert['severity'] for alert in payload['alerts']} == {'warning'}
+
+    alert_id = payload['alerts'][0]['alert_id']
+    assert client.post(f'/api/alerts/{alert_id}/acknowledge').get_json()['alert']['acknowledged'] is True
+
+def test_maintenance_logged(client, api, machine_id):
+    health_before = api.machines[machine_id].health_score
+    response = client.post('/api/maintenance', json={
+        'machine_id': machine_id,
+        'activity_type': 'repair',
+        'description': 'Replaced bearing',
+        'duration': '2.5',
+        'cost': 120
+    })
+    assert response.status_code == 200
+    log = response.get_json()['log']
+    assert (log['duration'], log['cost']) == (2.5, 120.0)
+    assert api.machines[machine_id].health_score == min(100, health_before + 20)
+
+    history = client.get(f'/api/machine/{machine_id}').get_json()['maintenance_history']
+    assert [entry['description'] for entry in history] == ['Replaced bearing']
+
+def test_maintenance_rejects_bad_input(client, machine_id):
+    base = {'machine_id': machine_id, 'activity_type': 'inspection', 'description': 'Check'}
+    assert client.post('/api/maintenance', json={'machine_id': machine_id}).status_code == 400
+    assert client.post('/api/maintenance', json=dict(base, duration='two hours')).status_code == 400
+    assert client.post('/api/maintenance', json=dict(base, cost=-5)).status_code == 400